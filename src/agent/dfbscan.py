@@ -1,3 +1,4 @@
+import heapq
 import json
 import os
 import threading
@@ -25,7 +26,9 @@ from llmtool.LLM_utils import *
 from llmtool.dfbscan.intra_dataflow_analyzer import *
 from llmtool.dfbscan.path_validator import *
 
+from memory.report.bug_report_writer import *
 from memory.semantic.dfbscan_state import *
+from memory.semantic.function_summary import *
 from memory.syntactic.function import *
 from memory.syntactic.value import *
 
@@ -47,7 +50,20 @@ class DFBScanAgent(Agent):
         call_depth: int,
         max_neural_workers: int = 30,
         agent_id: int = 0,
+        max_paths_per_source: int = 100,
+        use_function_summaries: bool = True,
+        changed_lines: Optional[Dict[str, List[Tuple[int, int]]]] = None,
+        previous_res_dir_path: Optional[str] = None,
     ) -> None:
+        """
+        :param max_paths_per_source: the maximal number of potential buggy paths validated per source
+        :param use_function_summaries: whether the intra-procedural data-flow facts of the non-recursive functions
+            are summarized and shared by all the sources
+        :param changed_lines: the changed line ranges per file in an incremental scan.
+            If it is None, all the sources are scanned.
+        :param previous_res_dir_path: the result directory whose bug reports are carried over in an incremental scan.
+            If it is None, the latest earlier result directory of the same setting is used.
+        """
         self.bug_type = bug_type
         self.is_reachable = is_reachable
 
@@ -61,6 +77,8 @@ class DFBScanAgent(Agent):
 
         self.call_depth = call_depth
         self.max_neural_workers = max_neural_workers
+        self.max_paths_per_source = max_paths_per_source
+        self.use_function_summaries = use_function_summaries
         self.MAX_QUERY_NUM = 5
 
         self.lock = threading.Lock()
@@ -91,8 +109,49 @@ class DFBScanAgent(Agent):
             self.logger,
         )
 
-        self.src_values, self.sink_values = self.__obtain_extractor().extract_all()
+        # The extractor caches the query matches per file, so it is shared by all the workers
+        self.extractor = self.__obtain_extractor()
+        self.src_values, self.sink_values = self.extractor.extract_all()
+
+        # Incremental scan: only rescan the sources that may be affected by the changes
+        scope_function_ids: Optional[Set[int]] = None
+        changed_files: Set[str] = set()
+        if changed_lines is not None:
+            if previous_res_dir_path is None:
+                previous_res_dir_path = self.__find_previous_res_dir_path()
+            if previous_res_dir_path is None:
+                self.logger.print_console(
+                    "No previous result is found. All the sources are scanned."
+                )
+            else:
+                changed_files = set(changed_lines.keys())
+                scope_function_ids = self.__compute_incremental_scope(changed_lines)
+                all_src_num = len(self.src_values)
+                self.src_values = [
+                    src_value
+                    for src_value in self.src_values
+                    if self.__is_in_incremental_scope(
+                        src_value, scope_function_ids, changed_files
+                    )
+                ]
+                self.logger.print_console(
+                    f"Incremental scan: {len(changed_files)} changed file(s), "
+                    f"{len(scope_function_ids)} function(s) in scope, "
+                    f"{len(self.src_values)}/{all_src_num} source(s) to rescan"
+                )
+
+        # Symbolic prefilter: drop the sources that cannot reach any sink before prompting LLMs
+        self.src_values = self.__prefilter_sources(self.src_values)
+
         self.state = DFBScanState(self.src_values, self.sink_values)
+        self.bug_report_writer = BugReportWriter(self.res_dir_path)
+        # Intra-procedural data-flow facts shared by all the sources
+        self.function_summaries = FunctionSummaryTable()
+
+        if scope_function_ids is not None and previous_res_dir_path is not None:
+            self.__carry_over_bug_reports(
+                previous_res_dir_path, scope_function_ids, changed_files
+            )
         return
 
     def __obtain_extractor(self) -> DFBScanExtractor:
@@ -116,426 +175,994 @@ class DFBScanAgent(Agent):
             f"Unsupported bug type: {self.bug_type} in {self.language}"
         )
 
-    def __update_worklist(
+    def __find_previous_res_dir_path(self) -> Optional[str]:
+        """
+        Find the latest earlier result directory of the same model, bug type, language, and project.
+        """
+        parent_dir_path = os.path.dirname(self.res_dir_path)
+        current_dir_name = os.path.basename(self.res_dir_path)
+        for dir_name in sorted(os.listdir(parent_dir_path), reverse=True):
+            if dir_name == current_dir_name:
+                continue
+            dir_path = os.path.join(parent_dir_path, dir_name)
+            if os.path.exists(os.path.join(dir_path, "detect_info.json")):
+                return dir_path
+        return None
+
+    def __compute_incremental_scope(
+        self, changed_lines: Dict[str, List[Tuple[int, int]]]
+    ) -> Set[int]:
+        """
+        Compute the functions whose analysis may be affected by the changes.
+        They are the changed functions and the functions within the call depth from them,
+        as the exploration from a source follows at most that many call edges.
+        :param changed_lines: the changed line ranges per file
+        :return: the ids of the functions in scope
+        """
+        changed_function_ids = set([])
+        for function_id, function in self.ts_analyzer.function_env.items():
+            if function.file_path not in changed_lines:
+                continue
+            for start_line, end_line in changed_lines[function.file_path]:
+                if (
+                    start_line <= function.end_line_number
+                    and end_line >= function.start_line_number
+                ):
+                    changed_function_ids.add(function_id)
+                    break
+        self.logger.print_log(
+            f"{len(changed_function_ids)} function(s) are changed:",
+            [
+                self.ts_analyzer.function_env[function_id].function_name
+                for function_id in changed_function_ids
+            ],
+        )
+        return self.ts_analyzer.get_neighbor_function_ids(
+            changed_function_ids, self.call_depth + 1
+        )
+
+    def __is_in_incremental_scope(
+        self, src_value: Value, scope_function_ids: Set[int], changed_files: Set[str]
+    ) -> bool:
+        """
+        Check whether a source has to be rescanned in an incremental scan.
+        The sources in changed files are always rescanned because their line numbers may shift.
+        """
+        if src_value.file in changed_files:
+            return True
+        src_function = self.ts_analyzer.get_function_from_localvalue(src_value)
+        return (
+            src_function is not None and src_function.function_id in scope_function_ids
+        )
+
+    def __carry_over_bug_reports(
         self,
-        input: IntraDataFlowAnalyzerInput,
-        output: IntraDataFlowAnalyzerOutput,
-        call_context: CallContext,
-        path_index: int,
-    ) -> List[Tuple[Value, Function, CallContext]]:
-        """
-        Update the worklist based on the output of intra-procedural data-flow analysis.
-        :param input: The input of intra-procedural data-flow analysis
-        :param output: The output of intra-procedural data-flow analysis
-        :param call_context: The call context of the current function
-        :return: The updated worklist
-        """
-        delta_worklist = []  # The list of (value, function, call_context) tuples
-        function_id = input.function.function_id
-        function = self.ts_analyzer.function_env[function_id]
-
-        for value in output.reachable_values[path_index]:
-            if value.label == ValueLabel.ARG:
-                callee_functions = self.ts_analyzer.get_all_callee_functions(function)
-                for callee_function in callee_functions:
-                    is_called = False
-                    call_sites = self.ts_analyzer.get_callsites_by_callee_name(
-                        function, callee_function.function_name
-                    )
-                    call_site_line_number = -1
-                    for call_site_node in call_sites:
-                        file_content = self.ts_analyzer.code_in_files[
-                            function.file_path
-                        ]
-                        call_site_lower_line_number = (
-                            file_content[: call_site_node.start_byte].count("\n") + 1
-                        )
-                        call_site_upper_line_number = (
-                            file_content[: call_site_node.end_byte].count("\n") + 1
-                        )
-                        arg_line_number_in_file = value.line_number
-                        if (
-                            call_site_lower_line_number <= arg_line_number_in_file
-                            and arg_line_number_in_file <= call_site_upper_line_number
-                        ):
-                            is_called = True
-                            call_site_line_number = call_site_lower_line_number
-                    if not is_called:
-                        continue
+        previous_res_dir_path: str,
+        scope_function_ids: Set[int],
+        changed_files: Set[str],
+    ) -> None:
+        """
+        Carry over the bug reports of the sources that are not rescanned from the previous result.
+        A report is dropped if any of its relevant functions no longer exists with the same code.
+        """
+        with open(previous_res_dir_path + "/detect_info.json", "r") as bug_info_file:
+            previous_bug_reports = json.load(bug_info_file)
+
+        # Only the functions named in the reports are decoded, each at most once
+        functions_by_name: Dict[Tuple[str, str], List[Function]] = {}
+        for function in self.ts_analyzer.function_env.values():
+            functions_by_name.setdefault(
+                (function.file_path, function.function_name), []
+            ).append(function)
+        decoded_codes: Dict[int, str] = {}
+
+        def find_function(
+            file_path: str, function_name: str, function_code: str
+        ) -> Optional[Function]:
+            for function in functions_by_name.get((file_path, function_name), []):
+                if function.function_id not in decoded_codes:
+                    decoded_codes[function.function_id] = function.function_code
+                if decoded_codes[function.function_id] == function_code:
+                    return function
+            return None
+
+        carried_bug_num = 0
+        for bug_report_dict in previous_bug_reports.values():
+            try:
+                buggy_value = Value.from_str_to_value(bug_report_dict["buggy_value"])
+            except ValueError:
+                continue
+            if self.__is_in_incremental_scope(
+                buggy_value, scope_function_ids, changed_files
+            ):
+                continue
 
-                    new_call_context = copy.deepcopy(call_context)
-                    context_label = ContextLabel(
-                        self.ts_analyzer.functionToFile[function.function_id],
-                        call_site_line_number,
-                        callee_function.function_id,
-                        Parenthesis.LEFT_PAR,
-                    )
-                    is_CFL_reachable = new_call_context.add_and_check_context(
-                        context_label
-                    )
-                    if not is_CFL_reachable:
-                        continue
+            relevant_functions: Dict[int, Function] = {}
+            file_paths, function_names, function_codes = bug_report_dict[
+                "relevant_functions"
+            ]
+            for file_path, function_name, function_code in zip(
+                file_paths, function_names, function_codes
+            ):
+                relevant_function = find_function(
+                    file_path, function_name, function_code
+                )
+                if (
+                    relevant_function is None
+                    or relevant_function.function_id in scope_function_ids
+                ):
+                    break
+                relevant_functions[relevant_function.function_id] = relevant_function
+            if len(relevant_functions) != len(file_paths):
+                continue
 
-                    if callee_function.paras is not None:
-                        for para in callee_function.paras:
-                            if para.index == value.index:
-                                delta_worklist.append(
-                                    (para, callee_function, new_call_context)
-                                )
-                                self.state.update_external_value_match(
-                                    (value, call_context),
-                                    set({(para, new_call_context)}),
+            human_confirmation = {"True": True, "False": False}
+            self.__report_bug(
+                BugReport(
+                    bug_report_dict["bug_type"],
+                    buggy_value,
+                    relevant_functions,
+                    bug_report_dict["explanation"],
+                    human_confirmation.get(
+                        bug_report_dict.get("is_human_confirmed_true", "")
+                    ),
+                )
+            )
+            carried_bug_num += 1
+
+        self.logger.print_console(
+            f"{carried_bug_num} bug report(s) are carried over from {previous_res_dir_path}"
+        )
+        return
+
+    def __report_bug(self, bug_report: BugReport) -> None:
+        """
+        Add a bug report to the state, and stream it to the result directory if it is new.
+        """
+        bug_report_id = self.state.update_bug_report(bug_report)
+        if bug_report_id is not None:
+            self.bug_report_writer.write(bug_report_id, bug_report)
+        return
+
+    def __prefilter_sources(self, src_values: List[Value]) -> List[Value]:
+        """
+        Discard the sources of which no function within call_depth call edges, in either direction,
+        contains a sink. The data flow from such a source never meets a sink,
+        so each of them saves at least one query of intra-procedural data-flow analysis.
+        For the bug types that require a source not to reach any sink, e.g., MLK,
+        a source without sinks around is a bug candidate itself, so no source is discarded.
+        :param src_values: the sources to be filtered
+        :return: the sources that may reach a sink
+        """
+        if not self.is_reachable:
+            self.logger.print_log(
+                f"Symbolic prefilter is disabled for {self.bug_type}, whose bugs are sources reaching no sink"
+            )
+            return src_values
+
+        with self.ts_analyzer.profiler.stage("prefilter_sources", len(src_values)):
+            is_sink_function: Dict[int, bool] = {}
+            filtered_src_values = []
+            for src_value in src_values:
+                src_function = self.ts_analyzer.get_function_from_localvalue(src_value)
+                if src_function is None:
+                    # Such sources are skipped by the scan anyway
+                    filtered_src_values.append(src_value)
+                    continue
+                neighbor_function_ids = self.ts_analyzer.get_neighbor_function_ids(
+                    {src_function.function_id}, self.call_depth
+                )
+                for function_id in neighbor_function_ids:
+                    if function_id not in is_sink_function:
+                        is_sink_function[function_id] = (
+                            len(
+                                self.extractor.extract_sinks(
+                                    self.ts_analyzer.function_env[function_id]
                                 )
+                            )
+                            > 0
+                        )
+                    if is_sink_function[function_id]:
+                        filtered_src_values.append(src_value)
+                        break
+
+        saved_call_num = len(src_values) - len(filtered_src_values)
+        self.logger.print_console(
+            f"Symbolic prefilter: {len(filtered_src_values)}/{len(src_values)} source(s) may reach a sink "
+            f"within {self.call_depth} call(s); at least {saved_call_num} LLM call(s) saved"
+        )
+        return filtered_src_values
 
-            if value.label == ValueLabel.PARA:
-                # Consider side-effect.
-                # Example: the parameter *p is used in the function: p->f = null;
-                # We need to consider the side-effect of p.
-                caller_functions = self.ts_analyzer.get_all_caller_functions(function)
-                for caller_function in caller_functions:
-                    new_call_context = copy.deepcopy(call_context)
-                    top_unmatched_context_label = (
-                        new_call_context.get_top_unmatched_context_label()
+    def __get_recursion_key(
+        self, value: Value, function: Function, call_context: CallContext
+    ) -> Optional[Tuple[Value, int, Tuple[str, ...]]]:
+        """
+        Get the key of exploring a value in a recursive function, which treats the
+        strongly connected component of the function as one unit.
+        The trailing context labels of the calls and returns inside the component are dropped,
+        so exploring the value again after a round of recursion yields the same key.
+        The exploration reaches its fixed point at that key.
+        :param value: the value to be explored
+        :param function: the function of the value
+        :param call_context: the call context of the function
+        :return: the key, or None if the function is not recursive
+        """
+        if not self.ts_analyzer.is_recursive_function(function):
+            return None
+        scc_index = self.ts_analyzer.get_function_scc_index(function)
+        labels = call_context.context
+        entry_position = len(labels)
+        while entry_position > 0 and self.__is_call_in_scc(
+            labels[entry_position - 1], scc_index
+        ):
+            entry_position -= 1
+        return (
+            value,
+            function.function_id,
+            tuple(str(label) for label in labels[:entry_position]),
+        )
+
+    def __is_call_in_scc(self, label: ContextLabel, scc_index: int) -> bool:
+        """
+        Check whether both the caller and the callee of the call site in a context label
+        are in a strongly connected component.
+        """
+        callee_function = self.ts_analyzer.function_env[label.function_id]
+        if self.ts_analyzer.get_function_scc_index(callee_function) != scc_index:
+            return False
+        for caller_function in self.ts_analyzer.get_all_caller_functions(
+            callee_function
+        ):
+            if (
+                caller_function.file_path == label.file_name
+                and caller_function.start_line_number
+                <= label.line_number
+                <= caller_function.end_line_number
+                and self.ts_analyzer.get_function_scc_index(caller_function)
+                == scc_index
+            ):
+                return True
+        return False
+
+    def __get_transitions(
+        self, function: Function, value: Value
+    ) -> List[Tuple[Value, Value, Function, ContextLabel]]:
+        """
+        Get the inter-procedural transitions from a value reached in a function.
+        The transitions do not depend on the call context, which is only checked when they are taken.
+        :param function: The function of the value
+        :param value: The value reached by intra-procedural data-flow analysis
+        :return: The (value, next value, next function, context label) tuples
+        """
+        transitions = []
+
+        if value.label == ValueLabel.ARG:
+            # The call sites spanning the line of the argument
+            arg_call_sites = function.call_sites_by_line.get(value.line_number, [])
+            callee_functions = self.ts_analyzer.get_all_callee_functions(function)
+            for callee_function in callee_functions:
+                is_called = False
+                call_site_line_number = -1
+                for call_site in arg_call_sites:
+                    if call_site.callee_name == callee_function.function_name:
+                        is_called = True
+                        call_site_line_number = call_site.start_line_number
+                if not is_called:
+                    continue
+
+                context_label = ContextLabel(
+                    self.ts_analyzer.functionToFile[function.function_id],
+                    call_site_line_number,
+                    callee_function.function_id,
+                    Parenthesis.LEFT_PAR,
+                )
+                if callee_function.paras is not None:
+                    for para in callee_function.paras:
+                        if para.index == value.index:
+                            transitions.append(
+                                (value, para, callee_function, context_label)
+                            )
+
+        if value.label == ValueLabel.PARA:
+            # Consider side-effect.
+            # Example: the parameter *p is used in the function: p->f = null;
+            # We need to consider the side-effect of p.
+            caller_functions = self.ts_analyzer.get_all_caller_functions(function)
+            for caller_function in caller_functions:
+                caller_function_file_name = self.ts_analyzer.functionToFile[
+                    caller_function.function_id
+                ]
+                for call_site in caller_function.call_sites_by_callee_name.get(
+                    function.function_name, []
+                ):
+                    # Returning to a call site other than the one of the unmatched call is not CFL reachable
+                    append_context_label = ContextLabel(
+                        caller_function_file_name,
+                        call_site.start_line_number,
+                        function.function_id,
+                        Parenthesis.RIGHT_PAR,
                     )
+                    for arg in call_site.arguments:
+                        if arg.index == value.index:
+                            transitions.append(
+                                (value, arg, caller_function, append_context_label)
+                            )
 
-                    call_site_nodes = self.ts_analyzer.get_callsites_by_callee_name(
-                        caller_function, function.function_name
+        if value.label == ValueLabel.RET:
+            caller_functions = self.ts_analyzer.get_all_caller_functions(function)
+            for caller_function in caller_functions:
+                caller_function_file_name = self.ts_analyzer.functionToFile[
+                    caller_function.function_id
+                ]
+                for call_site in caller_function.call_sites_by_callee_name.get(
+                    function.function_name, []
+                ):
+                    # Returning to a call site other than the one of the unmatched call is not CFL reachable
+                    append_context_label = ContextLabel(
+                        caller_function_file_name,
+                        call_site.start_line_number,
+                        function.function_id,
+                        Parenthesis.RIGHT_PAR,
+                    )
+                    output_value = self.ts_analyzer.get_output_value_at_callsite(
+                        caller_function, call_site.node
+                    )
+                    transitions.append(
+                        (value, output_value, caller_function, append_context_label)
                     )
-                    for call_site_node in call_site_nodes:
-                        caller_function_file_name = self.ts_analyzer.functionToFile[
-                            caller_function.function_id
-                        ]
-                        file_content = self.ts_analyzer.code_in_files[
-                            caller_function_file_name
-                        ]
-                        call_site_lower_line_number = (
-                            file_content[: call_site_node.start_byte].count("\n") + 1
-                        )
 
-                        if top_unmatched_context_label is not None:
-                            if (
-                                top_unmatched_context_label.parenthesis
-                                == Parenthesis.LEFT_PAR
-                            ):
-                                if (
-                                    call_site_lower_line_number
-                                    != top_unmatched_context_label.line_number
-                                    or caller_function_file_name
-                                    != top_unmatched_context_label.file_name
-                                    or top_unmatched_context_label.function_id
-                                    != function.function_id
-                                ):
-                                    continue
-
-                        append_context_label = ContextLabel(
-                            caller_function_file_name,
-                            call_site_lower_line_number,
-                            function.function_id,
-                            Parenthesis.RIGHT_PAR,
-                        )
-                        new_call_context.add_and_check_context(append_context_label)
+        if value.label == ValueLabel.SINK:
+            # No need to continue the exploration
+            pass
+        return transitions
 
-                        args = self.ts_analyzer.get_arguments_at_callsite(
-                            caller_function, call_site_node
-                        )
-                        for arg in args:
-                            if arg.index == value.index:
-                                delta_worklist.append(
-                                    (arg, caller_function, new_call_context)
-                                )
-                                self.state.update_external_value_match(
-                                    (value, call_context),
-                                    set({(arg, new_call_context)}),
-                                )
+    def __analyze_value(
+        self, start_value: Value, start_function: Function
+    ) -> Optional[
+        Tuple[List[Set[Value]], List[List[Tuple[Value, Value, Function, ContextLabel]]]]
+    ]:
+        """
+        Analyze a start value in a function with intra-procedural data-flow analysis.
+        :param start_value: The start value
+        :param start_function: The function of the start value
+        :return: The reachable values and the transitions along each path, or None if the analysis fails
+        """
+        # Construct the input for intra-procedural data-flow analysis
+        sinks_in_function = self.extractor.extract_sinks(start_function)
+        sink_values = [
+            (sink.name, sink.line_number - start_function.start_line_number + 1)
+            for sink in sinks_in_function
+        ]
+
+        file_content = self.ts_analyzer.source_store.get_bytes(start_function.file_path)
+        call_statements = [
+            (
+                decode_text(file_content[call_site.start_byte : call_site.end_byte]),
+                call_site.start_line_number,
+            )
+            for call_site in start_function.call_sites
+            if len(call_site.callee_ids) > 0
+        ]
+
+        ret_values = [
+            (ret.name, ret.line_number - start_function.start_line_number + 1)
+            for ret in (
+                start_function.retvals if start_function.retvals is not None else []
+            )
+        ]
+        df_input = IntraDataFlowAnalyzerInput(
+            start_function, start_value, sink_values, call_statements, ret_values
+        )
+
+        # Invoke the intra-procedural data-flow analysis
+        with self.ts_analyzer.profiler.stage(
+            "intra_dataflow_analysis", 1, is_concurrent=True
+        ):
+            df_output = self.intra_dfa.invoke(df_input, IntraDataFlowAnalyzerOutput)
+
+        if df_output is None:
+            return None
 
-            if value.label == ValueLabel.RET:
-                caller_functions = self.ts_analyzer.get_all_caller_functions(function)
-                for caller_function in caller_functions:
-                    new_call_context = copy.deepcopy(call_context)
-                    top_unmatched_context_label = (
-                        new_call_context.get_top_unmatched_context_label()
+        function = self.ts_analyzer.function_env[start_function.function_id]
+        transitions = [
+            [
+                transition
+                for value in reachable_values_in_single_path
+                for transition in self.__get_transitions(function, value)
+            ]
+            for reachable_values_in_single_path in df_output.reachable_values
+        ]
+        return df_output.reachable_values, transitions
+
+    def __compose_context(
+        self,
+        relative_context: CallContext,
+        contexts: Dict[CallContext, CallContext],
+    ) -> CallContext:
+        """
+        Prefix a relative context with a call context by pushing its labels in order.
+        :param relative_context: The relative context
+        :param contexts: The composed contexts of the relative contexts, which map the empty context
+            to the call context and are updated
+        :return: The composed context
+        """
+        context = contexts.get(relative_context)
+        if context is None:
+            assert relative_context.parent is not None
+            assert relative_context.label is not None
+            parent_context = self.__compose_context(relative_context.parent, contexts)
+            context = parent_context.push(relative_context.label)
+            # A relative context only cancels its own calls, so prefixing it never fails
+            assert context is not None
+            contexts[relative_context] = context
+        return context
+
+    def __get_function_summary(
+        self, start_value: Value, start_function: Function, max_depth: int
+    ) -> Tuple[FunctionSummary, bool]:
+        """
+        Get the shared summary of a start value in a non-recursive function, and compute it if it does not exist.
+        :param start_value: The start value
+        :param start_function: The function of the start value
+        :param max_depth: The maximal number of context labels of the analyzed values
+        :return: The summary, and whether it is reused
+        """
+        return self.function_summaries.get_or_compute(
+            start_function.function_id,
+            start_value,
+            max_depth,
+            lambda: self.__compute_function_summary(
+                start_value, start_function, max_depth
+            ),
+        )
+
+    def __compute_function_summary(
+        self, start_value: Value, start_function: Function, max_depth: int
+    ) -> FunctionSummary:
+        """
+        Compute the summary of a start value in a non-recursive function with relative call contexts,
+        i.e., as if the start value were reached with the empty context.
+        A call into a non-recursive callee embeds the summary of the callee parameter, which is shared by
+        all the callers of the callee, and the returns of the embedded summary back to the same call site
+        are analyzed as the continuations of the call. A call into a recursive function is left to the source.
+        The values are analyzed in the order of their paths, and only pruned by depth.
+        :param start_value: The start value
+        :param start_function: The function of the start value
+        :param max_depth: The maximal number of context labels of the analyzed values
+        :return: The summary
+        """
+        nodes: List[SummaryNode] = []
+        calls: List[SummaryCall] = []
+        frontier: List[Tuple[SummaryNode, SummaryTransition]] = []
+        is_complete = True
+        empty_context = CallContext.empty(False)
+        # The worklist is a heap ordered by (depth, path), and a value reached again with the same
+        # relative context is skipped, so each node and each call is kept with its first path
+        worklist: List[Tuple[int, ExplorationPath, int, Value, Function, CallContext]]
+        worklist = [(0, (), 0, start_value, start_function, empty_context)]
+        item_num = 1
+        visited_items = set()
+        embedded_calls = set()
+        while len(worklist) > 0:
+            (_, path, _, value, function, relative_context) = heapq.heappop(worklist)
+            if relative_context.depth > max_depth:
+                continue
+            item = (value, function.function_id, relative_context)
+            if item in visited_items:
+                continue
+            visited_items.add(item)
+
+            analysis_result = self.__analyze_value(value, function)
+            if analysis_result is None:
+                is_complete = False
+                continue
+            reachable_values, transitions = analysis_result
+
+            node_transitions: List[List[SummaryTransition]] = []
+            transition_index = 0
+            for path_transitions in transitions:
+                node_transitions.append([])
+                for reached_value, next_value, next_function, label in path_transitions:
+                    node_transitions[-1].append(
+                        SummaryTransition(
+                            transition_index,
+                            reached_value,
+                            next_value,
+                            next_function,
+                            label,
+                        )
                     )
+                    transition_index += 1
+            node = SummaryNode(
+                value,
+                function,
+                relative_context,
+                path,
+                reachable_values,
+                node_transitions,
+            )
+            nodes.append(node)
 
-                    call_site_nodes = self.ts_analyzer.get_callsites_by_callee_name(
-                        caller_function, function.function_name
+            for summary_transitions in node_transitions:
+                for transition in summary_transitions:
+                    # The relative context of a node is balanced, so a return is an exit of the summary
+                    if transition.label.parenthesis == Parenthesis.RIGHT_PAR:
+                        continue
+                    if self.ts_analyzer.is_recursive_function(transition.next_function):
+                        frontier.append((node, transition))
+                        continue
+                    call_context = relative_context.push(transition.label)
+                    assert call_context is not None
+                    callee_depth = max_depth - call_context.depth
+                    if callee_depth < 0:
+                        continue
+                    call_key = (
+                        transition.next_value,
+                        transition.next_function.function_id,
+                        call_context,
                     )
-                    for call_site_node in call_site_nodes:
-                        caller_function_file_name = self.ts_analyzer.functionToFile[
-                            caller_function.function_id
-                        ]
-                        file_content = self.ts_analyzer.code_in_files[
-                            caller_function_file_name
-                        ]
-                        call_site_lower_line_number = (
-                            file_content[: call_site_node.start_byte].count("\n") + 1
-                        )
+                    if call_key in embedded_calls:
+                        continue
+                    embedded_calls.add(call_key)
 
-                        if top_unmatched_context_label is not None:
-                            if (
-                                top_unmatched_context_label.parenthesis
-                                == Parenthesis.LEFT_PAR
-                            ):
-                                if (
-                                    call_site_lower_line_number
-                                    != top_unmatched_context_label.line_number
-                                    or caller_function_file_name
-                                    != top_unmatched_context_label.file_name
-                                    or top_unmatched_context_label.function_id
-                                    != function.function_id
-                                ):
-                                    continue
-
-                        append_context_label = ContextLabel(
-                            caller_function_file_name,
-                            call_site_lower_line_number,
-                            function.function_id,
-                            Parenthesis.RIGHT_PAR,
+                    callee_summary, is_reused = self.__get_function_summary(
+                        transition.next_value, transition.next_function, callee_depth
+                    )
+                    if is_reused:
+                        self.function_summaries.add_skipped_analyses(
+                            callee_summary.get_node_num(callee_depth)
                         )
-                        new_call_context.add_and_check_context(append_context_label)
-
-                        output_value = self.ts_analyzer.get_output_value_at_callsite(
-                            caller_function, call_site_node
+                    is_complete = is_complete and callee_summary.is_complete
+                    call_path = path + (transition.index,)
+                    calls.append(SummaryCall(call_context, call_path, callee_summary))
+
+                    # Continue in the function after the callee returns to the call site
+                    contexts = {empty_context: call_context}
+                    for exit_node, exit_transition in callee_summary.exits:
+                        if exit_node.relative_context.depth >= callee_depth:
+                            continue
+                        exit_context = self.__compose_context(
+                            exit_node.relative_context, contexts
                         )
-                        delta_worklist.append(
-                            (output_value, caller_function, new_call_context)
+                        next_context = exit_context.push(exit_transition.label)
+                        if next_context is None:
+                            continue
+                        next_path = (
+                            call_path + exit_node.path + (exit_transition.index,)
                         )
-                        self.state.update_external_value_match(
-                            (value, call_context),
-                            set({(output_value, new_call_context)}),
+                        heapq.heappush(
+                            worklist,
+                            (
+                                len(next_path),
+                                next_path,
+                                item_num,
+                                exit_transition.next_value,
+                                exit_transition.next_function,
+                                next_context,
+                            ),
                         )
+                        item_num += 1
+        return FunctionSummary(
+            start_value,
+            start_function,
+            max_depth,
+            nodes,
+            calls,
+            frontier,
+            is_complete,
+        )
 
-            if value.label == ValueLabel.SINK:
-                # No need to continue the exploration
-                pass
-        return delta_worklist
-
-    def __collect_potential_buggy_paths(
+    def __apply_function_summary(
         self,
         src_value: Value,
-        current_value_with_context: Tuple[Value, CallContext],
-        path_with_unknown_status: List[Value] = [],
-    ) -> None:
+        summary: FunctionSummary,
+        call_context: CallContext,
+        path_prefix: ExplorationPath,
+        max_depth: int,
+        next_items: List[Tuple[ExplorationPath, Value, Function, CallContext]],
+        is_embedded: bool,
+    ) -> int:
+        """
+        Record the data-flow facts of a function summary and its embedded summaries
+        in the call context of its start value.
+        The context of each node is the call context followed by the relative context of the node,
+        and its path is the path prefix followed by the relative path of the node.
+        :param src_value: The source value being explored
+        :param summary: The summary of the start value
+        :param call_context: The call context of the start value
+        :param path_prefix: The path from the source to the start value
+        :param max_depth: The maximal number of context labels of the analyzed values
+        :param next_items: The (path, value, function, call_context) tuples to be explored next by the source,
+            i.e., the frontier of the summaries and the exits of the summary, which are updated
+        :param is_embedded: Whether the summary is embedded, whose exits are continued by the caller summary
+        :return: The number of the applied nodes
         """
-        Recursively collect potential buggy paths based on the propagation details.
+        contexts = {CallContext.empty(False): call_context}
+        applied_node_num = 0
+        for node in summary.nodes:
+            if call_context.depth + node.relative_context.depth > max_depth:
+                continue
+            applied_node_num += 1
+            node_context = self.__compose_context(node.relative_context, contexts)
 
-        This function updates the state with buggy paths if the propagation from the source
-        meets the criteria based on the bug type (reachability). If the current_value_with_context
-        is neither in reachable values nor in external value matches, it returns immediately.
+            for path_index in range(len(node.reachable_values)):
+                reachable_values_in_single_path = set([])
+                for value in node.reachable_values[path_index]:
+                    reachable_values_in_single_path.add((value, node_context))
+                self.state.update_reachable_values_per_path(
+                    src_value,
+                    (node.value, node_context),
+                    reachable_values_in_single_path,
+                )
 
-        Args:
-            src_value (Value):
-                The source value from which the propagation starts.
-            current_value_with_context (Tuple[Value, CallContext]):
-                The current value along with its call context.
-            path_with_unknown_status (List[Value], optional):
-                The propagation path accumulated so far.
-        """
-        reachable_values_snapshot = self.state.reachable_values_per_path
-        external_match_snapshot = self.state.external_value_match
+                for transition in node.transitions[path_index]:
+                    next_context = node_context.push(transition.label)
+                    if next_context is None:
+                        continue
+                    self.state.update_external_value_match(
+                        src_value,
+                        (transition.value, node_context),
+                        set({(transition.next_value, next_context)}),
+                    )
 
-        # If no propagation information exists for the current value, stop further processing.
-        if (
-            current_value_with_context not in reachable_values_snapshot
-            and current_value_with_context not in external_match_snapshot
+        for frontier_node, transition in summary.frontier + (
+            [] if is_embedded else summary.exits
         ):
-            return
-
-        # Process if the current value has reachable paths.
-        if current_value_with_context in reachable_values_snapshot:
-            reachable_values_paths: List[Set[Tuple[Value, CallContext]]] = (
-                reachable_values_snapshot[current_value_with_context]
+            if call_context.depth + frontier_node.relative_context.depth >= max_depth:
+                continue
+            next_context = self.__compose_context(
+                frontier_node.relative_context, contexts
+            ).push(transition.label)
+            if next_context is None:
+                continue
+            next_items.append(
+                (
+                    path_prefix + frontier_node.path + (transition.index,),
+                    transition.next_value,
+                    transition.next_function,
+                    next_context,
+                )
             )
-            for path_set in reachable_values_paths:
-                if not path_set:
-                    # For memory leak-style bug types we only update when the path is empty.
-                    if not self.is_reachable:
-                        self.state.update_potential_buggy_paths(
-                            src_value, path_with_unknown_status + [src_value]
-                        )
-                    continue
-                for value, ctx in path_set:
-                    if value.label == ValueLabel.SINK:
-                        # For NPD-style bug types
-                        if self.is_reachable:
-                            self.state.update_potential_buggy_paths(
-                                src_value, path_with_unknown_status + [value]
-                            )
-                    elif value.label in {
-                        ValueLabel.PARA,
-                        ValueLabel.RET,
-                        ValueLabel.ARG,
-                        ValueLabel.OUT,
-                    }:
-                        # For other propagation types, check further external matches.
-                        if (value, ctx) in external_match_snapshot:
-                            for value_next, ctx_next in external_match_snapshot[
-                                (value, ctx)
-                            ]:
-                                self.__collect_potential_buggy_paths(
-                                    src_value,
-                                    (value_next, ctx_next),
-                                    path_with_unknown_status + [value, value_next],
-                                )
 
-        # Process if the current value has external value matches.
-        if current_value_with_context in external_match_snapshot:
-            for value_next, ctx_next in external_match_snapshot[
-                current_value_with_context
-            ]:
-                value, _ = current_value_with_context
-                self.__collect_potential_buggy_paths(
-                    src_value,
-                    (value_next, ctx_next),
-                    path_with_unknown_status + [value, value_next],
-                )
-        return
+        for call in summary.calls:
+            if call_context.depth + call.relative_context.depth > max_depth:
+                continue
+            applied_node_num += self.__apply_function_summary(
+                src_value,
+                call.summary,
+                self.__compose_context(call.relative_context, contexts),
+                path_prefix + call.path,
+                max_depth,
+                next_items,
+                True,
+            )
+        return applied_node_num
 
-    # TOBE deprecated
-    def start_scan_sequential(self) -> None:
-        self.logger.print_console("Start data-flow bug scanning...")
+    def __explore_src_value(self, src_value: Value, max_depth: int) -> None:
+        """
+        Explore the data flows from a source and record the facts in the state.
+        A value in a non-recursive function is explored by applying its summary, which is shared by
+        all the sources, in the call context the source reaches it with. A value in a recursive function
+        is analyzed for the source, and skipped if its recursion key has been explored.
+        The values are explored in the order of their paths, i.e., breadth-first, so the recursion keys
+        are explored in the same order whether the summaries are used or not.
+        :param src_value: The source value
+        :param max_depth: The maximal number of context labels of the analyzed values
+        """
+        src_function = self.ts_analyzer.get_function_from_localvalue(src_value)
+        if src_function is None:
+            return
 
-        # Total number of source values
-        total_src_values = len(self.src_values)
+        # The worklist is a heap ordered by (depth, path). Every context label adds one to the depth,
+        # so the depth of a value is the length of its paths
+        worklist: List[Tuple[int, ExplorationPath, int, Value, Function, CallContext]]
+        worklist = [(0, (), 0, src_value, src_function, CallContext.empty(False))]
+        item_num = 1
+        summarized_items = set()
+        explored_recursion_keys: Set[Tuple[Value, int, Tuple[str, ...]]] = set()
+        skipped_recursion_num = 0
+        while len(worklist) > 0:
+            (_, path, _, start_value, start_function, call_context) = heapq.heappop(
+                worklist
+            )
+            if call_context.depth > max_depth:
+                continue
+            next_items: List[Tuple[ExplorationPath, Value, Function, CallContext]] = []
 
-        # Process each source value sequentially with a progress bar
-        with tqdm(
-            total=total_src_values, desc="Processing Source Values", unit="src"
-        ) as pbar:
-            for src_value in self.src_values:
-                worklist = []
-                src_function = self.ts_analyzer.get_function_from_localvalue(src_value)
-                if src_function is None:
-                    pbar.update(1)
+            recursion_key = self.__get_recursion_key(
+                start_value, start_function, call_context
+            )
+            if recursion_key is None and self.use_function_summaries:
+                item = (start_value, start_function.function_id, call_context)
+                if item in summarized_items:
                     continue
+                summarized_items.add(item)
 
-                initial_context = CallContext(False)
-                worklist.append((src_value, src_function, initial_context))
-
-                while len(worklist) > 0:
-                    (start_value, start_function, call_context) = worklist.pop(0)
-                    if len(call_context.context) >= self.call_depth:
+                summary, is_reused = self.__get_function_summary(
+                    start_value, start_function, max_depth - call_context.depth
+                )
+                applied_node_num = self.__apply_function_summary(
+                    src_value,
+                    summary,
+                    call_context,
+                    path,
+                    max_depth,
+                    next_items,
+                    False,
+                )
+                if is_reused:
+                    self.function_summaries.add_skipped_analyses(applied_node_num)
+            else:
+                if recursion_key is not None:
+                    # The value has been explored in the same recursive component
+                    if recursion_key in explored_recursion_keys:
+                        skipped_recursion_num += 1
                         continue
+                    explored_recursion_keys.add(recursion_key)
 
-                    # Construct the input for intra-procedural data-flow analysis
-                    sinks_in_function = self.__obtain_extractor().extract_sinks(
-                        start_function
+                analysis_result = self.__analyze_value(start_value, start_function)
+                if analysis_result is None:
+                    continue
+                reachable_values, transitions = analysis_result
+
+                transition_index = 0
+                for path_index in range(len(reachable_values)):
+                    reachable_values_in_single_path = set([])
+                    for value in reachable_values[path_index]:
+                        reachable_values_in_single_path.add((value, call_context))
+                    self.state.update_reachable_values_per_path(
+                        src_value,
+                        (start_value, call_context),
+                        reachable_values_in_single_path,
                     )
-                    sink_values = [
-                        (
-                            sink.name,
-                            sink.line_number - start_function.start_line_number + 1,
-                        )
-                        for sink in sinks_in_function
-                    ]
 
-                    call_statements = []
-                    for call_site_node in start_function.function_call_site_nodes:
-                        file_content = self.ts_analyzer.code_in_files[
-                            start_function.file_path
-                        ]
-                        call_site_line_number = (
-                            file_content[: call_site_node.start_byte].count("\n") + 1
-                        )
-                        call_site_name = file_content[
-                            call_site_node.start_byte : call_site_node.end_byte
-                        ]
-                        call_statements.append((call_site_name, call_site_line_number))
-
-                    ret_values = [
-                        (
-                            ret.name,
-                            ret.line_number - start_function.start_line_number + 1,
+                    for value, next_value, next_function, label in transitions[
+                        path_index
+                    ]:
+                        next_path = path + (transition_index,)
+                        transition_index += 1
+                        next_context = call_context.push(label)
+                        if next_context is None:
+                            continue
+                        self.state.update_external_value_match(
+                            src_value,
+                            (value, call_context),
+                            set({(next_value, next_context)}),
                         )
-                        for ret in (
-                            start_function.retvals
-                            if start_function.retvals is not None
-                            else []
+                        next_items.append(
+                            (next_path, next_value, next_function, next_context)
                         )
-                    ]
-                    df_input = IntraDataFlowAnalyzerInput(
-                        start_function,
-                        start_value,
-                        sink_values,
-                        call_statements,
-                        ret_values,
-                    )
 
-                    # Invoke the intra-procedural data-flow analysis
-                    df_output = self.intra_dfa.invoke(
-                        df_input, IntraDataFlowAnalyzerOutput
-                    )
-                    if df_output is None:
-                        continue
+            for next_path, next_value, next_function, next_context in next_items:
+                heapq.heappush(
+                    worklist,
+                    (
+                        len(next_path),
+                        next_path,
+                        item_num,
+                        next_value,
+                        next_function,
+                        next_context,
+                    ),
+                )
+                item_num += 1
 
-                    for path_index in range(len(df_output.reachable_values)):
-                        reachable_values_in_single_path = set([])
-                        for value in df_output.reachable_values[path_index]:
-                            reachable_values_in_single_path.add((value, call_context))
-                        self.state.update_reachable_values_per_path(
-                            (start_value, call_context), reachable_values_in_single_path
-                        )
+        if skipped_recursion_num > 0:
+            self.logger.print_log(
+                f"{skipped_recursion_num} re-exploration(s) of recursive functions are skipped for {src_value}"
+            )
+        return
 
-                        delta_worklist = self.__update_worklist(
-                            df_input, df_output, call_context, path_index
-                        )
-                        worklist.extend(delta_worklist)
+    def __get_propagation_edges(
+        self, src_value: Value, node: Tuple[Value, CallContext]
+    ) -> Tuple[List[Value], List[Tuple[Tuple[Value, CallContext], List[Value]]]]:
+        """
+        Get the propagation steps from a value in the data-flow facts of a source.
+        :param src_value: the source value
+        :param node: the value with its call context
+        :return: the ends of the buggy paths at the value, and the (successor, path segment) pairs.
+            A buggy path ends with a sink for NPD-style bug types, or with the source
+            if a path in the function reaches nothing for MLK-style bug types.
+        """
+        path_ends: List[Value] = []
+        edges: List[Tuple[Tuple[Value, CallContext], List[Value]]] = []
+        for path_set in self.state.get_reachable_values_per_path(src_value, node):
+            if not path_set:
+                if not self.is_reachable:
+                    path_ends.append(src_value)
+                continue
+            for value, ctx in path_set:
+                if value.label == ValueLabel.SINK:
+                    if self.is_reachable:
+                        path_ends.append(value)
+                elif value.label in {
+                    ValueLabel.PARA,
+                    ValueLabel.RET,
+                    ValueLabel.ARG,
+                    ValueLabel.OUT,
+                }:
+                    for value_next, ctx_next in self.state.get_external_value_match(
+                        src_value, (value, ctx)
+                    ):
+                        edges.append(((value_next, ctx_next), [value, value_next]))
+
+        value, _ = node
+        for value_next, ctx_next in self.state.get_external_value_match(
+            src_value, node
+        ):
+            edges.append(((value_next, ctx_next), [value, value_next]))
+        return path_ends, edges
 
-                self.__collect_potential_buggy_paths(
-                    src_value, (src_value, CallContext(False))
-                )
+    def __collect_potential_buggy_paths(self, src_value: Value) -> None:
+        """
+        Collect the potential buggy paths of a source from the propagation facts in the state.
+        The facts form a propagation graph over (value, call context) nodes, which is first
+        explored to memoize whether each node can reach the end of a buggy path. The paths are
+        then enumerated with an explicit stack, skipping the nodes that cannot reach an end and
+        the nodes already on the current path, so cycles of recursive calls terminate.
+        At most max_paths_per_source paths are collected.
+        :param src_value: the source value
+        """
+        start_node = (src_value, CallContext.empty(False))
+        if not self.state.has_data_flow(src_value, start_node):
+            return
 
-                if src_value not in self.state.potential_buggy_paths:
-                    pbar.update(1)
+        # Build the propagation graph reachable from the source
+        graph: Dict[
+            Tuple[Value, CallContext],
+            Tuple[List[Value], List[Tuple[Tuple[Value, CallContext], List[Value]]]],
+        ] = {}
+        predecessors: Dict[
+            Tuple[Value, CallContext], List[Tuple[Value, CallContext]]
+        ] = {}
+        pending_nodes = [start_node]
+        graph[start_node] = self.__get_propagation_edges(src_value, start_node)
+        while pending_nodes:
+            node = pending_nodes.pop()
+            for next_node, _ in graph[node][1]:
+                predecessors.setdefault(next_node, []).append(node)
+                if next_node not in graph:
+                    graph[next_node] = self.__get_propagation_edges(
+                        src_value, next_node
+                    )
+                    pending_nodes.append(next_node)
+
+        # Memoize the nodes reaching the end of a buggy path by propagating backward from the ends
+        reaching_nodes = {node for node, (path_ends, _) in graph.items() if path_ends}
+        pending_nodes = list(reaching_nodes)
+        while pending_nodes:
+            node = pending_nodes.pop()
+            for predecessor in predecessors.get(node, []):
+                if predecessor not in reaching_nodes:
+                    reaching_nodes.add(predecessor)
+                    pending_nodes.append(predecessor)
+        if start_node not in reaching_nodes:
+            return
+
+        # Enumerate the paths depth-first in the same order as a recursive traversal.
+        # The current path is shared by the frames, and each frame records the length to restore.
+        buggy_paths: Dict[str, List[Value]] = {}
+        current_path: List[Value] = []
+        on_path_nodes = {start_node}
+        # Each frame is (node, the next step to take, the length of the path before the node)
+        stack: List[Tuple[Tuple[Value, CallContext], int, int]] = [(start_node, 0, 0)]
+        is_capped = False
+        while stack and not is_capped:
+            node, step, path_length = stack[-1]
+            path_ends, edges = graph[node]
+            if step < len(path_ends):
+                stack[-1] = (node, step + 1, path_length)
+                buggy_path = current_path + [path_ends[step]]
+                buggy_paths[str(buggy_path)] = buggy_path
+                is_capped = len(buggy_paths) >= self.max_paths_per_source
+                continue
+            if step < len(path_ends) + len(edges):
+                stack[-1] = (node, step + 1, path_length)
+                next_node, path_segment = edges[step - len(path_ends)]
+                if next_node not in reaching_nodes or next_node in on_path_nodes:
                     continue
+                stack.append((next_node, 0, len(current_path)))
+                current_path.extend(path_segment)
+                on_path_nodes.add(next_node)
+                continue
+            stack.pop()
+            on_path_nodes.discard(node)
+            del current_path[path_length:]
 
-                for buggy_path in self.state.potential_buggy_paths[src_value].values():
-                    pv_input = PathValidatorInput(
-                        self.bug_type,
-                        buggy_path,
-                        {
-                            value: self.ts_analyzer.get_function_from_localvalue(value)
-                            for value in buggy_path
-                        },
-                    )
-                    pv_output = self.path_validator.invoke(
-                        pv_input, PathValidatorOutput
-                    )
+        if is_capped:
+            self.logger.print_log(
+                f"The potential buggy paths of {src_value} are capped at {self.max_paths_per_source}"
+            )
+        for buggy_path in buggy_paths.values():
+            self.state.update_potential_buggy_paths(src_value, buggy_path)
+        return
 
-                    if pv_output is None:
+    # TOBE deprecated
+    def start_scan_sequential(self) -> None:
+        self.logger.print_console("Start data-flow bug scanning...")
+
+        # Total number of source values
+        total_src_values = len(self.src_values)
+
+        # The streamed bug reports are compacted into detect_info.json even if the scan is aborted
+        try:
+            # Process each source value sequentially with a progress bar
+            with (
+                self.ts_analyzer.profiler.stage("scan_sources", total_src_values),
+                tqdm(
+                    total=total_src_values, desc="Processing Source Values", unit="src"
+                ) as pbar,
+            ):
+                for src_value in self.src_values:
+                    self.__explore_src_value(src_value, self.call_depth - 1)
+                    self.__collect_potential_buggy_paths(src_value)
+
+                    buggy_paths = self.state.get_potential_buggy_paths(src_value)
+                    if len(buggy_paths) == 0:
+                        pbar.update(1)
                         continue
 
-                    if pv_output.is_reachable:
-                        relevant_functions = {}
-                        for value in buggy_path:
-                            function = self.ts_analyzer.get_function_from_localvalue(
-                                value
+                    for buggy_path in buggy_paths:
+                        values_to_functions = dict(
+                            zip(
+                                buggy_path,
+                                self.ts_analyzer.get_functions_from_localvalues(
+                                    buggy_path
+                                ),
                             )
-                            if function is not None:
-                                relevant_functions[function.function_id] = function
+                        )
+                        if self.state.check_existence(
+                            src_value,
+                            {
+                                function
+                                for function in values_to_functions.values()
+                                if function is not None
+                            },
+                        ):
+                            continue
 
-                        bug_report = BugReport(
+                        pv_input = PathValidatorInput(
                             self.bug_type,
-                            src_value,
-                            relevant_functions,
-                            pv_output.explanation_str,
+                            buggy_path,
+                            values_to_functions,
                         )
-                        self.state.update_bug_report(bug_report)
+                        with self.ts_analyzer.profiler.stage(
+                            "path_validation", 1, is_concurrent=True
+                        ):
+                            pv_output = self.path_validator.invoke(
+                                pv_input, PathValidatorOutput
+                            )
 
-                # Dump bug reports
-                bug_report_dict = {
-                    bug_report_id: bug.to_dict()
-                    for bug_report_id, bug in self.state.bug_reports.items()
-                }
-                with open(
-                    self.res_dir_path + "/detect_info.json", "w"
-                ) as bug_info_file:
-                    json.dump(bug_report_dict, bug_info_file, indent=4)
+                        if pv_output is None:
+                            continue
+
+                        if pv_output.is_reachable:
+                            relevant_functions = {
+                                function.function_id: function
+                                for function in values_to_functions.values()
+                                if function is not None
+                            }
+
+                            bug_report = BugReport(
+                                self.bug_type,
+                                src_value,
+                                relevant_functions,
+                                pv_output.explanation_str,
+                            )
+                            self.__report_bug(bug_report)
 
-                # Update the progress bar
-                pbar.update(1)
+                    # Update the progress bar
+                    pbar.update(1)
+        finally:
+            self.bug_report_writer.close()
 
         # Final summary
-        total_bug_number = len(self.state.bug_reports.values())
+        self.logger.print_console(
+            f"Function summaries: {self.function_summaries.computed_num} computed, "
+            f"{self.function_summaries.reused_num} reused, skipping "
+            f"{self.function_summaries.skipped_analysis_num} invocation(s) of intra-procedural analysis"
+        )
+        total_bug_number = self.state.total_bug_count
         self.logger.print_console(
             f"{total_bug_number} bug(s) was/were detected in total."
         )
@@ -545,6 +1172,7 @@ class DFBScanAgent(Agent):
         self.logger.print_console("The log files are as follows:")
         for log_file in self.get_log_files():
             self.logger.print_console(log_file)
+        self.__dump_timings()
         return
 
     def start_scan(self) -> None:
@@ -554,26 +1182,40 @@ class DFBScanAgent(Agent):
         # Total number of source values
         total_src_values = len(self.src_values)
 
-        # Process each source value in parallel with a progress bar
-        with tqdm(
-            total=total_src_values, desc="Processing Source Values", unit="src"
-        ) as pbar:
-            with ThreadPoolExecutor(max_workers=self.max_neural_workers) as executor:
-                futures = [
-                    executor.submit(self.__process_src_value, src_value)
-                    for src_value in self.src_values
-                ]
-                for future in as_completed(futures):
-                    try:
-                        future.result()
-                    except Exception as e:
-                        self.logger.print_log("Error processing source value:", e)
-                    finally:
-                        # Update the progress bar after each source value is processed
-                        pbar.update(1)
+        # The streamed bug reports are compacted into detect_info.json even if the scan is aborted
+        try:
+            # Process each source value in parallel with a progress bar
+            with (
+                self.ts_analyzer.profiler.stage("scan_sources", total_src_values),
+                tqdm(
+                    total=total_src_values, desc="Processing Source Values", unit="src"
+                ) as pbar,
+            ):
+                with ThreadPoolExecutor(
+                    max_workers=self.max_neural_workers
+                ) as executor:
+                    futures = [
+                        executor.submit(self.__process_src_value, src_value)
+                        for src_value in self.src_values
+                    ]
+                    for future in as_completed(futures):
+                        try:
+                            future.result()
+                        except Exception as e:
+                            self.logger.print_log("Error processing source value:", e)
+                        finally:
+                            # Update the progress bar after each source value is processed
+                            pbar.update(1)
+        finally:
+            self.bug_report_writer.close()
 
         # Final summary
-        total_bug_number = len(self.state.bug_reports.values())
+        self.logger.print_console(
+            f"Function summaries: {self.function_summaries.computed_num} computed, "
+            f"{self.function_summaries.reused_num} reused, skipping "
+            f"{self.function_summaries.skipped_analysis_num} invocation(s) of intra-procedural analysis"
+        )
+        total_bug_number = self.state.total_bug_count
         self.logger.print_console(
             f"{total_bug_number} bug(s) was/were detected in total."
         )
@@ -583,81 +1225,46 @@ class DFBScanAgent(Agent):
         self.logger.print_console("The log files are as follows:")
         for log_file in self.get_log_files():
             self.logger.print_console(log_file)
+        self.__dump_timings()
         return
 
-    def __process_src_value(self, src_value: Value) -> None:
-        worklist = []
-        src_function = self.ts_analyzer.get_function_from_localvalue(src_value)
-        if src_function is None:
+    def __dump_timings(self) -> None:
+        """
+        Dump the timings of the scan stages if the scan is profiled.
+        """
+        if not self.ts_analyzer.profiler.is_enabled:
             return
-        initial_context = CallContext(False)
-
-        worklist.append((src_value, src_function, initial_context))
-        while len(worklist) > 0:
-            (start_value, start_function, call_context) = worklist.pop(0)
-            if len(call_context.context) > self.call_depth:
-                continue
-
-            # Construct the input for intra-procedural data-flow analysis
-            sinks_in_function = self.__obtain_extractor().extract_sinks(start_function)
-            sink_values = [
-                (sink.name, sink.line_number - start_function.start_line_number + 1)
-                for sink in sinks_in_function
-            ]
-
-            call_statements = []
-            for call_site_node in start_function.function_call_site_nodes:
-                file_content = self.ts_analyzer.code_in_files[start_function.file_path]
-                call_site_line_number = (
-                    file_content[: call_site_node.start_byte].count("\n") + 1
-                )
-                call_site_name = file_content[
-                    call_site_node.start_byte : call_site_node.end_byte
-                ]
-                call_statements.append((call_site_name, call_site_line_number))
-
-            ret_values = [
-                (ret.name, ret.line_number - start_function.start_line_number + 1)
-                for ret in (
-                    start_function.retvals if start_function.retvals is not None else []
-                )
-            ]
-            df_input = IntraDataFlowAnalyzerInput(
-                start_function, start_value, sink_values, call_statements, ret_values
-            )
-
-            # Invoke the intra-procedural data-flow analysis
-            df_output = self.intra_dfa.invoke(df_input, IntraDataFlowAnalyzerOutput)
-
-            if df_output is None:
-                continue
+        self.ts_analyzer.profiler.dump(self.res_dir_path)
+        self.logger.print_console(
+            f"The timings have been dumped to {self.res_dir_path}/timings.json"
+        )
+        return
 
-            for path_index in range(len(df_output.reachable_values)):
-                reachable_values_in_single_path = set([])
-                for value in df_output.reachable_values[path_index]:
-                    reachable_values_in_single_path.add((value, call_context))
-                self.state.update_reachable_values_per_path(
-                    (start_value, call_context), reachable_values_in_single_path
-                )
+    def __process_src_value(self, src_value: Value) -> None:
+        # The source is scanned in a worker thread, which cProfile only profiles by itself
+        with self.ts_analyzer.profiler.profile_thread("scan_sources"):
+            self.__scan_src_value(src_value)
+        return
 
-                delta_worklist = self.__update_worklist(
-                    df_input, df_output, call_context, path_index
-                )
-                worklist.extend(delta_worklist)
+    def __scan_src_value(self, src_value: Value) -> None:
+        self.__explore_src_value(src_value, self.call_depth)
 
         # Collect potential buggy paths
-        self.__collect_potential_buggy_paths(src_value, (src_value, CallContext(False)))
+        self.__collect_potential_buggy_paths(src_value)
 
         # If no potential buggy paths are found, return early
-        if src_value not in self.state.potential_buggy_paths:
+        buggy_paths = self.state.get_potential_buggy_paths(src_value)
+        if len(buggy_paths) == 0:
             return
 
         # Validate buggy paths and generate bug reports
-        for buggy_path in self.state.potential_buggy_paths[src_value].values():
-            values_to_functions = {
-                value: self.ts_analyzer.get_function_from_localvalue(value)
-                for value in buggy_path
-            }
+        for buggy_path in buggy_paths:
+            values_to_functions = dict(
+                zip(
+                    buggy_path,
+                    self.ts_analyzer.get_functions_from_localvalues(buggy_path),
+                )
+            )
 
             functions: Set[Function] = set()
             for func in values_to_functions.values():
@@ -672,17 +1279,20 @@ class DFBScanAgent(Agent):
                 buggy_path,
                 values_to_functions,
             )
-            pv_output = self.path_validator.invoke(pv_input, PathValidatorOutput)
+            with self.ts_analyzer.profiler.stage(
+                "path_validation", 1, is_concurrent=True
+            ):
+                pv_output = self.path_validator.invoke(pv_input, PathValidatorOutput)
 
             if pv_output is None:
                 continue
 
             if pv_output.is_reachable:
-                relevant_functions = {}
-                for value in buggy_path:
-                    function = self.ts_analyzer.get_function_from_localvalue(value)
-                    if function is not None:
-                        relevant_functions[function.function_id] = function
+                relevant_functions = {
+                    function.function_id: function
+                    for function in values_to_functions.values()
+                    if function is not None
+                }
 
                 bug_report = BugReport(
                     self.bug_type,
@@ -690,16 +1300,7 @@ class DFBScanAgent(Agent):
                     relevant_functions,
                     pv_output.explanation_str,
                 )
-                self.state.update_bug_report(bug_report)
-                bug_report_dict = {
-                    bug_report_id: bug.to_dict()
-                    for bug_report_id, bug in self.state.bug_reports.items()
-                }
-
-                with open(
-                    self.res_dir_path + "/detect_info.json", "w"
-                ) as bug_info_file:
-                    json.dump(bug_report_dict, bug_info_file, indent=4)
+                self.__report_bug(bug_report)
         return
 
     def get_agent_state(self) -> DFBScanState:
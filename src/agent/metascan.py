@@ -40,9 +40,15 @@ class MetaScanAgent(Agent):
             os.makedirs(log_dir_path)
         self.logger = Logger(log_dir_path + "/" + "metascan.log")
 
-        for function_id in self.ts_analyzer.function_env:
+        # Visit the functions bottom-up, i.e., callees before callers
+        bottom_up_functions = [
+            function
+            for scc in self.ts_analyzer.get_bottom_up_function_sccs()
+            for function in scc
+        ]
+        for function in bottom_up_functions:
+            function_id = function.function_id
             function_meta_data: Dict = {}
-            function = self.ts_analyzer.function_env[function_id]
             function_meta_data["function_id"] = function.function_id
             function_meta_data["function_name"] = function.function_name
             function_meta_data["function_start_line"] = function.start_line_number
@@ -61,23 +67,13 @@ class MetaScanAgent(Agent):
             )
 
             function_meta_data["call_sites"] = []
-            for call_site in function.function_call_site_nodes:
+            for call_site in function.call_sites:
+                if len(call_site.callee_ids) == 0:
+                    continue
                 call_site_info: Dict = {}
-                file_content = self.ts_analyzer.fileContentDic[function.file_path]
-                call_site_info["callee_id"] = (
-                    self.ts_analyzer.get_callee_function_ids_at_callsite(
-                        function, call_site
-                    )
-                )
-                call_site_info["args"] = [
-                    str(arg)
-                    for arg in self.ts_analyzer.get_arguments_at_callsite(
-                        function, call_site
-                    )
-                ]
-                call_site_info["call_site_start_line"] = (
-                    file_content[: call_site.start_byte].count("\n") + 1
-                )
+                call_site_info["callee_id"] = call_site.callee_ids
+                call_site_info["args"] = [str(arg) for arg in call_site.arguments]
+                call_site_info["call_site_start_line"] = call_site.start_line_number
                 function_meta_data["call_sites"].append(call_site_info)
 
             # function call
@@ -98,6 +94,13 @@ class MetaScanAgent(Agent):
                         str(self.ts_analyzer.api_env[callee_id])
                     )
 
+            function_meta_data["scc_index"] = self.ts_analyzer.get_function_scc_index(
+                function
+            )
+            function_meta_data["is_recursive"] = self.ts_analyzer.is_recursive_function(
+                function
+            )
+
             function_meta_data["caller_ids"] = []
             if function_id in self.ts_analyzer.function_callee_caller_map:
                 for caller_id in self.ts_analyzer.function_callee_caller_map[
@@ -174,6 +177,16 @@ class MetaScanAgent(Agent):
             "Function-Function Call Edge Number: ", f2f_call_edge_num
         )
         self.logger.print_console("Function-API Call Edge Number: ", f2a_call_edge_num)
+        self.logger.print_console(
+            "Recursive SCC Number: ",
+            int(self.ts_analyzer.call_graph.is_recursive_scc.sum()),
+        )
+
+        if self.ts_analyzer.profiler.is_enabled:
+            self.ts_analyzer.profiler.dump(log_dir_path)
+            self.logger.print_console(
+                f"The timings have been dumped to {log_dir_path}/timings.json"
+            )
         return
 
     def get_agent_state(self):
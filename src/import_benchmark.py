@@ -0,0 +1,73 @@
+"""
+Import-time benchmark of the metascan startup.
+
+metascan never prompts LLMs, so its startup should not import any LLM SDK.
+The script imports RepoAudit, sets up a metascan on a project, reports the time,
+and exits with 1 if any SDK has been imported.
+
+Usage (in the src directory):
+    python import_benchmark.py [--project-path ../benchmark/Python/toy] [--language Python]
+"""
+
+import argparse
+import importlib
+import sys
+import time
+
+# The SDKs that are only needed when prompting LLMs
+LLM_SDK_MODULES = [
+    "openai",
+    "anthropic",
+    "google.generativeai",
+    "boto3",
+    "botocore",
+    "tiktoken",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check that the metascan startup imports no LLM SDK."
+    )
+    parser.add_argument(
+        "--project-path", default="../benchmark/Python/toy", help="Project path"
+    )
+    parser.add_argument("--language", default="Python", help="Programming language")
+    args = parser.parse_args()
+
+    if any(module_name in sys.modules for module_name in LLM_SDK_MODULES):
+        print("LLM SDKs are imported before the benchmark starts")
+        exit(1)
+
+    start_time = time.perf_counter()
+    repoaudit = importlib.import_module("repoaudit")
+    import_time = time.perf_counter() - start_time
+
+    sys.argv = [
+        "repoaudit.py",
+        "--scan-type",
+        "metascan",
+        "--project-path",
+        args.project_path,
+        "--language",
+        args.language,
+        "--no-index-cache",
+    ]
+    repoaudit.RepoAudit(repoaudit.configure_args())
+    startup_time = time.perf_counter() - start_time
+
+    print(f"Import time of repoaudit: {import_time:.2f}s")
+    print(f"Startup time of metascan: {startup_time:.2f}s")
+
+    imported_modules = [
+        module_name for module_name in LLM_SDK_MODULES if module_name in sys.modules
+    ]
+    if imported_modules:
+        print(f"LLM SDKs imported by metascan: {', '.join(imported_modules)}")
+        exit(1)
+    print("No LLM SDK is imported by metascan")
+    return
+
+
+if __name__ == "__main__":
+    main()
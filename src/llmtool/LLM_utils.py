@@ -1,12 +1,10 @@
 # Imports
-from openai import *
+# The SDKs of the LLM providers are slow to import, so each of them is imported
+# by the backend that uses it rather than at module load.
 from pathlib import Path
 from typing import Tuple
-import google.generativeai as genai
-import anthropic
 import signal
 import sys
-import tiktoken
 import time
 import os
 import concurrent.futures
@@ -14,9 +12,6 @@ from functools import partial
 import threading
 
 import json
-from botocore.config import Config
-from botocore.exceptions import BotoCoreError, ClientError
-import boto3
 from ui.logger import Logger
 
 
@@ -37,6 +32,8 @@ class LLM:
         system_role: str = "You are an experienced programmer and good at understanding programs written in mainstream programming languages.",
         max_output_length: int = 4096,
     ) -> None:
+        import tiktoken
+
         self.online_model_name = online_model_name
         self.encoding = tiktoken.encoding_for_model(
             "gpt-3.5-turbo-0125"
@@ -92,6 +89,8 @@ class LLM:
 
     def infer_with_gemini(self, message: str) -> str:
         """Infer using the Gemini model from Google Generative AI"""
+        import google.generativeai as genai
+
         gemini_model = genai.GenerativeModel("gemini-pro")
 
         def call_api():
@@ -128,6 +127,8 @@ class LLM:
 
     def infer_with_openai_model(self, message):
         """Infer using the OpenAI model"""
+        from openai import OpenAI
+
         api_key = os.environ.get("OPENAI_API_KEY").split(":")[0]
         model_input = [
             {"role": "system", "content": self.systemRole},
@@ -158,6 +159,8 @@ class LLM:
 
     def infer_with_o3_mini_model(self, message):
         """Infer using the o3-mini model"""
+        from openai import OpenAI
+
         api_key = os.environ.get("OPENAI_API_KEY").split(":")[0]
         model_input = [
             {"role": "system", "content": self.systemRole},
@@ -188,6 +191,8 @@ class LLM:
         """
         Infer using the DeepSeek model
         """
+        from openai import OpenAI
+
         api_key = os.environ.get("DEEPSEEK_API_KEY2")
         model_input = [
             {
@@ -221,6 +226,9 @@ class LLM:
 
     def infer_with_claude_aws_bedrock(self, message):
         """Infer using the Claude model via AWS Bedrock"""
+        import boto3
+        from botocore.config import Config
+
         timeout = 500
         model_input = [
             {
@@ -298,6 +306,8 @@ class LLM:
 
     def infer_with_claude_key(self, message):
         """Infer using the Claude model via API key, with thinking mode for 3.7"""
+        import anthropic
+
         api_key = os.environ.get("ANTHROPIC_API_KEY")
         if not api_key:
             raise EnvironmentError(
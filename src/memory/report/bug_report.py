@@ -1,6 +1,6 @@
 from memory.syntactic.function import *
 from memory.syntactic.value import *
-from typing import Dict
+from typing import Dict, Iterable, Optional, Tuple
 
 
 class BugReport:
@@ -10,13 +10,14 @@ class BugReport:
         buggy_value: Value,
         relevant_functions: Dict[int, Function],
         explanation: str,
-        is_human_confirmed_true: bool = False,
+        is_human_confirmed_true: Optional[bool] = False,
     ) -> None:
         """
         :param bug_type: the bug type
         :param buggy_value: the buggy value
         :param relevant_functions: the relevant functions
         :param explanation: the explanation
+        :param is_human_confirmed_true: the human validation result, which is None if unknown
         """
         self.bug_type = bug_type
         self.buggy_value = buggy_value
@@ -54,13 +55,28 @@ class BugReport:
     def __str__(self):
         return str(self.to_dict())
 
+    @staticmethod
+    def get_key(
+        buggy_value: Value, relevant_function_ids: Iterable[int]
+    ) -> Tuple[Value, Tuple[int, ...]]:
+        """
+        Get the key identifying the bug reports of a buggy value in the same functions.
+        :param buggy_value: the buggy value
+        :param relevant_function_ids: the ids of the relevant functions
+        """
+        return (buggy_value, tuple(sorted(relevant_function_ids)))
+
+    @property
+    def key(self) -> Tuple[Value, Tuple[int, ...]]:
+        return BugReport.get_key(
+            self.buggy_value,
+            [function.function_id for function in self.relevant_functions.values()],
+        )
+
     def __hash__(self) -> int:
-        relevant_functions_ids = [
-            function.function_id for function in self.relevant_functions.values()
-        ]
-        return hash((self.buggy_value, tuple(sorted(relevant_functions_ids))))
+        return hash(self.key)
 
     def __eq__(self, value: object) -> bool:
         if not isinstance(value, BugReport):
             return False
-        return hash(self) == hash(value)
+        return self.key == value.key
@@ -0,0 +1,91 @@
+import json
+import os
+import queue
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from memory.report.bug_report import *
+
+
+class BugReportWriter:
+    """
+    Stream the confirmed bug reports to detect_info.jsonl in a result directory.
+    A single writer thread takes the reports from a queue and appends one line per report,
+    so the workers never serialize or write the reports themselves, and the cost of a report
+    does not grow with the number of earlier reports. The lines written together are synced
+    to disk at once. When the writer is closed, the lines are compacted into detect_info.json.
+    """
+
+    def __init__(self, res_dir_path: str, max_batch_size: int = 64) -> None:
+        """
+        :param res_dir_path: the result directory
+        :param max_batch_size: the maximal number of reports synced to disk at once
+        """
+        self.jsonl_path = os.path.join(res_dir_path, "detect_info.jsonl")
+        self.json_path = os.path.join(res_dir_path, "detect_info.json")
+        self.max_batch_size = max_batch_size
+
+        # (bug report id, bug report) pairs, and None to stop the writer thread
+        self.report_queue: queue.Queue[Optional[Tuple[int, BugReport]]] = queue.Queue()
+        self.thread = threading.Thread(target=self.__write_reports, daemon=True)
+        self.is_closed = False
+        self.thread.start()
+        return
+
+    def write(self, bug_report_id: int, bug_report: BugReport) -> None:
+        """
+        Queue a bug report to be appended.
+        :param bug_report_id: the id of the bug report in the state
+        :param bug_report: the bug report
+        """
+        self.report_queue.put((bug_report_id, bug_report))
+        return
+
+    def __write_reports(self) -> None:
+        with open(self.jsonl_path, "a") as jsonl_file:
+            is_stopped = False
+            while not is_stopped:
+                # Block for the first report, then take the ones already queued
+                batch = [self.report_queue.get()]
+                while len(batch) < self.max_batch_size:
+                    try:
+                        batch.append(self.report_queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                for item in batch:
+                    if item is None:
+                        is_stopped = True
+                        continue
+                    bug_report_id, bug_report = item
+                    line = {"id": bug_report_id, "report": bug_report.to_dict()}
+                    jsonl_file.write(json.dumps(line) + "\n")
+                jsonl_file.flush()
+                os.fsync(jsonl_file.fileno())
+        return
+
+    def close(self) -> None:
+        """
+        Wait until all the queued reports are appended, and compact detect_info.jsonl into detect_info.json,
+        which maps the bug report ids to the reports in id order.
+        """
+        if self.is_closed:
+            return
+        self.is_closed = True
+        self.report_queue.put(None)
+        self.thread.join()
+
+        bug_report_dict: Dict[int, dict] = {}
+        with open(self.jsonl_path, "r") as jsonl_file:
+            for line in jsonl_file:
+                if line.strip() == "":
+                    continue
+                item = json.loads(line)
+                bug_report_dict[item["id"]] = item["report"]
+
+        # Write to a temporary file first so that a reader never sees a partial detect_info.json
+        tmp_path = self.json_path + ".tmp"
+        with open(tmp_path, "w") as bug_info_file:
+            json.dump(dict(sorted(bug_report_dict.items())), bug_info_file, indent=4)
+        os.replace(tmp_path, self.json_path)
+        return
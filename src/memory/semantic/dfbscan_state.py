@@ -1,5 +1,5 @@
 import threading
-from typing import List, Tuple, Dict, Set
+from typing import Iterable, List, Optional, Tuple, Dict, Set
 from memory.syntactic.function import *
 from memory.syntactic.value import *
 from memory.report.bug_report import *
@@ -7,110 +7,199 @@ from memory.semantic.state import *
 from tstool.analyzer.TS_analyzer import *
 
 
-class DFBScanState(State):
-    def __init__(self, src_values: List[Value], sink_values: List[Value]) -> None:
-        self._src_values = src_values
-        self._sink_values = sink_values
+ValueWithContext = Tuple[Value, CallContext]
+
 
+class SourceDataFlow:
+    """
+    The data-flow facts discovered from a single source value.
+    A partition is only written by the worker processing its source, so it needs no lock.
+    The facts are append-only, and the read methods return the stored containers, which must not be mutated.
+    """
+
+    def __init__(self) -> None:
         # Data-flows per path in single functions
-        self._reachable_values_per_path: Dict[
-            Tuple[Value, CallContext], List[Set[Tuple[Value, CallContext]]]
+        self.reachable_values_per_path: Dict[
+            ValueWithContext, List[Set[ValueWithContext]]
         ] = {}
 
-        # Match parameter/return value with argument/output value
-        self._external_value_match: Dict[
-            Tuple[Value, CallContext], Set[Tuple[Value, CallContext]]
+        # Match parameter/return value with argument/output value.
+        # The ends of each start are an insertion-ordered set.
+        self.external_value_match: Dict[
+            ValueWithContext, Dict[ValueWithContext, None]
         ] = {}
 
-        # Potential buggy paths: src value -> {path_str -> path}
-        self._potential_buggy_paths: Dict[Value, Dict[str, List[Value]]] = {}
+        # Potential buggy paths: path_str -> path
+        self.potential_buggy_paths: Dict[str, List[Value]] = {}
+        return
+
 
-        # Bug reports
+class DFBScanState(State):
+    def __init__(self, src_values: List[Value], sink_values: List[Value]) -> None:
+        self._src_values = src_values
+        self._sink_values = sink_values
+
+        # Data-flow facts partitioned by source value
+        self._source_data_flows: Dict[Value, SourceDataFlow] = {}
+
+        # Bug reports, and the id of the bug report of each key for deduplication
         self._bug_reports: Dict[int, BugReport] = {}
+        self._bug_report_ids: Dict[Tuple[Value, Tuple[int, ...]], int] = {}
         self._total_bug_count = 0
 
         # Create locks for each field
-        self._reachable_values_lock = threading.Lock()
-        self._external_value_match_lock = threading.Lock()
-        self._potential_buggy_paths_lock = threading.Lock()
+        self._source_data_flows_lock = threading.Lock()
         self._bug_reports_lock = threading.Lock()
         self._total_bug_count_lock = threading.Lock()
 
+    def get_source_data_flow(self, src_value: Value) -> SourceDataFlow:
+        """
+        Get the partition of the data-flow facts of a source value, and create it if it does not exist.
+        :param src_value: the source value
+        """
+        source_data_flow = self._source_data_flows.get(src_value)
+        if source_data_flow is None:
+            with self._source_data_flows_lock:
+                source_data_flow = self._source_data_flows.setdefault(
+                    src_value, SourceDataFlow()
+                )
+        return source_data_flow
+
     def update_reachable_values_per_path(
-        self, start: Tuple[Value, CallContext], ends: Set[Tuple[Value, CallContext]]
+        self,
+        src_value: Value,
+        start: ValueWithContext,
+        ends: Set[ValueWithContext],
     ) -> None:
         """
         Update the reachable values per path
         """
-        with self._reachable_values_lock:
-            if start not in self._reachable_values_per_path:
-                self._reachable_values_per_path[start] = []
-            self._reachable_values_per_path[start].append(ends)
+        self.get_source_data_flow(src_value).reachable_values_per_path.setdefault(
+            start, []
+        ).append(ends)
 
     def update_external_value_match(
         self,
-        external_start: Tuple[Value, CallContext],
-        external_ends: Set[Tuple[Value, CallContext]],
+        src_value: Value,
+        external_start: ValueWithContext,
+        external_ends: Set[ValueWithContext],
     ) -> None:
         """
         Update the external value match
         """
-        with self._external_value_match_lock:
-            if external_start not in self._external_value_match:
-                self._external_value_match[external_start] = set()
-            self._external_value_match[external_start].update(external_ends)
+        matched_ends = self.get_source_data_flow(
+            src_value
+        ).external_value_match.setdefault(external_start, {})
+        for external_end in external_ends:
+            matched_ends[external_end] = None
 
     def update_potential_buggy_paths(self, src_value: Value, path: List[Value]) -> None:
         """
         Update the buggy paths
         """
-        with self._potential_buggy_paths_lock:
-            if src_value not in self._potential_buggy_paths:
-                self._potential_buggy_paths[src_value] = {}
-            self._potential_buggy_paths[src_value][str(path)] = path
+        self.get_source_data_flow(src_value).potential_buggy_paths[str(path)] = path
 
-    def update_bug_report(self, bug_report: BugReport) -> None:
+    def get_reachable_values_per_path(
+        self, src_value: Value, start: ValueWithContext
+    ) -> List[Set[ValueWithContext]]:
         """
-        Update the bug scan state with the bug report, deduplicating based on equality
+        Get the reachable values of each path from a value, or an empty list if it has not been analyzed.
+        """
+        return self.get_source_data_flow(src_value).reachable_values_per_path.get(
+            start, []
+        )
+
+    def get_external_value_match(
+        self, src_value: Value, external_start: ValueWithContext
+    ) -> Iterable[ValueWithContext]:
+        """
+        Get the values matched with a parameter/return value or an argument/output value.
+        """
+        return (
+            self.get_source_data_flow(src_value)
+            .external_value_match.get(external_start, {})
+            .keys()
+        )
+
+    def has_data_flow(self, src_value: Value, start: ValueWithContext) -> bool:
+        """
+        Check whether any data-flow fact starts from a value.
+        """
+        source_data_flow = self.get_source_data_flow(src_value)
+        return (
+            start in source_data_flow.reachable_values_per_path
+            or start in source_data_flow.external_value_match
+        )
+
+    def get_potential_buggy_paths(self, src_value: Value) -> List[List[Value]]:
+        """
+        Get the potential buggy paths of a source value.
+        """
+        return list(self.get_source_data_flow(src_value).potential_buggy_paths.values())
+
+    def update_bug_report(self, bug_report: BugReport) -> Optional[int]:
+        """
+        Update the bug scan state with the bug report, deduplicating based on its key
         :param bug_report: the bug report
+        :return: the id of the bug report, or None if it is a duplicate
         """
+        key = bug_report.key
         with self._bug_reports_lock:
             # Check if identical bug report already exists
-            if bug_report in self._bug_reports.values():
-                return
+            if key in self._bug_report_ids:
+                return None
             # Add new unique bug report
-            self._bug_reports[self._total_bug_count] = bug_report
-
-        with self._total_bug_count_lock:
-            self._total_bug_count += 1
+            with self._total_bug_count_lock:
+                bug_report_id = self._total_bug_count
+                self._total_bug_count += 1
+            self._bug_reports[bug_report_id] = bug_report
+            self._bug_report_ids[key] = bug_report_id
+        return bug_report_id
 
     @property
     def reachable_values_per_path(
         self,
-    ) -> Dict[Tuple[Value, CallContext], List[Set[Tuple[Value, CallContext]]]]:
+    ) -> Dict[ValueWithContext, List[Set[ValueWithContext]]]:
         """
-        Get the reachable values per path
+        Get a snapshot of the reachable values per path of all the sources
         """
-        with self._reachable_values_lock:
-            return self._reachable_values_per_path.copy()
+        reachable_values_per_path: Dict[
+            ValueWithContext, List[Set[ValueWithContext]]
+        ] = {}
+        for source_data_flow in self.__get_source_data_flows():
+            for start, ends in source_data_flow.reachable_values_per_path.items():
+                reachable_values_per_path.setdefault(start, []).extend(ends)
+        return reachable_values_per_path
 
     @property
     def external_value_match(
         self,
-    ) -> Dict[Tuple[Value, CallContext], Set[Tuple[Value, CallContext]]]:
+    ) -> Dict[ValueWithContext, Set[ValueWithContext]]:
         """
-        Get the external value match
+        Get a snapshot of the external value match of all the sources
         """
-        with self._external_value_match_lock:
-            return self._external_value_match.copy()
+        external_value_match: Dict[ValueWithContext, Set[ValueWithContext]] = {}
+        for source_data_flow in self.__get_source_data_flows():
+            for start, ends in source_data_flow.external_value_match.items():
+                external_value_match.setdefault(start, set()).update(ends)
+        return external_value_match
 
     @property
     def potential_buggy_paths(self) -> Dict[Value, Dict[str, List[Value]]]:
         """
-        Get the potential buggy paths
+        Get a snapshot of the potential buggy paths of all the sources
         """
-        with self._potential_buggy_paths_lock:
-            return self._potential_buggy_paths.copy()
+        with self._source_data_flows_lock:
+            source_data_flows = list(self._source_data_flows.items())
+        return {
+            src_value: dict(source_data_flow.potential_buggy_paths)
+            for src_value, source_data_flow in source_data_flows
+            if len(source_data_flow.potential_buggy_paths) > 0
+        }
+
+    def __get_source_data_flows(self) -> List[SourceDataFlow]:
+        with self._source_data_flows_lock:
+            return list(self._source_data_flows.values())
 
     @property
     def bug_reports(self) -> Dict[int, BugReport]:
@@ -130,19 +219,15 @@ class DFBScanState(State):
 
     def check_existence(self, src: Value, relevant_functions: set[Function]) -> bool:
         """
-        Check if the bug report with the same src and relevant functions already exists
+        Check if the bug report with the same src and relevant functions already exists.
+        The lock is only held for the lookup, so a path can be checked before its validation,
+        and update_bug_report still drops a duplicate reported in the meantime.
         """
+        key = BugReport.get_key(
+            src, [function.function_id for function in relevant_functions]
+        )
         with self._bug_reports_lock:
-            relevant_functions_ids = [
-                function.function_id for function in relevant_functions
-            ]
-            hash_value = hash((src, tuple(sorted(list(relevant_functions_ids)))))
-            is_exist = False
-            for report in self._bug_reports.values():
-                if hash(report) == hash_value:
-                    is_exist = True
-                    break
-            return is_exist
+            return key in self._bug_report_ids
 
     def print_reachable_values_per_path(self) -> None:
         """
@@ -151,20 +236,19 @@ class DFBScanState(State):
         print("=====================================")
         print("Reachable Values Per Path:")
         print("=====================================")
-        with self._reachable_values_lock:
-            for (
-                start_value,
-                start_context,
-            ), ends in self._reachable_values_per_path.items():
-                print("-------------------------------------")
-                print(f"Start: {str(start_value)}, {str(start_context)}")
-                for i in range(len(ends)):
-                    print("--------------------------")
-                    print(f"  Path {i + 1}:")
-                    for value, ctx in ends[i]:
-                        print(f"  End: {value}, {str(ctx)}")
-                    print("--------------------------")
-                print("-------------------------------------")
+        for (
+            start_value,
+            start_context,
+        ), ends in self.reachable_values_per_path.items():
+            print("-------------------------------------")
+            print(f"Start: {str(start_value)}, {str(start_context)}")
+            for i in range(len(ends)):
+                print("--------------------------")
+                print(f"  Path {i + 1}:")
+                for value, ctx in ends[i]:
+                    print(f"  End: {value}, {str(ctx)}")
+                print("--------------------------")
+            print("-------------------------------------")
         print("=====================================\n")
 
     def print_external_value_match(self) -> None:
@@ -174,14 +258,13 @@ class DFBScanState(State):
         print("=====================================")
         print("External Value Match:")
         print("=====================================")
-        with self._external_value_match_lock:
-            for start, ends in self._external_value_match.items():
-                print("-------------------------------------")
-                print(f"Start: {start[0]}, {str(start[1])}")
-                for end in ends:
-                    # end is a tuple of (Value, CallContext)
-                    print(f"  End: {end[0]}, {str(end[1])}")
-                print("-------------------------------------")
+        for start, ends in self.external_value_match.items():
+            print("-------------------------------------")
+            print(f"Start: {start[0]}, {str(start[1])}")
+            for end in ends:
+                # end is a tuple of (Value, CallContext)
+                print(f"  End: {end[0]}, {str(end[1])}")
+            print("-------------------------------------")
         print("=====================================\n")
 
     def print_potential_buggy_paths(self) -> None:
@@ -191,12 +274,11 @@ class DFBScanState(State):
         print("=====================================")
         print("Potential Buggy Paths:")
         print("=====================================")
-        with self._potential_buggy_paths_lock:
-            for src_value, paths in self._potential_buggy_paths.items():
-                print("-------------------------------------")
-                print(f"Source Value: {src_value}")
-                for path_str, path in paths.items():
-                    print(f"Path: {path_str}")
-                    print(f"  Path: {path}")
-                print("-------------------------------------")
+        for src_value, paths in self.potential_buggy_paths.items():
+            print("-------------------------------------")
+            print(f"Source Value: {src_value}")
+            for path_str, path in paths.items():
+                print(f"Path: {path_str}")
+                print(f"  Path: {path}")
+            print("-------------------------------------")
         print("=====================================\n")
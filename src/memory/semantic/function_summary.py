@@ -0,0 +1,233 @@
+import threading
+from typing import Callable, Dict, List, Set, Tuple
+from memory.syntactic.function import *
+from memory.syntactic.value import *
+from tstool.analyzer.TS_analyzer import *
+
+# The indices of the transitions taken from a start value, one per context label.
+# Sorting the explored values by their paths yields the order of a breadth-first exploration.
+ExplorationPath = Tuple[int, ...]
+
+
+class SummaryTransition:
+    """
+    An inter-procedural step from a value reached in a function, i.e., an argument into a callee,
+    or a parameter/return value back to a caller. The step is taken by pushing the context label.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        value: Value,
+        next_value: Value,
+        next_function: Function,
+        label: ContextLabel,
+    ) -> None:
+        """
+        :param index: the position of the transition among all the transitions of the analyzed value
+        :param value: the reached value
+        :param next_value: the value in the next function
+        :param next_function: the next function
+        :param label: the context label of the step
+        """
+        self.index = index
+        self.value = value
+        self.next_value = next_value
+        self.next_function = next_function
+        self.label = label
+
+
+class SummaryNode:
+    """
+    A value analyzed by intra-procedural data-flow analysis in a function summary.
+    """
+
+    def __init__(
+        self,
+        value: Value,
+        function: Function,
+        relative_context: CallContext,
+        path: ExplorationPath,
+        reachable_values: List[Set[Value]],
+        transitions: List[List[SummaryTransition]],
+    ) -> None:
+        """
+        :param value: the start value of the intra-procedural analysis
+        :param function: the function of the value
+        :param relative_context: the context labels from the start of the summary to the value,
+            in which every call is matched by a return
+        :param path: the first path from the start of the summary to the value
+        :param reachable_values: the values reachable from the value along each path
+        :param transitions: the transitions from the reachable values along each path
+        """
+        self.value = value
+        self.function = function
+        self.relative_context = relative_context
+        self.path = path
+        self.reachable_values = reachable_values
+        self.transitions = transitions
+
+
+class SummaryCall:
+    """
+    The summary of a callee embedded in the summary of a caller.
+    """
+
+    def __init__(
+        self,
+        relative_context: CallContext,
+        path: ExplorationPath,
+        summary: "FunctionSummary",
+    ):
+        """
+        :param relative_context: the context labels from the start of the caller summary
+            to the start of the callee summary, which end with the call
+        :param path: the first path from the start of the caller summary to the start of the callee summary
+        :param summary: the summary of the callee
+        """
+        self.relative_context = relative_context
+        self.path = path
+        self.summary = summary
+
+
+class FunctionSummary:
+    """
+    The context-independent closure of the data-flow facts from a start value in a non-recursive function,
+    up to max_depth context labels from the start value.
+    The values are reached in the function and in the callers returned to through matched calls,
+    which are the nodes of the summary, and in the non-recursive callees, whose own summaries are embedded.
+    The returns from the nodes to the callers outside the summary are its exits, and the calls into
+    recursive functions are its frontier. Neither is explored in the summary, since whether an exit is
+    CFL reachable depends on the call context, and the exploration of a recursive component is bounded
+    per source. A source reaching the start value with a call context C applies the summary by prefixing
+    the relative contexts with C, and continues from the exits and the frontier in the order of their paths.
+    """
+
+    def __init__(
+        self,
+        start_value: Value,
+        start_function: Function,
+        max_depth: int,
+        nodes: List[SummaryNode],
+        calls: List[SummaryCall],
+        frontier: List[Tuple[SummaryNode, SummaryTransition]],
+        is_complete: bool,
+    ) -> None:
+        """
+        :param start_value: the start value
+        :param start_function: the function of the start value
+        :param max_depth: the maximal number of context labels of the analyzed values
+        :param nodes: the analyzed nodes in the order of their paths
+        :param calls: the embedded summaries of the non-recursive callees
+        :param frontier: the calls from the nodes into recursive functions
+        :param is_complete: whether all the analyses succeeded, including those of the embedded summaries
+        """
+        self.start_value = start_value
+        self.start_function = start_function
+        self.max_depth = max_depth
+        self.nodes = nodes
+        self.calls = calls
+        self.frontier = frontier
+        self.is_complete = is_complete
+
+        # The contexts of the nodes are balanced, so all their returns are exits
+        self.exits: List[Tuple[SummaryNode, SummaryTransition]] = [
+            (node, transition)
+            for node in nodes
+            for path_transitions in node.transitions
+            for transition in path_transitions
+            if transition.label.parenthesis == Parenthesis.RIGHT_PAR
+        ]
+        return
+
+    def get_node_num(self, max_depth: int) -> int:
+        """
+        Count the nodes within a depth, including those of the embedded summaries.
+        :param max_depth: the maximal number of context labels
+        """
+        node_num = sum(
+            1 for node in self.nodes if node.relative_context.depth <= max_depth
+        )
+        for call in self.calls:
+            if call.relative_context.depth <= max_depth:
+                node_num += call.summary.get_node_num(
+                    max_depth - call.relative_context.depth
+                )
+        return node_num
+
+
+class FunctionSummaryTable:
+    """
+    Function summaries keyed by (function id, start value), shared by the workers of all the sources.
+    Every context label of a value adds one to its depth, and a summary is only pruned by depth,
+    so the summary computed up to a depth restricted to a smaller depth is the summary of that depth.
+    A summary is computed by only one worker, and the other workers asking for it wait for the result.
+    """
+
+    def __init__(self) -> None:
+        self._summaries: Dict[Tuple[int, Value], FunctionSummary] = {}
+        # The summaries being computed, keyed by (function id, start value, max depth).
+        # A summary only waits for the summaries of its callees, which are lower in the call graph
+        # since recursive functions are not summarized, so the waits never form a cycle.
+        self._pending_events: Dict[Tuple[int, Value, int], threading.Event] = {}
+        self._lock = threading.Lock()
+
+        self.computed_num = 0
+        self.reused_num = 0
+        # The intra-procedural analyses of the nodes in the reused summaries,
+        # each of which would otherwise have been an invocation of the analyzer
+        self.skipped_analysis_num = 0
+        return
+
+    def get_or_compute(
+        self,
+        function_id: int,
+        start_value: Value,
+        max_depth: int,
+        compute: Callable[[], FunctionSummary],
+    ) -> Tuple[FunctionSummary, bool]:
+        """
+        Get the summary of a start value in a function, and compute it if no summary of the depth exists.
+        An incomplete summary, e.g., one with a failed analysis, is returned but not stored,
+        so it is computed again when it is asked for later.
+        :param function_id: the id of the function
+        :param start_value: the start value
+        :param max_depth: the maximal number of context labels needed
+        :param compute: the function computing the summary
+        :return: the summary, and whether it is reused
+        """
+        key = (function_id, start_value)
+        pending_key = (function_id, start_value, max_depth)
+        while True:
+            with self._lock:
+                summary = self._summaries.get(key)
+                if summary is not None and summary.max_depth >= max_depth:
+                    self.reused_num += 1
+                    return summary, True
+                pending_event = self._pending_events.get(pending_key)
+                if pending_event is None:
+                    pending_event = threading.Event()
+                    self._pending_events[pending_key] = pending_event
+                    break
+            # Another worker is computing the summary
+            pending_event.wait()
+
+        try:
+            summary = compute()
+            with self._lock:
+                self.computed_num += 1
+                stored_summary = self._summaries.get(key)
+                if summary.is_complete and (
+                    stored_summary is None or stored_summary.max_depth < max_depth
+                ):
+                    self._summaries[key] = summary
+        finally:
+            with self._lock:
+                del self._pending_events[pending_key]
+            pending_event.set()
+        return summary, False
+
+    def add_skipped_analyses(self, skipped_analysis_num: int) -> None:
+        with self._lock:
+            self.skipped_analysis_num += skipped_analysis_num
+        return
@@ -1,4 +1,6 @@
+import threading
 import tree_sitter
+from typing import Dict, Optional, Tuple
 
 
 class API:
@@ -28,3 +30,43 @@ class API:
 
     def __hash__(self) -> int:
         return hash((self.api_name, self.api_para_num))
+
+
+class APITable:
+    """
+    Interning table of the APIs keyed by (api_name, api_para_num).
+    Each API gets an id when it is first interned and keeps it afterwards.
+    The table can be shared by the threads building the call graph.
+    """
+
+    def __init__(self) -> None:
+        self.api_env: Dict[int, API] = {}
+        self.api_ids: Dict[Tuple[str, int], int] = {}
+        self.lock = threading.Lock()
+        return
+
+    def intern(self, api_name: str, api_para_num: int) -> API:
+        """
+        Get the API with the name and the parameter number, and create it if it does not exist.
+        :param api_name: the name of the API
+        :param api_para_num: the number of the parameters of the API
+        :return: the unique API object of the key
+        """
+        key = (api_name, api_para_num)
+        api_id = self.api_ids.get(key)
+        if api_id is not None:
+            return self.api_env[api_id]
+        with self.lock:
+            api_id = self.api_ids.get(key)
+            if api_id is None:
+                api_id = len(self.api_env)
+                self.api_env[api_id] = API(api_id, api_name, api_para_num)
+                self.api_ids[key] = api_id
+        return self.api_env[api_id]
+
+    def lookup(self, api_name: str, api_para_num: int) -> Optional[API]:
+        """
+        Get the API with the name and the parameter number if it exists.
+        """
+        api_id = self.api_ids.get((api_name, api_para_num))
+        return self.api_env[api_id] if api_id is not None else None
@@ -0,0 +1,38 @@
+from tree_sitter import Node
+from typing import List, Optional, Set
+from memory.syntactic.value import Value
+
+
+class CallSite:
+    def __init__(
+        self,
+        node: Node,
+        callee_name: str,
+        callee_ids: List[int],
+        api_id: Optional[int],
+        arguments: Set[Value],
+        start_line_number: int,
+        end_line_number: int,
+    ) -> None:
+        """
+        Record the facts of a call site, which are computed once in call graph analysis.
+        :param node: the node of the call site
+        :param callee_name: the name of the callee
+        :param callee_ids: the ids of the user-defined functions that can be called
+        :param api_id: the id of the called library API if no user-defined function is called
+        :param arguments: the arguments at the call site
+        :param start_line_number: the line number of the start of the call site in the file
+        :param end_line_number: the line number of the end of the call site in the file
+        """
+        self.node = node
+        self.start_byte = node.start_byte
+        self.end_byte = node.end_byte
+        self.callee_name = callee_name
+        self.callee_ids = callee_ids
+        self.api_id = api_id
+        self.arguments = arguments
+        self.start_line_number = start_line_number
+        self.end_line_number = end_line_number
+
+    def __str__(self) -> str:
+        return f"CallSite(callee_name='{self.callee_name}', start_line_number={self.start_line_number}, end_line_number={self.end_line_number})"
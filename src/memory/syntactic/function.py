@@ -1,8 +1,12 @@
+from functools import cached_property
 from tree_sitter import Node
-from typing import List, Optional, Set, Tuple, Dict
+from typing import Callable, List, Optional, Set, Tuple, Dict
 from memory.syntactic.value import Value
+from memory.syntactic.call_site import CallSite
 
 LineScope = Tuple[int, int]
+# Get the text of a byte range in a file, i.e., (file path, start byte, end byte) -> text
+TextGetter = Callable[[str, int, int], str]
 IfInfo = Tuple[int, int, str, LineScope, LineScope]
 LoopInfo = Tuple[int, int, str, int, int]
 
@@ -12,26 +16,26 @@ class Function:
         self,
         function_id: int,
         function_name: str,
-        function_code: str,
         start_line_number: int,
         end_line_number: int,
         function_node: Node,
         file_path: str,
+        get_text: TextGetter,
     ) -> None:
         """
         Record basic facts of the function.
         Here, the function indicates a user-defined function or method.
         The implementation is provided in the project.
+        :param get_text: the getter of the source text, from which the code is read on demand
         """
         self.function_id = function_id
         self.function_name = function_name
-        self.function_code = function_code
+        self.get_text = get_text
         self.start_line_number = start_line_number
         self.end_line_number = end_line_number
         self.file_path = file_path
-        self.lined_code = (
-            self.attach_relative_line_number()
-        )  # code with line number attached
+        # The hash covers the whole code, so it is computed once on the first use
+        self.hash_value: Optional[int] = None
 
         # Attention: the parse tree is in the context of the whole file
         self.parse_tree_root_node = (
@@ -42,6 +46,14 @@ class Function:
         )  # call site info of user-defined functions
         self.api_call_site_nodes: List[Node] = []  # call site info of library APIs
 
+        ## Call site table built in call graph analysis, indexed by callee name and by line
+        self.call_sites: List[CallSite] = []
+        self.call_sites_by_callee_name: Dict[str, List[CallSite]] = {}
+        self.call_sites_by_line: Dict[int, List[CallSite]] = {}
+
+        ## Node type index of the parse tree, which is built on demand
+        self.node_type_index: Optional[Dict[str, List[Node]]] = None
+
         ## Results of AST node type analysis
         self.paras: Optional[Set[Value]] = None  # A set of parameters
         self.retvals: Optional[Set[Value]] = None  # A set of returned values
@@ -50,16 +62,64 @@ class Function:
         self.if_statements: Dict[LineScope, IfInfo] = {}  # if statement info
         self.loop_statements: Dict[LineScope, LoopInfo] = {}  # loop statement info
 
+    @property
+    def function_code(self) -> str:
+        """
+        The code of the function, which is decoded from the source text on each use.
+        It is not kept in the function, so the source text in memory stays within the budget of the store.
+        Callers using the code repeatedly should keep it themselves.
+        """
+        return self.get_text(
+            self.file_path,
+            self.parse_tree_root_node.start_byte,
+            self.parse_tree_root_node.end_byte,
+        )
+
     def __hash__(self) -> int:
-        return hash(
-            (
-                self.function_name,
-                self.function_code,
-                self.file_path,
-                self.start_line_number,
-                self.end_line_number,
+        if self.hash_value is None:
+            self.hash_value = hash(
+                (
+                    self.function_name,
+                    self.function_code,
+                    self.file_path,
+                    self.start_line_number,
+                    self.end_line_number,
+                )
             )
-        )
+        return self.hash_value
+
+    @cached_property
+    def lined_code(self) -> str:
+        """
+        The code with relative line numbers attached, which is built on the first use.
+        Only the functions shown to LLMs need it.
+        """
+        return self.attach_relative_line_number()
+
+    @cached_property
+    def absolute_lined_code(self) -> str:
+        """
+        The code with the line numbers in the file attached, which is built on the first use.
+        """
+        return attach_line_numbers(self.function_code, self.start_line_number)
+
+    def set_call_sites(self, call_sites: List[CallSite]) -> None:
+        """
+        Set the call site table and index it by callee name and by the lines each call site spans.
+        :param call_sites: the call sites in pre-order of the parse tree
+        """
+        self.call_sites = call_sites
+        self.call_sites_by_callee_name = {}
+        self.call_sites_by_line = {}
+        for call_site in call_sites:
+            self.call_sites_by_callee_name.setdefault(call_site.callee_name, []).append(
+                call_site
+            )
+            for line_number in range(
+                call_site.start_line_number, call_site.end_line_number + 1
+            ):
+                self.call_sites_by_line.setdefault(line_number, []).append(call_site)
+        return
 
     def file_line2function_line(self, file_line: int) -> int:
         """
@@ -72,29 +132,23 @@ class Function:
         Attach line numbers to the function code.
         Line numbers start from 1.
         """
-        lined_code = ""
-        function_content = "1. " + self.function_code
-        line_no = 2
-        for ch in function_content:
-            if ch == "\n":
-                lined_code += "\n" + str(line_no) + ". "
-                line_no += 1
-            else:
-                lined_code += ch
-        return lined_code
+        return attach_line_numbers(self.function_code, 1)
 
     def attach_absolute_line_number(self) -> str:
         """
         Attach line numbers to the function code
         Line numbers start from self.start_line_number
         """
-        lined_code = ""
-        function_content = str(self.start_line_number) + ". " + self.function_code
-        line_no = self.start_line_number + 1
-        for ch in function_content:
-            if ch == "\n":
-                lined_code += "\n" + str(line_no) + ". "
-                line_no += 1
-            else:
-                lined_code += ch
-        return lined_code
+        return self.absolute_lined_code
+
+
+def attach_line_numbers(code: str, start_line_number: int) -> str:
+    """
+    Prefix each line of the code with its line number, e.g., "3. return x;".
+    :param code: the code
+    :param start_line_number: the line number of the first line
+    """
+    return "\n".join(
+        f"{line_number}. {line}"
+        for line_number, line in enumerate(code.split("\n"), start_line_number)
+    )
@@ -1,5 +1,6 @@
 import re
-from typing import Set
+import threading
+from typing import Dict, List, Optional, Set
 from enum import Enum
 
 
@@ -53,6 +54,13 @@ class ValueLabel(Enum):
 
 
 class Value:
+    """
+    A value in the program. Values are immutable once created, so the identity tuple
+    and its hash are computed once in the constructor.
+    """
+
+    __slots__ = ("name", "line_number", "label", "file", "index", "key", "hash_value")
+
     def __init__(
         self, name: str, line_number: int, label: ValueLabel, file: str, index: int = -1
     ) -> None:
@@ -68,34 +76,30 @@ class Value:
         self.label = label
         self.file = file
         self.index = index
+        # The fields that identify a value, i.e., the fields shown by __str__
+        self.key = (name, file, line_number, index, label)
+        self.hash_value = hash(self.key)
 
     def __str__(self) -> str:
-        return (
-            "("
-            + "("
-            + self.name
-            + ", "
-            + str(self.file)
-            + ", "
-            + str(self.line_number)
-            + ", "
-            + str(self.index)
-            + ")"
-            + ", "
-            + str(self.label)
-            + ")"
-        )
+        return f"(({self.name}, {self.file}, {self.line_number}, {self.index}), {self.label})"
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Value):
             return NotImplemented
-        return self.__str__() == other.__str__()
+        return self.hash_value == other.hash_value and self.key == other.key
 
     def __repr__(self) -> str:
         return self.__str__()
 
     def __hash__(self) -> int:
-        return hash(self.__str__())
+        return self.hash_value
+
+    def __getstate__(self) -> tuple:
+        return (self.name, self.line_number, self.label, self.file, self.index)
+
+    def __setstate__(self, state: tuple) -> None:
+        # The hash of a string differs across processes, so it is recomputed after unpickling
+        self.__init__(*state)  # type: ignore[misc]
 
     @classmethod
     def from_str_to_value(cls, s: str) -> "Value":
@@ -103,9 +107,10 @@ class Value:
         Parse a string of the format:
             "((name, file, line_number, index), label)"
         and create a Value instance from it.
+        The name may contain commas (e.g., a call expression), so the other fields are matched from the end.
         """
-        pattern = r"^\(\(\s*(?P<name>[^,]+),\s*(?P<file>[^,]+),\s*(?P<line_number>\d+),\s*(?P<index>-?\d+)\s*\),\s*(?P<label>[^)]+)\)$"
-        match = re.match(pattern, s)
+        pattern = r"^\(\(\s*(?P<name>.+),\s*(?P<file>[^,]+),\s*(?P<line_number>\d+),\s*(?P<index>-?\d+)\s*\),\s*(?P<label>[^)]+)\)$"
+        match = re.match(pattern, s, re.DOTALL)
         if not match:
             raise ValueError(f"String does not match expected format: {s}")
 
@@ -116,3 +121,46 @@ class Value:
         label_str = match.group("label").strip()
 
         return cls(name, line_number, ValueLabel.from_str(label_str), file, index)
+
+
+class ValueTable:
+    """
+    Interning table of the values.
+    Each distinct value gets a small integer id when it is first interned and keeps it afterwards,
+    so the value can be stored or compared as an integer. The table can be shared by threads.
+    """
+
+    def __init__(self) -> None:
+        self.values: List[Value] = []
+        self.value_ids: Dict[Value, int] = {}
+        self.lock = threading.Lock()
+        return
+
+    def intern(self, value: Value) -> int:
+        """
+        Get the id of a value, and assign a new id if the value has not been interned.
+        :param value: the value
+        :return: the id of the value
+        """
+        value_id = self.value_ids.get(value)
+        if value_id is not None:
+            return value_id
+        with self.lock:
+            value_id = self.value_ids.get(value)
+            if value_id is None:
+                value_id = len(self.values)
+                self.values.append(value)
+                self.value_ids[value] = value_id
+        return value_id
+
+    def lookup(self, value: Value) -> Optional[int]:
+        """
+        Get the id of a value if it has been interned.
+        """
+        return self.value_ids.get(value)
+
+    def get_value(self, value_id: int) -> Value:
+        """
+        Get the canonical value of an id.
+        """
+        return self.values[value_id]
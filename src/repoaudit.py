@@ -1,11 +1,15 @@
 import argparse
 import os
 import glob
+import re
+import subprocess
 import sys
+from pathlib import Path
 from agent.metascan import *
 from agent.dfbscan import *
 
 from tstool.analyzer.TS_analyzer import *
+from tstool.analyzer.TS_file_discovery import *
 from tstool.analyzer.Cpp_TS_analyzer import *
 from tstool.analyzer.Go_TS_analyzer import *
 from tstool.analyzer.Java_TS_analyzer import *
@@ -39,16 +43,26 @@ class RepoAudit:
 
         self.project_path = args.project_path
         self.language = args.language
-        self.code_in_files: Dict[str, str] = {}
+        self.source_store = SourceStore(args.max_source_memory * 1024 * 1024)
+        self.include_globs = args.include
+        self.exclude_globs = args.exclude
+        self.max_file_size = args.max_file_size
 
         self.model_name = args.model_name
         self.temperature = args.temperature
         self.call_depth = args.call_depth
         self.max_symbolic_workers = args.max_symbolic_workers
         self.max_neural_workers = args.max_neural_workers
+        self.index_cache_dir = None if args.no_index_cache else args.index_cache_dir
+        self.symbolic_backend = args.symbolic_backend
+        self.profiler = Profiler(args.profile, args.cprofile)
 
         self.bug_type = args.bug_type
         self.is_reachable = args.is_reachable
+        self.since = args.since
+        self.previous_result_dir = args.previous_result_dir
+        self.max_paths_per_source = args.max_paths_per_source
+        self.use_function_summaries = not args.no_function_summaries
 
         suffixs = []
         if self.language == "Cpp":
@@ -68,19 +82,39 @@ class RepoAudit:
         self.ts_analyzer: TSAnalyzer
         if self.language == "Cpp":
             self.ts_analyzer = Cpp_TSAnalyzer(
-                self.code_in_files, self.language, self.max_symbolic_workers
+                self.source_store,
+                self.language,
+                self.max_symbolic_workers,
+                self.index_cache_dir,
+                self.symbolic_backend,
+                self.profiler,
             )
         elif self.language == "Go":
             self.ts_analyzer = Go_TSAnalyzer(
-                self.code_in_files, self.language, self.max_symbolic_workers
+                self.source_store,
+                self.language,
+                self.max_symbolic_workers,
+                self.index_cache_dir,
+                self.symbolic_backend,
+                self.profiler,
             )
         elif self.language == "Java":
             self.ts_analyzer = Java_TSAnalyzer(
-                self.code_in_files, self.language, self.max_symbolic_workers
+                self.source_store,
+                self.language,
+                self.max_symbolic_workers,
+                self.index_cache_dir,
+                self.symbolic_backend,
+                self.profiler,
             )
         elif self.language == "Python":
             self.ts_analyzer = Python_TSAnalyzer(
-                self.code_in_files, self.language, self.max_symbolic_workers
+                self.source_store,
+                self.language,
+                self.max_symbolic_workers,
+                self.index_cache_dir,
+                self.symbolic_backend,
+                self.profiler,
             )
         return
 
@@ -97,6 +131,11 @@ class RepoAudit:
             metascan_pipeline.start_scan()
 
         if self.args.scan_type == "dfbscan":
+            changed_lines = (
+                self.collect_changed_lines(self.since)
+                if self.since is not None
+                else None
+            )
             dfbscan_agent = DFBScanAgent(
                 self.bug_type,
                 self.is_reachable,
@@ -107,6 +146,10 @@ class RepoAudit:
                 self.temperature,
                 self.call_depth,
                 self.max_neural_workers,
+                max_paths_per_source=self.max_paths_per_source,
+                use_function_summaries=self.use_function_summaries,
+                changed_lines=changed_lines,
+                previous_res_dir_path=self.previous_result_dir,
             )
             dfbscan_agent.start_scan()
         return
@@ -114,60 +157,92 @@ class RepoAudit:
     def traverse_files(self, project_path: str, suffixs: List) -> None:
         """
         Traverse all files in the project path.
+        Files ignored by git, excluded by the user, oversized, binary, minified, or generated are skipped.
         """
-        for root, dirs, files in os.walk(project_path):
-            excluded_dirs = {
-                # Common
-                ".git",
-                ".vscode",
-                ".idea",
-                "build",
-                "dist",
-                "out",
-                "bin",
-                # Python
-                "__pycache__",
-                ".pytest_cache",
-                ".mypy_cache",
-                ".coverage",
-                "venv",
-                "env",
-                # Java
-                "target",
-                ".gradle",
-                ".m2",
-                ".settings",
-                "classes",
-                # C++
-                "CMakeFiles",
-                ".deps",
-                "Debug",
-                "Release",
-                "obj",
-                # Go
-                "vendor",
-                "pkg",
-            }
-            dirs[:] = [
-                d for d in dirs if not d.startswith(".") and d not in excluded_dirs
-            ]
-
-            for file in files:
-                if any(file.endswith(f".{suffix}") for suffix in suffixs):
-                    file_path = os.path.join(root, file)
-                    # if "test" in file_path.lower() or "example" in file_path.lower():
-                    #     continue
-
-                    try:
-                        with open(
-                            file_path, "r", encoding="utf-8", errors="ignore"
-                        ) as source_file:
-                            source_file_content = source_file.read()
-                            self.code_in_files[file_path] = source_file_content
-                    except Exception as e:
-                        print(f"Error reading file {file_path}: {e}")
+        file_discovery = FileDiscovery(
+            suffixs,
+            self.include_globs,
+            self.exclude_globs,
+            self.max_file_size * 1024,
+            self.max_symbolic_workers,
+        )
+        discovery_report = file_discovery.discover(project_path)
+        print(discovery_report.summary())
+
+        for file_path in discovery_report.file_paths:
+            try:
+                self.source_store.add_file(file_path)
+            except Exception as e:
+                print(f"Error reading file {file_path}: {e}")
         return
 
+    def collect_changed_lines(self, since: str) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Collect the lines of the loaded files that are changed since a git revision.
+        The working tree is compared with the revision, and untracked files are regarded as entirely changed.
+        :param since: the git revision
+        :return: a dictionary mapping the changed files to their changed line ranges
+        """
+        try:
+            diff_output = subprocess.run(
+                ["git", "-C", self.project_path, "-c", "core.quotePath=false"]
+                + ["diff", "-U0", "--no-color", "--no-ext-diff", "--relative"]
+                + ["--src-prefix=a/", "--dst-prefix=b/", since, "--"],
+                capture_output=True,
+                check=True,
+                encoding="utf-8",
+                errors="replace",
+            ).stdout
+            untracked_output = subprocess.run(
+                ["git", "-C", self.project_path, "-c", "core.quotePath=false"]
+                + ["ls-files", "--others", "--exclude-standard"],
+                capture_output=True,
+                check=True,
+                encoding="utf-8",
+                errors="replace",
+            ).stdout
+        except (OSError, subprocess.CalledProcessError) as e:
+            error_message = (
+                e.stderr if isinstance(e, subprocess.CalledProcessError) else e
+            )
+            print(f"Error collecting the changes since {since}: {error_message}")
+            exit(1)
+
+        # The loaded file paths are joined by os.walk, so compare normalized paths
+        loaded_file_paths = {
+            os.path.normpath(file_path): file_path for file_path in self.source_store
+        }
+        changed_lines: Dict[str, List[Tuple[int, int]]] = {}
+        current_file_path: Optional[str] = None
+        for line in diff_output.splitlines():
+            if line.startswith("+++ "):
+                current_file_path = None
+                if line.startswith("+++ b/"):
+                    current_file_path = loaded_file_paths.get(
+                        os.path.normpath(os.path.join(self.project_path, line[6:]))
+                    )
+                continue
+            match = re.match(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@", line)
+            if match is None or current_file_path is None:
+                continue
+            start_line = int(match.group(1))
+            line_num = int(match.group(2)) if match.group(2) is not None else 1
+            # A pure deletion is located between its neighbouring lines
+            end_line = start_line + line_num - 1 if line_num > 0 else start_line + 1
+            changed_lines.setdefault(current_file_path, []).append(
+                (start_line, end_line)
+            )
+
+        for relative_path in untracked_output.splitlines():
+            file_path = loaded_file_paths.get(
+                os.path.normpath(os.path.join(self.project_path, relative_path))
+            )
+            if file_path is not None:
+                changed_lines[file_path] = [
+                    (1, self.ts_analyzer.get_line_index(file_path).line_count)
+                ]
+        return changed_lines
+
     def validate_inputs(self) -> Tuple[bool, List[str]]:
         err_messages = []
 
@@ -205,6 +280,58 @@ def configure_args():
         default=30,
         help="Max symbolic workers for parsing-based analysis",
     )
+    parser.add_argument(
+        "--symbolic-backend",
+        choices=["thread", "process"],
+        default="process",
+        help="Run the workers of parsing-based analysis in threads or processes",
+    )
+    parser.add_argument(
+        "--max-source-memory",
+        type=int,
+        default=512,
+        help="Memory budget (MB) of the cached source file contents, including the function code decoded from them. "
+        "Cold files are read again when needed. The parse trees are not covered by the budget",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        help="Glob of the file paths (relative to the project path) to scan. Can be repeated",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        help="Glob of the file or directory paths (relative to the project path) to skip. Can be repeated",
+    )
+    parser.add_argument(
+        "--max-file-size",
+        type=int,
+        default=1024,
+        help="Max size (KB) of a scanned file. Larger files, e.g., amalgamations, are skipped. 0 for no limit",
+    )
+    parser.add_argument(
+        "--index-cache-dir",
+        default=str(Path(__file__).resolve().parent.parent / "cache/index"),
+        help="Directory of the on-disk index cache of parsing-based analysis",
+    )
+    parser.add_argument(
+        "--no-index-cache",
+        action="store_true",
+        help="Disable the on-disk index cache and re-index all files",
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record the time of each analysis stage in timings.json of the result directory",
+    )
+    parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help="Also dump the cProfile statistics of each non-concurrent stage to <stage>.prof, including the work of its worker threads (implies --profile)",
+    )
 
     # Common parameters for dfbscan
     parser.add_argument("--model-name", help="The name of LLMs")
@@ -219,9 +346,29 @@ def configure_args():
         help="Max neural workers for prompting-based analysis",
     )
     parser.add_argument("--bug-type", help="Bug type for dfbscan)")
+    parser.add_argument(
+        "--max-paths-per-source",
+        type=int,
+        default=100,
+        help="Max potential buggy paths validated per source in dfbscan",
+    )
+    parser.add_argument(
+        "--no-function-summaries",
+        action="store_true",
+        help="Disable the function summaries shared by the sources in dfbscan and analyze each source separately",
+    )
     parser.add_argument(
         "--is-reachable", action="store_true", help="Flag for bugscan reachability"
     )
+    parser.add_argument(
+        "--since",
+        help="Git revision for incremental dfbscan. Only the sources affected by the changes since it are rescanned",
+    )
+    parser.add_argument(
+        "--previous-result-dir",
+        help="Result directory whose bug reports are carried over in incremental dfbscan. "
+        "Defaults to the latest earlier result of the same setting",
+    )
 
     args = parser.parse_args()
     return args
@@ -17,14 +17,15 @@ class Go_TSAnalyzer(TSAnalyzer):
     """
 
     def extract_function_info(
-        self, file_path: str, source_code: str, tree: tree_sitter.Tree
-    ) -> None:
+        self, file_path: str, source_code: bytes, tree: tree_sitter.Tree
+    ) -> List[Tuple[str, int, int, tree_sitter.Node]]:
         """
         Parse the function information in a source file.
         :param file_path: The path of the source file.
         :param source_code: The content of the source file.
         :param tree: The parse tree of the source file.
         """
+        raw_data_list = []
         all_function_nodes = find_nodes_by_type(tree.root_node, "function_declaration")
         all_method_nodes = find_nodes_by_type(tree.root_node, "method_declaration")
         all_function_nodes.extend(all_method_nodes)
@@ -33,42 +34,36 @@ class Go_TSAnalyzer(TSAnalyzer):
             function_name = ""
             for sub_node in function_node.children:
                 if sub_node.type in {"identifier", "field_identifier"}:
-                    function_name = source_code[sub_node.start_byte : sub_node.end_byte]
+                    function_name = decode_text(
+                        source_code[sub_node.start_byte : sub_node.end_byte]
+                    )
                     break
 
             if function_name == "":
                 continue
 
             # Initialize the raw data of a function
-            start_line_number = source_code[: function_node.start_byte].count("\n") + 1
-            end_line_number = source_code[: function_node.end_byte].count("\n") + 1
-            function_id = len(self.functionRawDataDic) + 1
-
-            self.functionRawDataDic[function_id] = (
-                function_name,
-                start_line_number,
-                end_line_number,
-                function_node,
+            start_line_number = self.get_line_number(
+                file_path, function_node.start_byte
             )
-            self.functionToFile[function_id] = file_path
-
-            if function_name not in self.functionNameToId:
-                self.functionNameToId[function_name] = set([])
-            self.functionNameToId[function_name].add(function_id)
-        return
+            end_line_number = self.get_line_number(file_path, function_node.end_byte)
+            raw_data_list.append(
+                (function_name, start_line_number, end_line_number, function_node)
+            )
+        return raw_data_list
 
     def extract_global_info(
-        self, file_path: str, source_code: str, tree: tree_sitter.Tree
-    ) -> None:
+        self, file_path: str, source_code: bytes, tree: tree_sitter.Tree
+    ) -> Dict[str, str]:
         """
         Parse global (macro) information in a Go source file.
         Currently not implemented.
         """
         # TODO: Implement parsing of global information if necessary.
-        return
+        return {}
 
     def get_callee_name_at_call_site(
-        self, node: tree_sitter.Node, source_code: str
+        self, node: tree_sitter.Node, source_code: bytes
     ) -> str:
         """
         Get the callee name at the call site.
@@ -78,35 +73,18 @@ class Go_TSAnalyzer(TSAnalyzer):
             if sub_node.type == "selector_expression":
                 for sub_sub_node in sub_node.children:
                     if sub_sub_node.type == "field_identifier":
-                        return source_code[
-                            sub_sub_node.start_byte : sub_sub_node.end_byte
-                        ]
+                        return decode_text(
+                            source_code[sub_sub_node.start_byte : sub_sub_node.end_byte]
+                        )
             sub_node_types = [sub_node.type for sub_node in node.children]
             if "selector_expression" not in sub_node_types:
                 for sub_node in node.children:
                     if sub_node.type == "identifier":
-                        return source_code[sub_node.start_byte : sub_node.end_byte]
+                        return decode_text(
+                            source_code[sub_node.start_byte : sub_node.end_byte]
+                        )
         return ""
 
-    def get_callsites_by_callee_name(
-        self, current_function: Function, callee_name: str
-    ) -> List[tree_sitter.Node]:
-        """
-        Find the call site nodes by the callee name.
-        """
-        results = []
-        file_content = self.code_in_files[current_function.file_path]
-        call_site_nodes = find_nodes_by_type(
-            current_function.parse_tree_root_node, "call_expression"
-        )
-        for call_site in call_site_nodes:
-            if (
-                self.get_callee_name_at_call_site(call_site, file_content)
-                == callee_name
-            ):
-                results.append(call_site)
-        return results
-
     def get_arguments_at_callsite(
         self, current_function: Function, call_site_node: tree_sitter.Node
     ) -> Set[Value]:
@@ -118,16 +96,20 @@ class Go_TSAnalyzer(TSAnalyzer):
         """
         arguments: Set[Value] = set([])
         file_name = current_function.file_path
-        source_code = self.code_in_files[file_name]
+        source_code = self.source_store.get_bytes(file_name)
         for sub_node in call_site_node.children:
             if sub_node.type == "argument_list":
                 arg_list = sub_node.children[1:-1]
                 for element in arg_list:
                     if element.type != ",":
-                        line_number = source_code[: element.start_byte].count("\n") + 1
+                        line_number = self.get_line_number(
+                            file_name, element.start_byte
+                        )
                         arguments.add(
                             Value(
-                                source_code[element.start_byte : element.end_byte],
+                                decode_text(
+                                    source_code[element.start_byte : element.end_byte]
+                                ),
                                 line_number,
                                 ValueLabel.ARG,
                                 file_name,
@@ -147,7 +129,7 @@ class Go_TSAnalyzer(TSAnalyzer):
         if current_function.paras is not None:
             return current_function.paras
         current_function.paras = set([])
-        file_content = self.code_in_files[current_function.file_path]
+        file_content = self.source_store.get_bytes(current_function.file_path)
         parameter_list_nodes = []
         for sub_node in current_function.parse_tree_root_node.children:
             if sub_node.type in "parameter_list":
@@ -159,11 +141,13 @@ class Go_TSAnalyzer(TSAnalyzer):
             if sub_node.type in "parameter_declaration":
                 for sub_sub_node in sub_node.children:
                     if sub_sub_node.type in "identifier":
-                        parameter_name = file_content[
-                            sub_sub_node.start_byte : sub_sub_node.end_byte
-                        ]
-                        line_number = (
-                            file_content[: sub_sub_node.start_byte].count("\n") + 1
+                        parameter_name = decode_text(
+                            file_content[
+                                sub_sub_node.start_byte : sub_sub_node.end_byte
+                            ]
+                        )
+                        line_number = self.get_line_number(
+                            current_function.file_path, sub_sub_node.start_byte
                         )
                         current_function.paras.add(
                             Value(
@@ -190,12 +174,12 @@ class Go_TSAnalyzer(TSAnalyzer):
             return current_function.retvals
 
         current_function.retvals = set([])
-        file_content = self.code_in_files[current_function.file_path]
-        retnodes = find_nodes_by_type(
-            current_function.parse_tree_root_node, "return_statement"
-        )
+        file_content = self.source_store.get_bytes(current_function.file_path)
+        retnodes = self.get_nodes_by_type(current_function, "return_statement")
         for retnode in retnodes:
-            line_number = file_content[: retnode.start_byte].count("\n") + 1
+            line_number = self.get_line_number(
+                current_function.file_path, retnode.start_byte
+            )
             sub_node_types = [sub_node.type for sub_node in retnode.children]
             index = 0
             if "expression_list" in sub_node_types:
@@ -204,9 +188,11 @@ class Go_TSAnalyzer(TSAnalyzer):
                     if expression_node.type != ",":
                         current_function.retvals.add(
                             Value(
-                                file_content[
-                                    expression_node.start_byte : expression_node.end_byte
-                                ],
+                                decode_text(
+                                    file_content[
+                                        expression_node.start_byte : expression_node.end_byte
+                                    ]
+                                ),
                                 line_number,
                                 ValueLabel.RET,
                                 current_function.file_path,
@@ -227,15 +213,13 @@ class Go_TSAnalyzer(TSAnalyzer):
         return current_function.retvals
 
     def get_if_statements(
-        self, function: Function, source_code: str
+        self, function: Function, source_code: bytes
     ) -> Dict[Tuple, Tuple]:
         """
         Find if-statements in the Go function.
         Assume the structure: condition, block and optional else clause.
         """
-        if_statement_nodes = find_nodes_by_type(
-            function.parse_tree_root_node, "if_statement"
-        )
+        if_statement_nodes = self.get_nodes_by_type(function, "if_statement")
         if_statements = {}
         for if_node in if_statement_nodes:
             sub_node_types = [sub.type for sub in if_node.children]
@@ -244,46 +228,46 @@ class Go_TSAnalyzer(TSAnalyzer):
             except ValueError:
                 continue
 
-            true_branch_start_line = (
-                source_code[: if_node.children[block_index].start_byte].count("\n") + 1
+            true_branch_start_line = self.get_line_number(
+                function.file_path, if_node.children[block_index].start_byte
             )
-            true_branch_end_line = (
-                source_code[: if_node.children[block_index].end_byte].count("\n") + 1
+            true_branch_end_line = self.get_line_number(
+                function.file_path, if_node.children[block_index].end_byte
             )
 
             if "else" in sub_node_types:
                 else_index = sub_node_types.index("else")
-                else_branch_start_line = (
-                    source_code[: if_node.children[else_index + 1].start_byte].count(
-                        "\n"
-                    )
-                    + 1
+                else_branch_start_line = self.get_line_number(
+                    function.file_path, if_node.children[else_index + 1].start_byte
                 )
-                else_branch_end_line = (
-                    source_code[: if_node.children[else_index + 1].end_byte].count("\n")
-                    + 1
+                else_branch_end_line = self.get_line_number(
+                    function.file_path, if_node.children[else_index + 1].end_byte
                 )
             else:
                 else_branch_start_line = 0
                 else_branch_end_line = 0
 
             condition_index = block_index - 1
-            condition_start_line = (
-                source_code[: if_node.children[condition_index].start_byte].count("\n")
-                + 1
+            condition_start_line = self.get_line_number(
+                function.file_path, if_node.children[condition_index].start_byte
             )
-            condition_end_line = (
-                source_code[: if_node.children[condition_index].end_byte].count("\n")
-                + 1
+            condition_end_line = self.get_line_number(
+                function.file_path, if_node.children[condition_index].end_byte
+            )
+            condition_str = decode_text(
+                source_code[
+                    if_node.children[condition_index]
+                    .start_byte : if_node.children[condition_index]
+                    .end_byte
+                ]
             )
-            condition_str = source_code[
-                if_node.children[condition_index]
-                .start_byte : if_node.children[condition_index]
-                .end_byte
-            ]
 
-            if_statement_start_line = source_code[: if_node.start_byte].count("\n") + 1
-            if_statement_end_line = source_code[: if_node.end_byte].count("\n") + 1
+            if_statement_start_line = self.get_line_number(
+                function.file_path, if_node.start_byte
+            )
+            if_statement_end_line = self.get_line_number(
+                function.file_path, if_node.end_byte
+            )
             line_scope = (if_statement_start_line, if_statement_end_line)
             info = (
                 condition_start_line,
@@ -296,18 +280,18 @@ class Go_TSAnalyzer(TSAnalyzer):
         return if_statements
 
     def get_loop_statements(
-        self, function: Function, source_code: str
+        self, function: Function, source_code: bytes
     ) -> Dict[Tuple, Tuple]:
         """
         Find loop statements in the Go function.
         """
         loop_statements = {}
-        for_node_list = find_nodes_by_type(
-            function.parse_tree_root_node, "for_statement"
-        )
+        for_node_list = self.get_nodes_by_type(function, "for_statement")
         for loop_node in for_node_list:
-            loop_start_line = source_code[: loop_node.start_byte].count("\n") + 1
-            loop_end_line = source_code[: loop_node.end_byte].count("\n") + 1
+            loop_start_line = self.get_line_number(
+                function.file_path, loop_node.start_byte
+            )
+            loop_end_line = self.get_line_number(function.file_path, loop_node.end_byte)
 
             header_line_start = 0
             header_line_end = 0
@@ -315,27 +299,31 @@ class Go_TSAnalyzer(TSAnalyzer):
             loop_body_start_line = 0
             loop_body_end_line = 0
             if len(loop_node.children) >= 3:
-                header_line_start = (
-                    source_code[: loop_node.children[1].start_byte].count("\n") + 1
+                header_line_start = self.get_line_number(
+                    function.file_path, loop_node.children[1].start_byte
                 )
-                header_line_end = (
-                    source_code[: loop_node.children[1].end_byte].count("\n") + 1
+                header_line_end = self.get_line_number(
+                    function.file_path, loop_node.children[1].end_byte
                 )
-                header_str = source_code[
-                    loop_node.children[1].start_byte : loop_node.children[1].end_byte
-                ]
-                loop_body_start_line = (
-                    source_code[: loop_node.children[2].start_byte].count("\n") + 1
+                header_str = decode_text(
+                    source_code[
+                        loop_node.children[1]
+                        .start_byte : loop_node.children[1]
+                        .end_byte
+                    ]
+                )
+                loop_body_start_line = self.get_line_number(
+                    function.file_path, loop_node.children[2].start_byte
                 )
-                loop_body_end_line = (
-                    source_code[: loop_node.children[2].end_byte].count("\n") + 1
+                loop_body_end_line = self.get_line_number(
+                    function.file_path, loop_node.children[2].end_byte
                 )
             else:
-                loop_body_start_line = (
-                    source_code[: loop_node.children[1].start_byte].count("\n") + 1
+                loop_body_start_line = self.get_line_number(
+                    function.file_path, loop_node.children[1].start_byte
                 )
-                loop_body_end_line = (
-                    source_code[: loop_node.children[1].end_byte].count("\n") + 1
+                loop_body_end_line = self.get_line_number(
+                    function.file_path, loop_node.children[1].end_byte
                 )
                 header_line_start = loop_start_line
                 header_line_end = loop_start_line
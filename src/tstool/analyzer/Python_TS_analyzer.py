@@ -17,14 +17,15 @@ class Python_TSAnalyzer(TSAnalyzer):
     """
 
     def extract_function_info(
-        self, file_path: str, source_code: str, tree: tree_sitter.Tree
-    ) -> None:
+        self, file_path: str, source_code: bytes, tree: tree_sitter.Tree
+    ) -> List[Tuple[str, int, int, tree_sitter.Node]]:
         """
         Parse the function information in a source file.
         :param file_path: The path of the source file.
         :param source_code: The content of the source file.
         :param tree: The parse tree of the source file.
         """
+        raw_data_list = []
         all_function_header_nodes = find_nodes_by_type(
             tree.root_node, "function_definition"
         )
@@ -33,42 +34,34 @@ class Python_TSAnalyzer(TSAnalyzer):
             function_name = ""
             for sub_node in node.children:
                 if sub_node.type == "identifier":
-                    function_name = source_code[sub_node.start_byte : sub_node.end_byte]
+                    function_name = decode_text(
+                        source_code[sub_node.start_byte : sub_node.end_byte]
+                    )
                     break
 
             if function_name == "":
                 continue
 
-            start_line_number = source_code[: node.start_byte].count("\n") + 1
-            end_line_number = source_code[: node.end_byte].count("\n") + 1
-            function_id = len(self.functionRawDataDic) + 1
-
-            self.functionRawDataDic[function_id] = (
-                function_name,
-                start_line_number,
-                end_line_number,
-                node,
+            start_line_number = self.get_line_number(file_path, node.start_byte)
+            end_line_number = self.get_line_number(file_path, node.end_byte)
+            raw_data_list.append(
+                (function_name, start_line_number, end_line_number, node)
             )
-            self.functionToFile[function_id] = file_path
-
-            if function_name not in self.functionNameToId:
-                self.functionNameToId[function_name] = set([])
-            self.functionNameToId[function_name].add(function_id)
-        return
+        return raw_data_list
 
     def extract_global_info(
-        self, file_path: str, source_code: str, tree: tree_sitter.Tree
-    ) -> None:
+        self, file_path: str, source_code: bytes, tree: tree_sitter.Tree
+    ) -> Dict[str, str]:
         """
         Parse global variable information from a Python source file.
         For Python, this may include module-level variables.
         Currently not implemented.
         """
         # TODO: Add global variable analysis if needed.
-        return
+        return {}
 
     def get_callee_name_at_call_site(
-        self, node: tree_sitter.Node, source_code: str
+        self, node: tree_sitter.Node, source_code: bytes
     ) -> str:
         """
         Get the callee name at the call site.
@@ -78,38 +71,19 @@ class Python_TSAnalyzer(TSAnalyzer):
         function_name = ""
         for sub_node in node.children:
             if sub_node.type == "identifier":
-                function_name = source_code[sub_node.start_byte : sub_node.end_byte]
+                function_name = decode_text(
+                    source_code[sub_node.start_byte : sub_node.end_byte]
+                )
                 break
             if sub_node.type == "attribute":
                 for sub_sub_node in sub_node.children:
                     if sub_sub_node.type == "identifier":
-                        function_name = source_code[
-                            sub_sub_node.start_byte : sub_sub_node.end_byte
-                        ]
+                        function_name = decode_text(
+                            source_code[sub_sub_node.start_byte : sub_sub_node.end_byte]
+                        )
                 break
         return function_name
 
-    def get_callsites_by_callee_name(
-        self, current_function: Function, callee_name: str
-    ) -> List[tree_sitter.Node]:
-        """
-        Find the call sites by the callee function name.
-        :param current_function: the function to be analyzed
-        :param callee_name: the callee function name
-        """
-        results = []
-        file_content = self.code_in_files[current_function.file_path]
-        call_site_nodes = find_nodes_by_type(
-            current_function.parse_tree_root_node, "call"
-        )
-        for call_site in call_site_nodes:
-            if (
-                self.get_callee_name_at_call_site(call_site, file_content)
-                == callee_name
-            ):
-                results.append(call_site)
-        return results
-
     def get_arguments_at_callsite(
         self, current_function: Function, call_site_node: tree_sitter.Node
     ) -> Set[Value]:
@@ -121,16 +95,20 @@ class Python_TSAnalyzer(TSAnalyzer):
         """
         arguments: Set[Value] = set([])
         file_name = current_function.file_path
-        source_code = self.code_in_files[file_name]
+        source_code = self.source_store.get_bytes(file_name)
         for sub_node in call_site_node.children:
             if sub_node.type == "argument_list":
                 arg_list = sub_node.children[1:-1]
                 for element in arg_list:
                     if element.type != ",":
-                        line_number = source_code[: element.start_byte].count("\n") + 1
+                        line_number = self.get_line_number(
+                            file_name, element.start_byte
+                        )
                         arguments.add(
                             Value(
-                                source_code[element.start_byte : element.end_byte],
+                                decode_text(
+                                    source_code[element.start_byte : element.end_byte]
+                                ),
                                 line_number,
                                 ValueLabel.ARG,
                                 file_name,
@@ -150,21 +128,19 @@ class Python_TSAnalyzer(TSAnalyzer):
         if current_function.paras is not None:
             return current_function.paras
         current_function.paras = set([])
-        file_content = self.code_in_files[current_function.file_path]
-        parameters = find_nodes_by_type(
-            current_function.parse_tree_root_node, "parameters"
-        )
+        file_content = self.source_store.get_bytes(current_function.file_path)
+        parameters = self.get_nodes_by_type(current_function, "parameters")
         index = 0
         for parameter_node in parameters:
             parameter_name = ""
             for sub_node in parameter_node.children:
                 for sub_sub_node in find_nodes_by_type(sub_node, "identifier"):
-                    parameter_name = file_content[
-                        sub_sub_node.start_byte : sub_sub_node.end_byte
-                    ]
+                    parameter_name = decode_text(
+                        file_content[sub_sub_node.start_byte : sub_sub_node.end_byte]
+                    )
                     if parameter_name != "" and parameter_name != "self":
-                        line_number = (
-                            file_content[: sub_node.start_byte].count("\n") + 1
+                        line_number = self.get_line_number(
+                            current_function.file_path, sub_node.start_byte
                         )
                         current_function.paras.add(
                             Value(
@@ -190,12 +166,12 @@ class Python_TSAnalyzer(TSAnalyzer):
             return current_function.retvals
 
         current_function.retvals = set([])
-        file_content = self.code_in_files[current_function.file_path]
-        retnodes = find_nodes_by_type(
-            current_function.parse_tree_root_node, "return_statement"
-        )
+        file_content = self.source_store.get_bytes(current_function.file_path)
+        retnodes = self.get_nodes_by_type(current_function, "return_statement")
         for retnode in retnodes:
-            line_number = file_content[: retnode.start_byte].count("\n") + 1
+            line_number = self.get_line_number(
+                current_function.file_path, retnode.start_byte
+            )
             sub_node_types = [sub_node.type for sub_node in retnode.children]
             index = 0
             if "expression_list" in sub_node_types:
@@ -204,9 +180,11 @@ class Python_TSAnalyzer(TSAnalyzer):
                     if expression_node.type != ",":
                         current_function.retvals.add(
                             Value(
-                                file_content[
-                                    expression_node.start_byte : expression_node.end_byte
-                                ],
+                                decode_text(
+                                    file_content[
+                                        expression_node.start_byte : expression_node.end_byte
+                                    ]
+                                ),
                                 line_number,
                                 ValueLabel.RET,
                                 current_function.file_path,
@@ -228,9 +206,11 @@ class Python_TSAnalyzer(TSAnalyzer):
                 ret_value_node = retnode.children[1]
                 current_function.retvals.add(
                     Value(
-                        file_content[
-                            ret_value_node.start_byte : ret_value_node.end_byte
-                        ],
+                        decode_text(
+                            file_content[
+                                ret_value_node.start_byte : ret_value_node.end_byte
+                            ]
+                        ),
                         line_number,
                         ValueLabel.RET,
                         current_function.file_path,
@@ -240,36 +220,34 @@ class Python_TSAnalyzer(TSAnalyzer):
         return current_function.retvals
 
     def get_if_statements(
-        self, function: Function, source_code: str
+        self, function: Function, source_code: bytes
     ) -> Dict[Tuple, Tuple]:
         """
         Identify if-statements in the Python function.
         This is a simplified analysis for illustrative purposes.
         """
-        if_nodes = find_nodes_by_type(function.parse_tree_root_node, "if_statement")
+        if_nodes = self.get_nodes_by_type(function, "if_statement")
         if_statements = {}
         for node in if_nodes:
-            start_line = source_code[: node.start_byte].count("\n") + 1
-            end_line = source_code[: node.end_byte].count("\n") + 1
+            start_line = self.get_line_number(function.file_path, node.start_byte)
+            end_line = self.get_line_number(function.file_path, node.end_byte)
             # For Python, a detailed analysis would require inspecting the condition and body.
             info = (start_line, end_line, "", (end_line, end_line), (0, 0))
             if_statements[(start_line, end_line)] = info
         return if_statements
 
     def get_loop_statements(
-        self, function: Function, source_code: str
+        self, function: Function, source_code: bytes
     ) -> Dict[Tuple, Tuple]:
         """
         Identify loop statements (for and while) in the Python function.
         """
         loops = {}
-        loop_nodes = find_nodes_by_type(function.parse_tree_root_node, "for_statement")
-        loop_nodes.extend(
-            find_nodes_by_type(function.parse_tree_root_node, "while_statement")
-        )
+        loop_nodes = self.get_nodes_by_type(function, "for_statement")
+        loop_nodes.extend(self.get_nodes_by_type(function, "while_statement"))
         for node in loop_nodes:
-            start_line = source_code[: node.start_byte].count("\n") + 1
-            end_line = source_code[: node.end_byte].count("\n") + 1
+            start_line = self.get_line_number(function.file_path, node.start_byte)
+            end_line = self.get_line_number(function.file_path, node.end_byte)
             # Simplified header and body analysis.
             loops[(start_line, end_line)] = (
                 start_line,
@@ -3,7 +3,8 @@ from os import path
 from pathlib import Path
 import copy
 import concurrent.futures
-from typing import List, Optional, Tuple, Dict, Set
+import threading
+from typing import Any, List, Optional, Tuple, Dict, Set, Type
 from abc import ABC, abstractmethod
 
 from tree_sitter import Language, Node, Tree, Parser
@@ -14,7 +15,14 @@ sys.path.append(path.dirname(path.dirname(path.dirname(path.abspath(__file__))))
 
 from memory.syntactic.function import *
 from memory.syntactic.api import *
+from memory.syntactic.call_site import *
 from memory.syntactic.value import *
+from tstool.analyzer.TS_call_graph import *
+from tstool.analyzer.TS_index import *
+from tstool.analyzer.TS_interval_index import *
+from tstool.analyzer.TS_line_index import *
+from tstool.analyzer.TS_source_store import *
+from ui.profiler import *
 
 
 class Parenthesis(Enum):
@@ -26,6 +34,11 @@ class Parenthesis(Enum):
 
 
 class ContextLabel:
+    """
+    A call (LEFT_PAR) or return (RIGHT_PAR) edge at a call site.
+    Labels are immutable, so their identity tuple and hash are computed once.
+    """
+
     def __init__(
         self,
         file_name: str,
@@ -37,73 +50,150 @@ class ContextLabel:
         self.line_number = line_number
         self.function_id = function_id
         self.parenthesis = parenthesis
+        self.key = (file_name, line_number, function_id, parenthesis)
+        self.hash_value = hash(self.key)
 
     def __str__(self) -> str:
         return f"({self.file_name} {self.line_number} {self.function_id} {self.parenthesis})"
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ContextLabel):
+            return NotImplemented
+        return self.hash_value == other.hash_value and self.key == other.key
+
+    def __hash__(self) -> int:
+        return self.hash_value
+
+    def is_same_call_site(self, other: "ContextLabel") -> bool:
+        """
+        Check whether two labels are at the same call site of the same callee, regardless of the parenthesis.
+        """
+        return (
+            self.file_name == other.file_name
+            and self.line_number == other.line_number
+            and self.function_id == other.function_id
+        )
+
+
+# The stack of the unmatched labels as a persistent linked list: (top label, the rest of the stack)
+UnmatchedLabels = Optional[Tuple[ContextLabel, Any]]
+
 
 class CallContext:
-    def __init__(self, is_backward: bool = True):
-        self.context: List[ContextLabel] = []
-        self.simplified_context: List[ContextLabel] = []
-        self.is_backward = is_backward
+    """
+    An immutable call context, i.e., the sequence of context labels from the source.
+    Contexts form a persistent linked stack: pushing a label creates a child that shares its parent.
+    The children are hash-consed per parent, so pushing the same label twice yields the same object.
+    Each context also records the stack of its unmatched labels, where a call and the return
+    at the same call site cancel out. Pushing, hashing, and comparing contexts take constant time.
+    """
 
-    def add_and_check_context(self, label: ContextLabel) -> bool:
+    # The canonical empty contexts of the forward and backward analyses
+    empty_contexts: Dict[bool, "CallContext"] = {}
+    empty_contexts_lock = threading.Lock()
+
+    def __init__(
+        self,
+        is_backward: bool = True,
+        parent: Optional["CallContext"] = None,
+        label: Optional[ContextLabel] = None,
+        unmatched_labels: UnmatchedLabels = None,
+    ):
         """
-        Add a context entry to the context
-        :param label: the context label
-        :ret True if the context after adding the new context label is in the CFL reachable, False otherwise
+        Use CallContext.empty() for an empty context and push() to extend a context.
+        :param is_backward: whether the context is of a backward analysis
+        :param parent: the context before the last label
+        :param label: the last label
+        :param unmatched_labels: the stack of the unmatched labels
         """
-        is_CFL_reachable = True
+        self.is_backward = is_backward
+        self.parent = parent
+        self.label = label
+        self.unmatched_labels = unmatched_labels
+        self.depth: int = 0 if parent is None else parent.depth + 1
+        self.hash_value: int = hash(
+            (
+                is_backward,
+                parent.hash_value if parent is not None else None,
+                label.hash_value if label is not None else None,
+            )
+        )
+        self.children: Dict[ContextLabel, "CallContext"] = {}
+        self.children_lock = threading.Lock()
 
-        # Handle empty context case
-        if len(self.simplified_context) == 0:
-            self.simplified_context.append(label)
-            self.context.append(label)
-            return is_CFL_reachable
+    @classmethod
+    def empty(cls, is_backward: bool = True) -> "CallContext":
+        """
+        Get the canonical empty context.
+        """
+        empty_context = cls.empty_contexts.get(is_backward)
+        if empty_context is None:
+            with cls.empty_contexts_lock:
+                empty_context = cls.empty_contexts.setdefault(
+                    is_backward, CallContext(is_backward)
+                )
+        return empty_context
 
-        # Get the top element from the context stack
-        top_label = self.get_top_unmatched_context_label()
-        # TODO (ZZ): this assertion is added to satisfy the mypy check. Update the code to remove this assertion
-        assert top_label is not None, "Top label should not be None"
+    def push(self, label: ContextLabel) -> Optional["CallContext"]:
+        """
+        Extend the context with a label.
+        In the forward analysis, a return (RIGHT_PAR) cancels the unmatched call (LEFT_PAR) on the top
+        if they are at the same call site, and the context is not CFL reachable if they are not.
+        The backward analysis is symmetric.
+        :param label: the context label
+        :return: the extended context, or None if it is not CFL reachable
+        """
+        child = self.children.get(label)
+        if child is not None:
+            return child
 
         # Determine which labels to match based on analysis direction
-        first_label = (
+        first_parenthesis = (
             Parenthesis.LEFT_PAR if not self.is_backward else Parenthesis.RIGHT_PAR
         )
-        second_label = (
+        second_parenthesis = (
             Parenthesis.RIGHT_PAR if not self.is_backward else Parenthesis.LEFT_PAR
         )
 
-        # Check the label combinations
-        if top_label.parenthesis == label.parenthesis:
-            self.simplified_context.append(label)
-        elif top_label == first_label and label == second_label:
+        unmatched_labels: UnmatchedLabels = (label, self.unmatched_labels)
+        if self.unmatched_labels is not None:
+            top_label, rest_labels = self.unmatched_labels
             if (
-                top_label.file_name == label.file_name
-                and top_label.line_number == label.line_number
-                and top_label.function_id == label.function_id
+                top_label.parenthesis == first_parenthesis
+                and label.parenthesis == second_parenthesis
             ):
-                self.simplified_context.pop()
-            else:
-                is_CFL_reachable = False
-        else:
-            # Other combinations
-            self.simplified_context.append(label)
-
-        # Only update context if CFL reachable
-        if is_CFL_reachable:
-            self.context.append(label)
-        return is_CFL_reachable
+                if not top_label.is_same_call_site(label):
+                    return None
+                unmatched_labels = rest_labels
+
+        with self.children_lock:
+            child = self.children.get(label)
+            if child is None:
+                child = CallContext(self.is_backward, self, label, unmatched_labels)
+                self.children[label] = child
+        return child
+
+    @property
+    def context(self) -> List[ContextLabel]:
+        """
+        The labels from the first one to the last one.
+        """
+        labels = []
+        current_context: Optional[CallContext] = self
+        while current_context is not None and current_context.label is not None:
+            labels.append(current_context.label)
+            current_context = current_context.parent
+        labels.reverse()
+        return labels
 
     def get_top_unmatched_context_label(self) -> Optional[ContextLabel]:
         """
         Get the top unmatched context label.
         :return: The top unmatched context label.
         """
-        if len(self.simplified_context) == 0:
+        if self.unmatched_labels is None:
             return None
-        return self.simplified_context[-1]
+        return self.unmatched_labels[0]
 
     def __str__(self) -> str:
         """
@@ -116,11 +206,20 @@ class CallContext:
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, CallContext):
             return NotImplemented
-        return self.__str__() == other.__str__()
+        if self is other:
+            return True
+        # Contexts built from the same empty context are hash-consed, so the structural
+        # comparison is only reached by the contexts built from different empty contexts
+        return (
+            self.hash_value == other.hash_value
+            and self.depth == other.depth
+            and self.is_backward == other.is_backward
+            and self.label == other.label
+            and self.parent == other.parent
+        )
 
     def __hash__(self) -> int:
-        # Convert context list to tuple for hashing; assumes that context entries are immutable
-        return hash(self.__str__())
+        return self.hash_value
 
 
 class TSAnalyzer(ABC):
@@ -130,47 +229,54 @@ class TSAnalyzer(ABC):
 
     def __init__(
         self,
-        code_in_files: Dict[str, str],
+        source_store: SourceStore,
         language_name: str,
         max_symbolic_workers_num=10,
+        index_cache_dir: Optional[str] = None,
+        symbolic_backend: str = "process",
+        profiler: Optional[Profiler] = None,
     ) -> None:
         """
         Initialize TSAnalyzer with the project source code and language.
-        :param code_in_files: A dictionary mapping file paths to source file contents.
+        :param source_store: The store of the project source files.
         :param language: The programming language of the source code.
+        :param max_symbolic_workers_num: The maximal number of workers for parsing-based analysis.
+        :param index_cache_dir: The directory of the on-disk index cache. The cache is disabled if it is None.
+        :param symbolic_backend: The backend of the workers indexing files, either "thread" or "process".
+        :param profiler: The profiler timing the analysis stages. Nothing is timed if it is None.
         """
-        self.code_in_files = code_in_files
-        cwd = Path(__file__).resolve().parent.absolute()
-        TSPATH = cwd / "../../../lib/build/"
-        language_path = TSPATH / "my-languages.so"
+        self.source_store = source_store
+        self.profiler = profiler if profiler is not None else Profiler()
         self.max_symbolic_workers_num = max_symbolic_workers_num
-
-        # Initialize tree-sitter parser
-        self.parser = Parser()
-        self.language_name = language_name
-        if language_name == "C":
-            self.language = Language(str(language_path), "c")
-        elif language_name == "Cpp":
-            self.language = Language(str(language_path), "cpp")
-        elif language_name == "Java":
-            self.language = Language(str(language_path), "java")
-        elif language_name == "Python":
-            self.language = Language(str(language_path), "python")
-        elif language_name == "Go":
-            self.language = Language(str(language_path), "go")
-        else:
-            raise ValueError("Invalid language setting")
-        self.parser.set_language(self.language)
+        if symbolic_backend not in {"thread", "process"}:
+            raise ValueError("Invalid symbolic backend setting")
+        self.symbolic_backend = symbolic_backend
+        self._setup_parser(language_name)
+
+        # Index cache keyed by file content and grammar version
+        self.index_cache: Optional[TSIndexCache] = None
+        if index_cache_dir is not None:
+            self.index_cache = TSIndexCache(
+                index_cache_dir, language_name, self.language_path
+            )
 
         # Results of parsing
         self.functionRawDataDic: Dict[int, Tuple[str, int, int, Node]] = {}
         self.functionNameToId: Dict[str, Set[int]] = {}
         self.functionToFile: Dict[int, str] = {}
-        self.fileContentDic: Dict[str, str] = {}
         self.glb_var_map: Dict[str, str] = {}  # global var info
+        self.callSiteRecordDic: Dict[int, List[CallSiteRecord]] = {}
+        self.fileLineIndexDic: Dict[str, LineIndex] = {}  # built lazily per file
+        self.fileLineNodeIndexDic: Dict[str, LineNodeIndex] = (
+            {}
+        )  # built lazily per file
+        # Function line spans per file, built lazily on the first lookup of a local value
+        self.fileIntervalIndexDic: Optional[Dict[str, IntervalIndex]] = None
 
         self.function_env: Dict[int, Function] = {}
-        self.api_env: Dict[int, API] = {}
+        # APIs interned by (name, parameter number). api_env maps the ids to the APIs.
+        self.api_table = APITable()
+        self.api_env: Dict[int, API] = self.api_table.api_env
 
         # Results of call graph analysis
         ## Caller-callee relationship between user-defined functions
@@ -181,6 +287,9 @@ class TSAnalyzer(ABC):
         self.function_caller_api_callee_map: Dict[int, Set[int]] = {}
         self.api_callee_function_caller_map: Dict[int, Set[int]] = {}
 
+        ## Array-backed call graph between user-defined functions for transitive queries
+        self.call_graph = CallGraph([], {})
+
         # Analyze stage I: Project AST parsing
         self.parse_project()
 
@@ -188,83 +297,306 @@ class TSAnalyzer(ABC):
         self.analyze_call_graph()
         return
 
-    def _parse_single_file(self, file_path: str, source_code: str) -> Tuple[str, str]:
+    def _setup_parser(self, language_name: str) -> None:
         """
-        Helper function to parse a single file.
+        Initialize the tree-sitter parser of the language.
+        """
+        cwd = Path(__file__).resolve().parent.absolute()
+        TSPATH = cwd / "../../../lib/build/"
+        language_path = TSPATH / "my-languages.so"
+        self.language_path = str(language_path)
+
+        # Initialize tree-sitter parser
+        self.parser = Parser()
+        self.language_name = language_name
+        if language_name == "C":
+            self.language = Language(str(language_path), "c")
+        elif language_name == "Cpp":
+            self.language = Language(str(language_path), "cpp")
+        elif language_name == "Java":
+            self.language = Language(str(language_path), "java")
+        elif language_name == "Python":
+            self.language = Language(str(language_path), "python")
+        elif language_name == "Go":
+            self.language = Language(str(language_path), "go")
+        else:
+            raise ValueError("Invalid language setting")
+        self.parser.set_language(self.language)
+
+        if self.language_name in {"C", "Cpp", "Go"}:
+            self.call_node_type = "call_expression"
+        elif self.language_name == "Java":
+            self.call_node_type = "method_invocation"
+        elif self.language_name == "Python":
+            self.call_node_type = "call"
+        return
+
+    def _parse_source_code(self, file_path: str, source_code: bytes) -> Tree:
+        """
+        Helper function to parse the content of a single file.
         """
         try:
-            tree = self.parser.parse(bytes(source_code, "utf8"))
+            # The source is kept in the source store rather than in the tree
+            tree = self.parser.parse(source_code, keep_text=False)
         except Exception as e:
             print(self.parser)
             print(f"Error parsing {file_path}: {e}")
             exit(0)
-        # Call user-defined processing.
-        self.extract_function_info(file_path, source_code, tree)
-        self.extract_global_info(file_path, source_code, tree)
-        return file_path, source_code
-
-    def _analyze_single_function(
-        self, function_id: int, raw_data: Tuple[str, int, int, Node]
-    ) -> Tuple[int, Function]:
-        """
-        Helper function to analyze a single function.
-        """
-        (name, start_line_number, end_line_number, function_node) = raw_data
-        file_name = self.functionToFile[function_id]
-        file_content = self.fileContentDic[file_name]
-        function_code = file_content[function_node.start_byte : function_node.end_byte]
-        current_function = Function(
-            function_id,
-            name,
-            function_code,
-            start_line_number,
-            end_line_number,
-            function_node,
-            file_name,
-        )
-        current_function = self.extract_meta_data_in_single_function(current_function)
-        return function_id, current_function
+        return tree
+
+    def _index_single_file(self, file_path: str) -> Tuple[FileIndex, Optional[Tree]]:
+        """
+        Helper function to index a single file.
+        The index only depends on the file itself, so it can be computed in any worker and cached.
+        :return: the index of the file and its parse tree.
+        """
+        source_code = self.source_store.get_bytes(file_path)
+        with self.profiler.stage("parse_files", 1, is_concurrent=True):
+            tree = self._parse_source_code(file_path, source_code)
+        file_index = FileIndex(file_path, "")
+        with self.profiler.stage("extract_functions", 1, is_concurrent=True):
+            raw_data_list = self.extract_function_info(file_path, source_code, tree)
+            file_index.glb_var_map = self.extract_global_info(
+                file_path, source_code, tree
+            )
+        with self.profiler.stage(
+            "analyze_functions", len(raw_data_list), is_concurrent=True
+        ):
+            file_index.functions.extend(
+                self._analyze_functions(file_path, source_code, raw_data_list)
+            )
+        return file_index, tree
+
+    def _analyze_functions(
+        self,
+        file_path: str,
+        source_code: bytes,
+        raw_data_list: List[Tuple[str, int, int, Node]],
+    ) -> List[FunctionRecord]:
+        """
+        Helper function to analyze the functions in a single file.
+        :return: the records of the functions, including their meta data and call sites.
+        """
+        function_records = []
+        for name, start_line_number, end_line_number, function_node in raw_data_list:
+            current_function = Function(
+                -1,
+                name,
+                start_line_number,
+                end_line_number,
+                function_node,
+                file_path,
+                self.source_store.get_text,
+            )
+            current_function = self.extract_meta_data_in_single_function(
+                current_function
+            )
+            function_record = FunctionRecord(
+                name,
+                start_line_number,
+                end_line_number,
+                function_node.start_byte,
+                function_node.end_byte,
+                function_node.type,
+            )
+            # TODO (ZZ): these assertions are to make mypy happy
+            assert current_function.paras is not None, "analysis is not done yet"
+            assert current_function.retvals is not None, "analysis is not done yet"
+            function_record.paras = current_function.paras
+            function_record.retvals = current_function.retvals
+            function_record.if_statements = current_function.if_statements
+            function_record.loop_statements = current_function.loop_statements
+
+            for call_site_node in self.get_nodes_by_type(
+                current_function, self.call_node_type
+            ):
+                callee_name = self.get_callee_name_at_call_site(
+                    call_site_node, source_code
+                )
+                arguments = self.get_arguments_at_callsite(
+                    current_function, call_site_node
+                )
+                function_record.call_sites.append(
+                    CallSiteRecord(
+                        call_site_node.start_byte,
+                        call_site_node.end_byte,
+                        call_site_node.type,
+                        callee_name,
+                        sorted(
+                            (
+                                (argument.name, argument.line_number, argument.index)
+                                for argument in arguments
+                            ),
+                            key=lambda argument: argument[2],
+                        ),
+                        self.get_line_number(file_path, call_site_node.start_byte),
+                        self.get_line_number(file_path, call_site_node.end_byte),
+                    )
+                )
+            function_records.append(function_record)
+        return function_records
+
+    def _merge_file_index(self, file_index: FileIndex, tree: Optional[Tree]) -> None:
+        """
+        Helper function to register the functions of an indexed file.
+        The function nodes are recovered from the parse tree by their byte spans.
+        """
+        file_path = file_index.file_path
+        source_code = self.source_store.get_bytes(file_path)
+        if tree is None:
+            tree = self._parse_source_code(file_path, source_code)
+        self.glb_var_map.update(file_index.glb_var_map)
+
+        for function_record in file_index.functions:
+            function_node = find_node_by_span(
+                tree.root_node,
+                function_record.start_byte,
+                function_record.end_byte,
+                function_record.node_type,
+            )
+            if function_node is None:
+                continue
+            function_name = function_record.function_name
+            function_id = len(self.functionRawDataDic) + 1
+
+            self.functionRawDataDic[function_id] = (
+                function_name,
+                function_record.start_line_number,
+                function_record.end_line_number,
+                function_node,
+            )
+            self.functionToFile[function_id] = file_path
+            if function_name not in self.functionNameToId:
+                self.functionNameToId[function_name] = set([])
+            self.functionNameToId[function_name].add(function_id)
+
+            current_function = Function(
+                function_id,
+                function_name,
+                function_record.start_line_number,
+                function_record.end_line_number,
+                function_node,
+                file_path,
+                self.source_store.get_text,
+            )
+            current_function.paras = function_record.paras
+            current_function.retvals = function_record.retvals
+            current_function.if_statements = function_record.if_statements
+            current_function.loop_statements = function_record.loop_statements
+            self.function_env[function_id] = current_function
+            self.callSiteRecordDic[function_id] = function_record.call_sites
+        return
 
     def parse_project(self) -> None:
         """
         Parse all project files using tree-sitter.
+        Each file is indexed independently, and the indexes are merged in a fixed order
+        so that function ids do not depend on the scheduling of the workers.
+        """
+        file_paths = sorted(self.source_store)
+        file_indexes: Dict[str, Tuple[FileIndex, Optional[Tree]]] = {}
+
+        # Load the indexes of unchanged files from the index cache
+        file_keys: Dict[str, str] = {}
+        uncached_file_paths = []
+        with self.profiler.stage("load_index_cache", len(file_paths)):
+            for file_path in file_paths:
+                if self.index_cache is not None:
+                    key = self.index_cache.get_key(
+                        file_path, self.source_store.get_bytes(file_path)
+                    )
+                    file_keys[file_path] = key
+                    cached_file_index = self.index_cache.load(key)
+                    if cached_file_index is not None:
+                        file_indexes[file_path] = (cached_file_index, None)
+                        continue
+                uncached_file_paths.append(file_path)
+
+        pbar = tqdm(total=len(file_paths), desc="Parsing files")
+        pbar.update(len(file_paths) - len(uncached_file_paths))
+        with self.profiler.stage("index_files", len(uncached_file_paths)):
+            if self.symbolic_backend == "process" and self.max_symbolic_workers_num > 1:
+                self._index_files_in_processes(uncached_file_paths, file_indexes, pbar)
+            else:
+                self._index_files_in_threads(uncached_file_paths, file_indexes, pbar)
+        pbar.close()
+
+        if self.index_cache is not None:
+            with self.profiler.stage("store_index_cache", len(uncached_file_paths)):
+                for file_path in uncached_file_paths:
+                    file_index, _ = file_indexes[file_path]
+                    file_index.content_hash = file_keys[file_path]
+                    self.index_cache.store(file_index)
+            print(
+                f"Index cache: {self.index_cache.hit_num} hits, {self.index_cache.miss_num} misses"
+            )
+
+        with self.profiler.stage("merge_file_indexes", len(file_paths)):
+            for file_path in file_paths:
+                file_index, tree = file_indexes[file_path]
+                self._merge_file_index(file_index, tree)
+        return
+
+    def _index_files_in_threads(
+        self,
+        file_paths: List[str],
+        file_indexes: Dict[str, Tuple[FileIndex, Optional[Tree]]],
+        pbar: tqdm,
+    ) -> None:
+        """
+        Index files in a thread pool. The parse trees are kept for merging.
         """
         with concurrent.futures.ThreadPoolExecutor(
             max_workers=self.max_symbolic_workers_num
         ) as executor:
-            parse_futures: Dict[concurrent.futures.Future[Tuple[str, str]], str] = {}
-            pbar = tqdm(total=len(self.code_in_files), desc="Parsing files")
-            for file_path, source_code in self.code_in_files.items():
+            index_futures: Dict[
+                concurrent.futures.Future[Tuple[FileIndex, Optional[Tree]]], str
+            ] = {}
+            for file_path in file_paths:
                 # Submit a task for each file.
-                parse_future = executor.submit(
-                    self._parse_single_file, file_path, source_code
-                )
-                parse_futures[parse_future] = file_path
+                index_future = executor.submit(self._index_single_file, file_path)
+                index_futures[index_future] = file_path
             # Collect results.
-            for parse_future in concurrent.futures.as_completed(parse_futures):
-                file_path, source = parse_future.result()
-                self.fileContentDic[file_path] = source
+            for index_future in concurrent.futures.as_completed(index_futures):
+                file_indexes[index_futures[index_future]] = index_future.result()
                 pbar.update(1)
-            pbar.close()
+        return
 
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=self.max_symbolic_workers_num
-        ) as executor:
-            analyze_futures: Dict[
-                concurrent.futures.Future[Tuple[int, Function]], int
-            ] = {}
-            pbar = tqdm(total=len(self.functionRawDataDic), desc="Analyzing functions")
-            for function_id, raw_data in self.functionRawDataDic.items():
-                analyze_future = executor.submit(
-                    self._analyze_single_function, function_id, raw_data
-                )
-                analyze_futures[analyze_future] = function_id
+    def _index_files_in_processes(
+        self,
+        file_paths: List[str],
+        file_indexes: Dict[str, Tuple[FileIndex, Optional[Tree]]],
+        pbar: tqdm,
+    ) -> None:
+        """
+        Index files in a process pool so that the AST walks are not serialized by the GIL.
+        Each worker indexes a shard of files and returns the picklable indexes.
+        The files on disk are read by the workers, and only the contents added in memory are sent to them.
+        The parse trees are rebuilt when the indexes are merged.
+        """
+        if len(file_paths) == 0:
+            return
+        shard_num = min(len(file_paths), self.max_symbolic_workers_num * 4)
+        shards: List[List[Tuple[str, Optional[bytes]]]] = [[] for _ in range(shard_num)]
+        for i, file_path in enumerate(file_paths):
+            shards[i % shard_num].append(
+                (file_path, self.source_store.pinned_contents.get(file_path))
+            )
 
-            for analyze_future in concurrent.futures.as_completed(analyze_futures):
-                func_id, current_function = analyze_future.result()
-                self.function_env[func_id] = current_function
-                pbar.update(1)
-            pbar.close()
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_symbolic_workers_num,
+            initializer=_init_index_worker,
+            initargs=(type(self), self.language_name, self.profiler.is_enabled),
+        ) as executor:
+            shard_futures = [
+                executor.submit(_index_file_shard, shard) for shard in shards
+            ]
+            for shard_future in concurrent.futures.as_completed(shard_futures):
+                shard_file_indexes, shard_stage_timings = shard_future.result()
+                self.profiler.add_stage_timings(shard_stage_timings)
+                for file_index in shard_file_indexes:
+                    file_indexes[file_index.file_path] = (file_index, None)
+                pbar.update(len(shard_file_indexes))
         return
 
     def analyze_call_graph(self) -> None:
@@ -275,20 +607,24 @@ class TSAnalyzer(ABC):
         Note that library APIs are collected on the fly.
         This method parallelizes the extraction of call graph edges.
         """
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=self.max_symbolic_workers_num
-        ) as executor:
-            futures = {}
-            pbar = tqdm(total=len(self.function_env), desc="Analyzing call graphs")
-            for function_id, current_function in self.function_env.items():
-                future = executor.submit(
-                    self.extract_call_graph_edges, current_function
-                )
-                futures[future] = function_id
-            for future in concurrent.futures.as_completed(futures):
-                # Optionally, process or log each completed task here.
-                pbar.update(1)
-            pbar.close()
+        with self.profiler.stage("analyze_call_graph", len(self.function_env)):
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_symbolic_workers_num
+            ) as executor:
+                futures = {}
+                pbar = tqdm(total=len(self.function_env), desc="Analyzing call graphs")
+                for function_id, current_function in self.function_env.items():
+                    future = executor.submit(
+                        self.extract_call_graph_edges, current_function
+                    )
+                    futures[future] = function_id
+                for future in concurrent.futures.as_completed(futures):
+                    # Optionally, process or log each completed task here.
+                    pbar.update(1)
+                pbar.close()
+            self.call_graph = CallGraph(
+                self.function_env.keys(), self.function_caller_callee_map
+            )
         return
 
     ###########################################
@@ -296,13 +632,14 @@ class TSAnalyzer(ABC):
     ###########################################
     @abstractmethod
     def extract_function_info(
-        self, file_path: str, source_code: str, tree: Tree
-    ) -> None:
+        self, file_path: str, source_code: bytes, tree: Tree
+    ) -> List[Tuple[str, int, int, Node]]:
         """
         Parse function information from a source file.
         :param file_path: Path of the source file.
         :param source_code: Content of the source file.
         :param tree: Parsed syntax tree.
+        :return: A list of (name, start line, end line, node) tuples, one per function.
         """
         pass
 
@@ -313,8 +650,7 @@ class TSAnalyzer(ABC):
         Extract meta data for a single function.
         :param current_function: The function to be analyzed.
         """
-        file_name = self.functionToFile[current_function.function_id]
-        file_content = self.fileContentDic[file_name]
+        file_content = self.source_store.get_bytes(current_function.file_path)
 
         current_function.paras = self.get_parameters_in_single_function(
             current_function
@@ -331,12 +667,15 @@ class TSAnalyzer(ABC):
         return current_function
 
     @abstractmethod
-    def extract_global_info(self, file_path: str, source_code: str, tree: Tree) -> None:
+    def extract_global_info(
+        self, file_path: str, source_code: bytes, tree: Tree
+    ) -> Dict[str, str]:
         """
         Parse macro or global variable information from a source file.
         :param file_path: Path of the source file.
         :param source_code: Content of the source file.
         :param tree: Parsed syntax tree.
+        :return: A dictionary mapping global names to their definitions.
         """
         pass
 
@@ -348,76 +687,69 @@ class TSAnalyzer(ABC):
         Extract the two kinds of call graph edges for the given function.
         1. Between user-defined functions.
         2. Between user-defined functions and library APIs.
+        The call sites are taken from the index of the function instead of walking its AST,
+        and they are recorded in the call site table of the function.
         :param current_function: the function to be analyzed.
         """
-        file_name = self.functionToFile[current_function.function_id]
-        file_content = self.fileContentDic[file_name]
-
-        call_node_type = None
-        if self.language_name == "C" or self.language_name == "Cpp":
-            call_node_type = "call_expression"
-        elif self.language_name == "Java":
-            call_node_type = "method_invocation"
-        elif self.language_name == "Python":
-            call_node_type = "call"
-        elif self.language_name == "Go":
-            call_node_type = "call_expression"
-
-        assert call_node_type != None
-
-        all_call_sites = find_nodes_by_type(
-            current_function.parse_tree_root_node, call_node_type
-        )
         function_call_sites = []
         api_call_sites = []
-
-        for call_site_node in all_call_sites:
-            callee_ids = self.get_callee_function_ids_at_callsite(
-                current_function, call_site_node
+        call_sites = []
+
+        for call_site_record in self.callSiteRecordDic.get(
+            current_function.function_id, []
+        ):
+            call_site_node = find_node_by_span(
+                current_function.parse_tree_root_node,
+                call_site_record.start_byte,
+                call_site_record.end_byte,
+                call_site_record.node_type,
             )
+            if call_site_node is None:
+                continue
+            callee_name = call_site_record.callee_name
+            argument_num = call_site_record.argument_num
+            callee_ids = self._resolve_callee_function_ids(callee_name, argument_num)
+            api_id: Optional[int] = None
+            # The maps are shared by the threads, so the sets are created with the atomic setdefault
+            caller_id = current_function.function_id
             if len(callee_ids) > 0:
                 # Update the caller-callee relationship between user-defined functions
                 for callee_id in callee_ids:
-                    caller_id = current_function.function_id
-                    if caller_id not in self.function_caller_callee_map:
-                        self.function_caller_callee_map[caller_id] = set([])
-                    self.function_caller_callee_map[caller_id].add(callee_id)
-                    if callee_id not in self.function_callee_caller_map:
-                        self.function_callee_caller_map[callee_id] = set([])
-                    self.function_callee_caller_map[callee_id].add(caller_id)
+                    self.function_caller_callee_map.setdefault(caller_id, set()).add(
+                        callee_id
+                    )
+                    self.function_callee_caller_map.setdefault(callee_id, set()).add(
+                        caller_id
+                    )
                 function_call_sites.append(call_site_node)
             else:
-                api_id = None
-                arguments = self.get_arguments_at_callsite(
-                    current_function, call_site_node
-                )
-                callee_name = self.get_callee_name_at_call_site(
-                    call_site_node, file_content
-                )
-                tmp_api = API(-1, callee_name, len(arguments))
-
                 # Insert the API into the API environment if it does not exist previously
-                for single_api_id in self.api_env:
-                    if self.api_env[single_api_id] == tmp_api:
-                        api_id = single_api_id
-                if api_id == None:
-                    self.api_env[len(self.api_env)] = API(
-                        len(self.api_env), callee_name, len(arguments)
-                    )
-                    api_id = len(self.api_env) - 1
+                api_id = self.api_table.intern(callee_name, argument_num).api_id
 
-                caller_id = current_function.function_id
                 # Update the caller-callee relationship between user-defined functions and library APIs
-                if caller_id not in self.function_caller_api_callee_map:
-                    self.function_caller_api_callee_map[caller_id] = set([])
-                self.function_caller_api_callee_map[caller_id].add(api_id)
-                if api_id not in self.api_callee_function_caller_map:
-                    self.api_callee_function_caller_map[api_id] = set([])
-                self.api_callee_function_caller_map[api_id].add(caller_id)
+                self.function_caller_api_callee_map.setdefault(caller_id, set()).add(
+                    api_id
+                )
+                self.api_callee_function_caller_map.setdefault(api_id, set()).add(
+                    caller_id
+                )
                 api_call_sites.append(call_site_node)
 
+            call_sites.append(
+                CallSite(
+                    call_site_node,
+                    callee_name,
+                    callee_ids,
+                    api_id,
+                    call_site_record.get_argument_values(current_function.file_path),
+                    call_site_record.start_line_number,
+                    call_site_record.end_line_number,
+                )
+            )
+
         current_function.function_call_site_nodes = function_call_sites
         current_function.api_call_site_nodes = api_call_sites
+        current_function.set_call_sites(call_sites)
         return
 
     # Helper functions for callers
@@ -447,57 +779,70 @@ class TSAnalyzer(ABC):
         return [self.function_env[callee_id] for callee_id in callee_ids]
 
     def get_all_transitive_caller_functions(
-        self, function: Function, max_depth=1000
+        self, function: Function, max_depth: int = 1000
     ) -> List[Function]:
         """
         Get all transitive caller functions for the provided function.
+        :param function: The function to be analyzed.
+        :param max_depth: The maximal number of call edges from the callers to the function.
         """
-        if max_depth == 0:
-            return []
-        if function.function_id not in self.function_callee_caller_map:
-            return []
-        caller_ids = self.function_callee_caller_map[function.function_id]
-        caller_functions = [self.function_env[caller_id] for caller_id in caller_ids]
-        for caller_function in caller_functions:
-            caller_functions.extend(
-                self.get_all_transitive_caller_functions(caller_function, max_depth - 1)
-            )
-        caller_functions = list(
-            {function.function_id: function for function in caller_functions}.values()
-        )
-        return caller_functions
+        caller_ids = self.call_graph.bfs([function.function_id], max_depth, "caller")
+        return [self.function_env[caller_id] for caller_id in caller_ids]
 
     def get_all_transitive_callee_functions(
-        self, function: Function, max_depth, visited=None
+        self, function: Function, max_depth: int
     ) -> List[Function]:
         """
         Get all transitive callee functions for the provided function.
+        :param function: The function to be analyzed.
+        :param max_depth: The maximal number of call edges from the function to the callees.
         """
-        if max_depth == 0:
-            return []
+        callee_ids = self.call_graph.bfs([function.function_id], max_depth, "callee")
+        return [self.function_env[callee_id] for callee_id in callee_ids]
 
-        if visited is None:
-            visited = set()
+    def get_neighbor_function_ids(
+        self, function_ids: Set[int], max_depth: int
+    ) -> Set[int]:
+        """
+        Get the functions within max_depth call edges from the given functions.
+        The edges are followed in both directions, so callers of callees and callees of callers are included.
+        :param function_ids: the ids of the start functions
+        :param max_depth: the maximal number of call edges
+        :return: the ids of the start functions and their neighbors
+        """
+        return set(
+            self.call_graph.bfs(
+                function_ids, max_depth, "neighbor", is_start_included=True
+            )
+        )
 
-        if function.function_id in visited:
-            return []
+    # Helper functions for strongly connected components
+    def get_bottom_up_function_sccs(self) -> List[List[Function]]:
+        """
+        Get the strongly connected components of the call graph in the topological order
+        of the condensed DAG, where the callees come before their callers.
+        Each component is a set of mutually recursive functions or a single function.
+        """
+        return [
+            [self.function_env[function_id] for function_id in scc]
+            for scc in self.call_graph.sccs
+        ]
 
-        visited.add(function.function_id)
+    def get_function_scc_index(self, function: Function) -> int:
+        """
+        Get the index of the strongly connected component of a function in the bottom-up order.
+        :param function: The function to be analyzed.
+        """
+        return self.call_graph.get_scc_index(function.function_id)
 
-        if function.function_id not in self.function_caller_callee_map:
-            return []
-        callee_ids = self.function_caller_callee_map[function.function_id]
-        callee_functions = [self.function_env[callee_id] for callee_id in callee_ids]
-        for callee_function in callee_functions:
-            callee_functions.extend(
-                self.get_all_transitive_callee_functions(
-                    callee_function, max_depth - 1, visited
-                )
-            )
-        callee_functions = list(
-            {function.function_id: function for function in callee_functions}.values()
+    def is_recursive_function(self, function: Function) -> bool:
+        """
+        Check whether a function is in a call cycle, including a self-recursive call.
+        :param function: The function to be analyzed.
+        """
+        return bool(
+            self.call_graph.is_recursive_scc[self.get_function_scc_index(function)]
         )
-        return callee_functions
 
     # Helper functions for callees
     ## For library APIs
@@ -510,14 +855,15 @@ class TSAnalyzer(ABC):
         :param callee: The name of the callee API.
         :param para_num: The number of parameters of the callee API.
         """
-        callee_list = []
-        for callee_api_id in self.function_caller_api_callee_map[function.function_id]:
-            if self.api_env[callee_api_id] == API(-1, callee_name, para_num):
-                callee_list.append(self.api_env[callee_api_id])
-        return callee_list
+        api = self.api_table.lookup(callee_name, para_num)
+        if api is None or api.api_id not in self.function_caller_api_callee_map.get(
+            function.function_id, set()
+        ):
+            return []
+        return [api]
 
     @abstractmethod
-    def get_callee_name_at_call_site(self, node: Node, source_code: str) -> str:
+    def get_callee_name_at_call_site(self, node: Node, source_code: bytes) -> str:
         """
         Get the callee name at the call site.
         :param node: The node of the call site.
@@ -536,9 +882,20 @@ class TSAnalyzer(ABC):
         :return: A list of function ids of the callee functions.
         """
         file_name = current_function.file_path
-        source_code = self.code_in_files[file_name]
+        source_code = self.source_store.get_bytes(file_name)
         callee_name = self.get_callee_name_at_call_site(call_site_node, source_code)
         arguments = self.get_arguments_at_callsite(current_function, call_site_node)
+        return self._resolve_callee_function_ids(callee_name, len(arguments))
+
+    def _resolve_callee_function_ids(
+        self, callee_name: str, argument_num: int
+    ) -> List[int]:
+        """
+        Determine the user-defined callee function(s) by the callee name and the number of arguments.
+        :param callee_name: The name of the callee.
+        :param argument_num: The number of arguments at the call site.
+        :return: A list of function ids of the callee functions.
+        """
         temp_callee_ids = []
         # while callee_name in self.glb_var_map:
         #     callee_name = self.glb_var_map[callee_name]
@@ -552,7 +909,7 @@ class TSAnalyzer(ABC):
             # TODO (ZZ): this assertion is to make mypy happy
             assert paras is not None, "analysis is not done yet"
 
-            if len(paras) == len(arguments):
+            if len(paras) == argument_num:
                 callee_ids.append(callee_id)
         return callee_ids
 
@@ -566,29 +923,29 @@ class TSAnalyzer(ABC):
         :return: A list of api ids of the callee apis.
         """
         file_name = current_function.file_path
-        source_code = self.code_in_files[file_name]
+        source_code = self.source_store.get_bytes(file_name)
         callee_name = self.get_callee_name_at_call_site(call_site_node, source_code)
         arguments = self.get_arguments_at_callsite(current_function, call_site_node)
-        callee_ids = []
         # while callee_name in self.glb_var_map:
         #     callee_name = self.glb_var_map[callee_name]
-        tmp_api = API(-1, callee_name, len(arguments))
-        for api_id in self.api_env:
-            if self.api_env[api_id] == tmp_api:
-                callee_ids.append(api_id)
-        return callee_ids
+        api = self.api_table.lookup(callee_name, len(arguments))
+        return [api.api_id] if api is not None else []
 
-    @abstractmethod
     def get_callsites_by_callee_name(
         self, current_function: Function, callee_name: str
     ) -> List[Node]:
         """
-        Find the call site nodes by callee name.
+        Find the call site nodes by callee name in the call site table of the function.
         :param current_function: The function to be analyzed.
         :param callee_name: The name of the callee. Here, the callee can be a function or api
         :return: A list of call site nodes.
         """
-        pass
+        return [
+            call_site.node
+            for call_site in current_function.call_sites_by_callee_name.get(
+                callee_name, []
+            )
+        ]
 
     # Helper functions for arguments
     @abstractmethod
@@ -625,9 +982,13 @@ class TSAnalyzer(ABC):
         :param call_site_node: The node of the call site.
         :return: The output value.
         """
-        file_code = self.code_in_files[current_function.file_path]
-        name = file_code[call_site_node.start_byte : call_site_node.end_byte]
-        line_number = file_code[: call_site_node.start_byte].count("\n") + 1
+        file_code = self.source_store.get_bytes(current_function.file_path)
+        name = decode_text(
+            file_code[call_site_node.start_byte : call_site_node.end_byte]
+        )
+        line_number = self.get_line_number(
+            current_function.file_path, call_site_node.start_byte
+        )
         output_value = Value(
             name, line_number, ValueLabel.OUT, current_function.file_path, -1
         )
@@ -648,7 +1009,7 @@ class TSAnalyzer(ABC):
     # Control Flow Analysis
     @abstractmethod
     def get_if_statements(
-        self, function: Function, source_code: str
+        self, function: Function, source_code: bytes
     ) -> Dict[Tuple, Tuple]:
         """
         Identify if-statements within a function.
@@ -660,7 +1021,7 @@ class TSAnalyzer(ABC):
 
     @abstractmethod
     def get_loop_statements(
-        self, function: Function, source_code: str
+        self, function: Function, source_code: bytes
     ) -> Dict[Tuple, Tuple]:
         """
         Identify loop statements within a function.
@@ -739,53 +1100,201 @@ class TSAnalyzer(ABC):
     def get_node_by_line_number(self, line_number: int) -> List[Tuple[str, Node]]:
         """
         Find nodes that contain a specific line number.
+        The line number is matched in every file, and a node in nested functions is reported once per function.
         """
         code_node_list = []
-        for function_id in self.function_env:
-            function = self.function_env[function_id]
-            if not (
-                function.start_line_number <= line_number <= function.end_line_number
-            ):
+        for file_path, interval_index in self.get_interval_indexes().items():
+            function_ids = interval_index.find_all(line_number)
+            if len(function_ids) == 0:
                 continue
-            all_nodes = find_all_nodes(function.parse_tree_root_node)
-            for node in all_nodes:
-                start_line = (
-                    function.function_code[: node.start_byte].count("\n")
-                    + function.start_line_number
-                )
-                end_line = (
-                    function.function_code[: node.end_byte].count("\n")
-                    + function.start_line_number
-                )
-                if start_line == end_line == line_number:
-                    code_node_list.append((function.function_code, node))
+            nodes = self.get_nodes_at_line(file_path, line_number)
+            for function_id in sorted(function_ids):
+                function = self.function_env[function_id]
+                function_node = function.parse_tree_root_node
+                for node in nodes:
+                    if is_descendant_node(node, function_node):
+                        code_node_list.append((function.function_code, node))
         return code_node_list
 
+    def get_nodes_at_line(self, file_path: str, line_number: int) -> List[Node]:
+        """
+        Find the nodes of a file that start and end on a line.
+        The line-to-node index of the file is built on the first query.
+        :param file_path: the path of the file
+        :param line_number: the line number starting from 1
+        :return: a new list of the nodes in pre-order
+        """
+        line_node_index = self.fileLineNodeIndexDic.get(file_path)
+        if line_node_index is None:
+            line_node_index = LineNodeIndex(self.__get_file_root_node(file_path))
+            self.fileLineNodeIndexDic[file_path] = line_node_index
+        return line_node_index.get_nodes(line_number)
+
+    def __get_file_root_node(self, file_path: str) -> Node:
+        """
+        Get the root node of the parse tree of a file.
+        The tree of a function is reused if there is one. Otherwise, the file is parsed again.
+        """
+        interval_index = self.get_interval_indexes().get(file_path)
+        if interval_index is not None and len(interval_index.function_ids) > 0:
+            root_node = self.function_env[
+                interval_index.function_ids[0]
+            ].parse_tree_root_node
+            while root_node.parent is not None:
+                root_node = root_node.parent
+            return root_node
+        source_code = self.source_store.get_bytes(file_path)
+        return self._parse_source_code(file_path, source_code).root_node
+
     def get_function_from_localvalue(self, value: Value) -> Optional[Function]:
         """
         Retrieve the function corresponding to a local value.
+        If the value is in a nested function, the innermost function is returned.
         """
-        file_name = value.file
-        for _, function in self.function_env.items():
-            if function.file_path == file_name:
-                if (
-                    function.start_line_number
-                    <= value.line_number
-                    <= function.end_line_number
-                ):
-                    return function
-        return None
+        interval_index = self.get_interval_indexes().get(value.file)
+        if interval_index is None:
+            return None
+        function_id = interval_index.find_innermost(value.line_number)
+        if function_id is None:
+            return None
+        return self.function_env[function_id]
+
+    def get_functions_from_localvalues(
+        self, values: List[Value]
+    ) -> List[Optional[Function]]:
+        """
+        Retrieve the functions corresponding to a list of local values.
+        :param values: the local values
+        :return: the innermost function of each value, or None if the value is in no function
+        """
+        interval_indexes = self.get_interval_indexes()
+        functions: List[Optional[Function]] = []
+        for value in values:
+            interval_index = interval_indexes.get(value.file)
+            function_id = (
+                interval_index.find_innermost(value.line_number)
+                if interval_index is not None
+                else None
+            )
+            functions.append(
+                self.function_env[function_id] if function_id is not None else None
+            )
+        return functions
+
+    def get_interval_indexes(self) -> Dict[str, IntervalIndex]:
+        """
+        Get the interval indexes of the function line spans of all the files.
+        The indexes are built on the first query.
+        """
+        interval_indexes = self.fileIntervalIndexDic
+        if interval_indexes is None:
+            file_spans: Dict[str, List[Tuple[int, int, int]]] = {}
+            for function_id, function in self.function_env.items():
+                file_spans.setdefault(function.file_path, []).append(
+                    (function.start_line_number, function.end_line_number, function_id)
+                )
+            interval_indexes = {
+                file_path: IntervalIndex(spans)
+                for file_path, spans in file_spans.items()
+            }
+            self.fileIntervalIndexDic = interval_indexes
+        return interval_indexes
 
     def get_content_by_line_number(self, line_number: int, file_name: str) -> str:
         """
         Get the content from a file at the specified line.
         """
-        if file_name not in self.code_in_files:
+        if file_name not in self.source_store:
             return ""
-        file_lines = self.code_in_files[file_name].split("\n")
-        if line_number > len(file_lines):
+        line_index = self.get_line_index(file_name)
+        if line_number > line_index.line_count:
             return ""
-        return file_lines[line_number - 1]
+        return self.source_store.get_text(
+            file_name,
+            line_index.get_line_start_byte(line_number),
+            line_index.get_line_end_byte(line_number),
+        )
+
+    def get_nodes_by_type(self, function: Function, node_type: str) -> List[Node]:
+        """
+        Find all nodes of a given type in a function.
+        The node type index of the function is built on the first query,
+        so the parse tree of a function is only traversed once.
+        :param function: the function to be queried
+        :param node_type: the type of the nodes
+        :return: a new list of the nodes in pre-order
+        """
+        if function.node_type_index is None:
+            function.node_type_index = build_node_type_index(
+                function.parse_tree_root_node
+            )
+        return list(function.node_type_index.get(node_type, []))
+
+    def get_line_index(self, file_path: str) -> LineIndex:
+        """
+        Get the line index of a file. The index is built on the first query.
+        :param file_path: the path of the file
+        :return: the line index of the file
+        """
+        line_index = self.fileLineIndexDic.get(file_path)
+        if line_index is None:
+            line_index = LineIndex(self.source_store.get_bytes(file_path))
+            self.fileLineIndexDic[file_path] = line_index
+        return line_index
+
+    def get_line_number(self, file_path: str, byte_offset: int) -> int:
+        """
+        Get the line number of a byte offset in a file.
+        :param file_path: the path of the file
+        :param byte_offset: the byte offset, e.g., the start byte or the end byte of a node
+        :return: the line number starting from 1
+        """
+        return self.get_line_index(file_path).get_line_number(byte_offset)
+
+
+# Worker functions for indexing files in a process pool
+
+_index_worker_analyzer: Optional[TSAnalyzer] = None
+
+
+def _init_index_worker(
+    analyzer_class: Type[TSAnalyzer], language_name: str, is_profiled: bool
+) -> None:
+    """
+    Create a lightweight analyzer in the worker process.
+    Only the parser is initialized. The project is not parsed.
+    """
+    global _index_worker_analyzer
+    analyzer = analyzer_class.__new__(analyzer_class)
+    analyzer.source_store = SourceStore()
+    analyzer.profiler = Profiler(is_profiled)
+    analyzer.fileLineIndexDic = {}
+    analyzer._setup_parser(language_name)
+    _index_worker_analyzer = analyzer
+    return
+
+
+def _index_file_shard(
+    shard: List[Tuple[str, Optional[bytes]]],
+) -> Tuple[List[FileIndex], List[StageTiming]]:
+    """
+    Index a shard of files in the worker process.
+    :param shard: a list of (file path, file content) pairs. The file is read from disk if the content is None.
+    :return: the indexes of the files and the timings of the stages in the worker
+    """
+    analyzer = _index_worker_analyzer
+    assert analyzer is not None, "the worker is not initialized"
+    file_indexes = []
+    for file_path, source_code in shard:
+        if source_code is None:
+            analyzer.source_store.add_file(file_path)
+        else:
+            analyzer.source_store.add_content(file_path, source_code)
+        file_index, _ = analyzer._index_single_file(file_path)
+        file_indexes.append(file_index)
+        analyzer.source_store.remove(file_path)
+        analyzer.fileLineIndexDic.pop(file_path, None)
+    return file_indexes, analyzer.profiler.pop_stage_timings()
 
 
 # Utility functions for AST node type maching
@@ -793,25 +1302,62 @@ class TSAnalyzer(ABC):
 
 def find_all_nodes(root_node: Node) -> List[Node]:
     """
-    Recursively find all nodes in the tree starting at root_node.
+    Find all nodes in the tree starting at root_node in pre-order.
     """
     if root_node is None:
         return []
-    nodes = [root_node]
-    for child_node in root_node.children:
-        nodes.extend(find_all_nodes(child_node))
-    return nodes
+    nodes = []
+    cursor = root_node.walk()
+    while True:
+        nodes.append(cursor.node)
+        if cursor.goto_first_child():
+            continue
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return nodes
 
 
-def find_nodes_by_type(root_node: Node, node_type: str, k=0) -> List[Node]:
+def is_descendant_node(node: Node, ancestor_node: Node) -> bool:
     """
-    Recursively find all nodes of a given type.
+    Check whether a node is in the subtree rooted at another node, including the node itself.
     """
-    nodes = []
-    if k > 100:
-        return []
-    if root_node.type == node_type:
-        nodes.append(root_node)
-    for child_node in root_node.children:
-        nodes.extend(find_nodes_by_type(child_node, node_type, k + 1))
-    return nodes
+    if (
+        node.start_byte < ancestor_node.start_byte
+        or node.end_byte > ancestor_node.end_byte
+    ):
+        return False
+    if (node.start_byte, node.end_byte) != (
+        ancestor_node.start_byte,
+        ancestor_node.end_byte,
+    ):
+        return True
+    # A node with the same span can be an ancestor, so walk up the nodes with the same span
+    current_node: Optional[Node] = node
+    while current_node is not None and (
+        current_node.start_byte,
+        current_node.end_byte,
+    ) == (ancestor_node.start_byte, ancestor_node.end_byte):
+        if current_node == ancestor_node:
+            return True
+        current_node = current_node.parent
+    return False
+
+
+def find_nodes_by_type(root_node: Node, node_type: str) -> List[Node]:
+    """
+    Find all nodes of a given type in pre-order.
+    """
+    return [node for node in find_all_nodes(root_node) if node.type == node_type]
+
+
+def build_node_type_index(root_node: Node) -> Dict[str, List[Node]]:
+    """
+    Group all nodes in the tree starting at root_node by their types in a single traversal.
+    The nodes of each type are kept in pre-order, i.e., the order returned by find_nodes_by_type.
+    """
+    node_type_index: Dict[str, List[Node]] = {}
+    for node in find_all_nodes(root_node):
+        if node.type not in node_type_index:
+            node_type_index[node.type] = []
+        node_type_index[node.type].append(node)
+    return node_type_index
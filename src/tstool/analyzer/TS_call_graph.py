@@ -0,0 +1,245 @@
+import threading
+from typing import Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+
+class CSRGraph:
+    """
+    A directed graph over dense node indices in compressed sparse row (CSR) form.
+    The successors of node i are indices[indptr[i] : indptr[i + 1]].
+    """
+
+    def __init__(self, node_num: int, sources: np.ndarray, targets: np.ndarray):
+        """
+        :param node_num: the number of nodes
+        :param sources: the source indices of the edges
+        :param targets: the target indices of the edges, aligned with sources
+        """
+        self.node_num = node_num
+        order = np.lexsort((targets, sources))
+        self.edge_sources = sources[order]
+        self.indices = targets[order]
+        self.indptr = np.zeros(node_num + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(self.edge_sources, minlength=node_num), out=self.indptr[1:]
+        )
+        return
+
+    def expand(self, frontier: np.ndarray) -> np.ndarray:
+        """
+        Gather the successors of all the nodes in the frontier at once.
+        :param frontier: the node indices
+        :return: the successor indices, possibly with duplicates
+        """
+        starts = self.indptr[frontier]
+        lengths = self.indptr[frontier + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=self.indices.dtype)
+        # Position k of the result is starts[j] + (k - the number of successors before frontier[j])
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return self.indices[offsets + np.arange(total)]
+
+
+class CallGraph:
+    """
+    Array-backed call graph between user-defined functions.
+    The function ids are mapped to dense indices, and the caller-callee edges are stored in CSR form
+    in both directions, so the transitive queries are traversals over NumPy arrays.
+    The graph is immutable once built, and the results of the traversals are cached.
+    """
+
+    def __init__(
+        self, function_ids: Iterable[int], caller_callee_map: Dict[int, Set[int]]
+    ):
+        """
+        :param function_ids: the ids of all the functions
+        :param caller_callee_map: the caller id -> the callee ids
+        """
+        self.function_ids = np.array(sorted(function_ids), dtype=np.int64)
+        self.function_indices: Dict[int, int] = {
+            int(function_id): index
+            for index, function_id in enumerate(self.function_ids)
+        }
+
+        caller_indices = []
+        callee_indices = []
+        for caller_id, callee_ids in caller_callee_map.items():
+            for callee_id in callee_ids:
+                caller_indices.append(self.function_indices[caller_id])
+                callee_indices.append(self.function_indices[callee_id])
+        callers = np.array(caller_indices, dtype=np.int64)
+        callees = np.array(callee_indices, dtype=np.int64)
+
+        node_num = len(self.function_ids)
+        self.callee_graph = CSRGraph(node_num, callers, callees)
+        self.caller_graph = CSRGraph(node_num, callees, callers)
+        self.neighbor_graph = CSRGraph(
+            node_num,
+            np.concatenate((callers, callees)),
+            np.concatenate((callees, callers)),
+        )
+
+        # (direction, start function ids, max depth) -> the reached function ids
+        self.reachability_cache: Dict[Tuple[str, Tuple[int, ...], int], List[int]] = {}
+        self.lock = threading.Lock()
+
+        # Strongly connected components in the topological order of the condensed DAG
+        # with the callees first, and the component of each function
+        self.scc_indices = self.__compute_sccs()
+        self.sccs: List[List[int]] = []
+        for scc_index in range(int(self.scc_indices.max(initial=-1)) + 1):
+            self.sccs.append([])
+        for index, scc_index in enumerate(self.scc_indices.tolist()):
+            self.sccs[scc_index].append(int(self.function_ids[index]))
+        self.is_recursive_scc = np.array(
+            [len(scc) > 1 for scc in self.sccs], dtype=np.bool_
+        )
+        is_self_loop = self.callee_graph.edge_sources == self.callee_graph.indices
+        self.is_recursive_scc[
+            self.scc_indices[self.callee_graph.edge_sources[is_self_loop]]
+        ] = True
+        return
+
+    @property
+    def edge_num(self) -> int:
+        return len(self.callee_graph.indices)
+
+    def __compute_sccs(self) -> np.ndarray:
+        """
+        Compute the strongly connected components with an iterative Tarjan's algorithm.
+        Tarjan's algorithm completes a component only after all the components it calls,
+        so the components are numbered bottom-up, i.e., callees before callers.
+        :return: the component number of each function index
+        """
+        graph = self.callee_graph
+        node_num = graph.node_num
+        indptr = graph.indptr.tolist()
+        indices = graph.indices.tolist()
+        discovery_orders = [-1] * node_num
+        low_links = [0] * node_num
+        is_on_stack = [False] * node_num
+        scc_indices = np.full(node_num, -1, dtype=np.int64)
+        tarjan_stack: List[int] = []
+        scc_num = 0
+        order = 0
+
+        for root in range(node_num):
+            if discovery_orders[root] != -1:
+                continue
+            # Each frame is a node and the position of its next successor to visit
+            call_stack = [(root, indptr[root])]
+            discovery_orders[root] = low_links[root] = order
+            order += 1
+            tarjan_stack.append(root)
+            is_on_stack[root] = True
+            while call_stack:
+                node, edge_position = call_stack[-1]
+                if edge_position < indptr[node + 1]:
+                    call_stack[-1] = (node, edge_position + 1)
+                    successor = indices[edge_position]
+                    if discovery_orders[successor] == -1:
+                        discovery_orders[successor] = low_links[successor] = order
+                        order += 1
+                        tarjan_stack.append(successor)
+                        is_on_stack[successor] = True
+                        call_stack.append((successor, indptr[successor]))
+                    elif is_on_stack[successor]:
+                        low_links[node] = min(
+                            low_links[node], discovery_orders[successor]
+                        )
+                    continue
+
+                call_stack.pop()
+                if call_stack:
+                    parent = call_stack[-1][0]
+                    low_links[parent] = min(low_links[parent], low_links[node])
+                if low_links[node] == discovery_orders[node]:
+                    while True:
+                        member = tarjan_stack.pop()
+                        is_on_stack[member] = False
+                        scc_indices[member] = scc_num
+                        if member == node:
+                            break
+                    scc_num += 1
+        return scc_indices
+
+    def get_scc_index(self, function_id: int) -> int:
+        """
+        Get the strongly connected component of a function.
+        :param function_id: the id of the function
+        :return: the index of the component in sccs
+        """
+        return int(self.scc_indices[self.function_indices[function_id]])
+
+    def __get_graph(self, direction: str) -> CSRGraph:
+        if direction == "callee":
+            return self.callee_graph
+        if direction == "caller":
+            return self.caller_graph
+        if direction == "neighbor":
+            return self.neighbor_graph
+        raise ValueError(f"Unknown direction of the call graph: {direction}")
+
+    def __to_indices(self, function_ids: Iterable[int]) -> np.ndarray:
+        return np.array(
+            sorted(
+                {
+                    self.function_indices[function_id]
+                    for function_id in function_ids
+                    if function_id in self.function_indices
+                }
+            ),
+            dtype=np.int64,
+        )
+
+    def bfs(
+        self,
+        start_function_ids: Iterable[int],
+        max_depth: int,
+        direction: str = "callee",
+        is_start_included: bool = False,
+    ) -> List[int]:
+        """
+        Breadth-first traversal from several functions at once.
+        :param start_function_ids: the ids of the start functions
+        :param max_depth: the maximal number of call edges from the start functions
+        :param direction: "callee" follows the edges from callers to callees, "caller" the reverse edges,
+            and "neighbor" both of them
+        :param is_start_included: whether the start functions are always in the result.
+            Otherwise, a start function is only reached through a call cycle.
+        :return: the ids of the reached functions, level by level and in id order within a level
+        """
+        start_ids = tuple(sorted(set(start_function_ids)))
+        key = (direction, start_ids, max_depth)
+        with self.lock:
+            cached_ids = self.reachability_cache.get(key)
+        if cached_ids is None:
+            cached_ids = self.__bfs(start_ids, max_depth, direction)
+            with self.lock:
+                self.reachability_cache[key] = cached_ids
+        if not is_start_included:
+            return list(cached_ids)
+        reached_ids = set(cached_ids)
+        return [
+            function_id for function_id in start_ids if function_id not in reached_ids
+        ] + cached_ids
+
+    def __bfs(
+        self, start_ids: Tuple[int, ...], max_depth: int, direction: str
+    ) -> List[int]:
+        graph = self.__get_graph(direction)
+        visited = np.zeros(graph.node_num, dtype=np.bool_)
+        frontier = self.__to_indices(start_ids)
+        reached: List[np.ndarray] = []
+        depth = 0
+        while len(frontier) > 0 and depth < max_depth:
+            successors = np.unique(graph.expand(frontier))
+            frontier = successors[~visited[successors]]
+            visited[frontier] = True
+            reached.append(frontier)
+            depth += 1
+        if not reached:
+            return []
+        return self.function_ids[np.concatenate(reached)].tolist()
@@ -0,0 +1,397 @@
+import concurrent.futures
+import fnmatch
+import os
+import re
+from typing import Dict, List, Optional, Pattern, Set, Tuple
+
+# Directories that never contain the project's own source code
+EXCLUDED_DIR_NAMES = {
+    # Common
+    ".git",
+    ".vscode",
+    ".idea",
+    "build",
+    "dist",
+    "out",
+    "bin",
+    # Python
+    "__pycache__",
+    ".pytest_cache",
+    ".mypy_cache",
+    ".coverage",
+    "venv",
+    "env",
+    # Java
+    "target",
+    ".gradle",
+    ".m2",
+    ".settings",
+    "classes",
+    # C++
+    "CMakeFiles",
+    ".deps",
+    "Debug",
+    "Release",
+    "obj",
+    # Go
+    "vendor",
+    "pkg",
+}
+
+# The number of leading bytes inspected to classify a file
+SNIFF_SIZE = 8192
+
+# Markers of generated files, which are searched in the first lines of a file
+GENERATED_FILE_PATTERN = re.compile(
+    rb"@generated|do not edit|code generated by|auto-?generated|automatically generated",
+    re.IGNORECASE,
+)
+GENERATED_MARKER_SIZE = 1024
+
+# A file whose lines are this long on average is regarded as minified
+MINIFIED_LINE_LENGTH = 500
+
+
+class GitIgnoreSpec:
+    """
+    The compiled patterns of a single .gitignore file.
+    """
+
+    def __init__(self, base_dir: str, lines: List[str]) -> None:
+        """
+        :param base_dir: the directory containing the .gitignore file
+        :param lines: the lines of the .gitignore file
+        """
+        self.base_dir = base_dir
+        # (regex, is_negated, is_dir_only) in the order of the file
+        self.rules: List[Tuple[Pattern[str], bool, bool]] = []
+        for line in lines:
+            rule = self._compile_line(line)
+            if rule is not None:
+                self.rules.append(rule)
+        return
+
+    @staticmethod
+    def _compile_line(line: str) -> Optional[Tuple[Pattern[str], bool, bool]]:
+        line = line.rstrip("\n").rstrip("\r")
+        if line.endswith("\\ "):
+            line = line[:-2].rstrip() + " "
+        else:
+            line = line.rstrip()
+        if line == "" or line.startswith("#"):
+            return None
+
+        is_negated = line.startswith("!")
+        if is_negated:
+            line = line[1:]
+        elif line.startswith("\\!") or line.startswith("\\#"):
+            line = line[1:]
+
+        is_dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if line == "":
+            return None
+
+        # A pattern with a slash in the beginning or middle is relative to the .gitignore file
+        is_anchored = "/" in line
+        line = line.lstrip("/")
+
+        regex = ""
+        i = 0
+        while i < len(line):
+            if line.startswith("**/", i):
+                regex += "(?:.*/)?"
+                i += 3
+            elif line.startswith("/**", i) and i + 3 == len(line):
+                regex += "/.*"
+                i += 3
+            elif line.startswith("**", i):
+                regex += ".*"
+                i += 2
+            elif line[i] == "*":
+                regex += "[^/]*"
+                i += 1
+            elif line[i] == "?":
+                regex += "[^/]"
+                i += 1
+            elif line[i] == "[":
+                end = line.find("]", i + 1)
+                if end == -1:
+                    regex += re.escape(line[i])
+                    i += 1
+                else:
+                    char_class = line[i + 1 : end].replace("\\", "\\\\")
+                    if char_class.startswith("!"):
+                        char_class = "^" + char_class[1:]
+                    regex += "[" + char_class + "]"
+                    i = end + 1
+            elif line[i] == "\\" and i + 1 < len(line):
+                regex += re.escape(line[i + 1])
+                i += 2
+            else:
+                regex += re.escape(line[i])
+                i += 1
+
+        prefix = "^" if is_anchored else "^(?:.*/)?"
+        return re.compile(prefix + regex + "$"), is_negated, is_dir_only
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Match a path against the patterns. The last matching pattern decides.
+        :param path: the path to be matched
+        :param is_dir: whether the path is a directory
+        :return: True if the path is ignored, False if it is re-included, and None if no pattern matches
+        """
+        relative_path = os.path.relpath(path, self.base_dir).replace(os.sep, "/")
+        for regex, is_negated, is_dir_only in reversed(self.rules):
+            if is_dir_only and not is_dir:
+                continue
+            if regex.match(relative_path):
+                return not is_negated
+        return None
+
+
+def is_ignored(path: str, is_dir: bool, specs: Tuple[GitIgnoreSpec, ...]) -> bool:
+    """
+    Check whether a path is ignored by the .gitignore files of its ancestors.
+    A deeper .gitignore file overrides the shallower ones.
+    """
+    for spec in reversed(specs):
+        result = spec.match(path, is_dir)
+        if result is not None:
+            return result
+    return False
+
+
+def load_gitignore(dir_path: str) -> Optional[GitIgnoreSpec]:
+    """
+    Load the .gitignore file in a directory if it exists.
+    """
+    gitignore_path = os.path.join(dir_path, ".gitignore")
+    if not os.path.isfile(gitignore_path):
+        return None
+    try:
+        with open(gitignore_path, "r", encoding="utf-8", errors="ignore") as file:
+            spec = GitIgnoreSpec(dir_path, file.readlines())
+    except OSError:
+        return None
+    return spec if spec.rules else None
+
+
+def compile_globs(globs: List[str]) -> Optional[Pattern[str]]:
+    """
+    Compile a list of shell-style globs into a single regex.
+    :return: the compiled regex, or None if the list is empty
+    """
+    if not globs:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(glob)})" for glob in globs))
+
+
+class FileDiscoveryReport:
+    """
+    The result of file discovery, including the files that are skipped and why.
+    """
+
+    def __init__(self) -> None:
+        self.file_paths: List[str] = []
+        # skip reason -> skipped paths
+        self.skipped_paths: Dict[str, List[str]] = {}
+        return
+
+    def add_skipped_path(self, reason: str, path: str) -> None:
+        if reason not in self.skipped_paths:
+            self.skipped_paths[reason] = []
+        self.skipped_paths[reason].append(path)
+        return
+
+    def summary(self, example_num: int = 3) -> str:
+        """
+        Summarize the discovered files and the skipped ones.
+        :param example_num: the number of example paths shown for each skip reason
+        """
+        lines = [f"Discovered {len(self.file_paths)} source file(s)"]
+        for reason in sorted(self.skipped_paths):
+            paths = sorted(self.skipped_paths[reason])
+            lines.append(f"  Skipped {len(paths)} path(s) ({reason})")
+            for path in paths[:example_num]:
+                lines.append(f"    {path}")
+            if len(paths) > example_num:
+                lines.append("    ...")
+        return "\n".join(lines)
+
+
+class FileDiscovery:
+    """
+    Discover the source files of a project.
+    Directories are scanned in parallel, and a file is skipped if it is
+    ignored by git, excluded by the user, too large, binary, minified, or generated.
+    """
+
+    def __init__(
+        self,
+        suffixs: List[str],
+        include_globs: Optional[List[str]] = None,
+        exclude_globs: Optional[List[str]] = None,
+        max_file_size: int = 0,
+        max_workers: int = 10,
+    ) -> None:
+        """
+        :param suffixs: the file suffixes of the language, without the leading dot
+        :param include_globs: if given, only the files whose relative paths match one of them are kept
+        :param exclude_globs: the files and directories whose relative paths match one of them are skipped
+        :param max_file_size: the maximal file size in bytes. No limit if it is 0
+        :param max_workers: the maximal number of threads scanning directories
+        """
+        self.suffixs = {f".{suffix}" for suffix in suffixs}
+        self.include_regex = compile_globs(include_globs or [])
+        self.exclude_regex = compile_globs(exclude_globs or [])
+        self.max_file_size = max_file_size
+        self.max_workers = max(1, max_workers)
+        return
+
+    def discover(self, project_path: str) -> FileDiscoveryReport:
+        """
+        Discover the source files in the project path.
+        :param project_path: the root of the project
+        :return: the report of the discovery. The file paths are sorted.
+        """
+        report = FileDiscoveryReport()
+        root_specs = self._load_ancestor_gitignores(project_path)
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers
+        ) as executor:
+            pending = {
+                executor.submit(self._scan_dir, project_path, project_path, root_specs)
+            }
+            while pending:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    sub_dirs, file_paths, skipped_paths = future.result()
+                    report.file_paths.extend(file_paths)
+                    for reason, path in skipped_paths:
+                        report.add_skipped_path(reason, path)
+                    for sub_dir, specs in sub_dirs:
+                        pending.add(
+                            executor.submit(
+                                self._scan_dir, project_path, sub_dir, specs
+                            )
+                        )
+        report.file_paths.sort()
+        return report
+
+    def _load_ancestor_gitignores(self, project_path: str) -> Tuple[GitIgnoreSpec, ...]:
+        """
+        Load the .gitignore files between the enclosing git repository root and the project root.
+        """
+        dir_path = os.path.abspath(project_path)
+        ancestor_dirs = []
+        while True:
+            ancestor_dirs.append(dir_path)
+            if os.path.exists(os.path.join(dir_path, ".git")):
+                break
+            parent_dir_path = os.path.dirname(dir_path)
+            if parent_dir_path == dir_path:
+                # Not in a git repository. Only the .gitignore files in the project apply
+                ancestor_dirs = ancestor_dirs[:1]
+                break
+            dir_path = parent_dir_path
+
+        specs = []
+        for ancestor_dir in reversed(ancestor_dirs[1:]):
+            spec = load_gitignore(ancestor_dir)
+            if spec is not None:
+                specs.append(spec)
+        return tuple(specs)
+
+    def _scan_dir(
+        self, project_path: str, dir_path: str, specs: Tuple[GitIgnoreSpec, ...]
+    ) -> Tuple[
+        List[Tuple[str, Tuple[GitIgnoreSpec, ...]]],
+        List[str],
+        List[Tuple[str, str]],
+    ]:
+        """
+        Scan a single directory.
+        :return: the sub-directories to be scanned with their .gitignore files, the kept files, and the skipped (reason, path) pairs
+        """
+        sub_dirs: List[Tuple[str, Tuple[GitIgnoreSpec, ...]]] = []
+        file_paths: List[str] = []
+        skipped_paths: List[Tuple[str, str]] = []
+
+        spec = load_gitignore(dir_path)
+        if spec is not None:
+            specs = specs + (spec,)
+
+        try:
+            entries = list(os.scandir(dir_path))
+        except OSError as e:
+            print(f"Error scanning directory {dir_path}: {e}")
+            return sub_dirs, file_paths, skipped_paths
+
+        for entry in entries:
+            path = os.path.join(dir_path, entry.name)
+            relative_path = os.path.relpath(path, project_path).replace(os.sep, "/")
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+
+            if is_dir:
+                if entry.name.startswith(".") or entry.name in EXCLUDED_DIR_NAMES:
+                    continue
+                if is_ignored(path, True, specs):
+                    skipped_paths.append(("gitignore", path + "/"))
+                elif self.exclude_regex and self.exclude_regex.match(relative_path):
+                    skipped_paths.append(("excluded", path + "/"))
+                else:
+                    sub_dirs.append((path, specs))
+                continue
+
+            if os.path.splitext(entry.name)[1] not in self.suffixs:
+                continue
+            if is_ignored(path, False, specs):
+                skipped_paths.append(("gitignore", path))
+                continue
+            if (self.exclude_regex and self.exclude_regex.match(relative_path)) or (
+                self.include_regex and not self.include_regex.match(relative_path)
+            ):
+                skipped_paths.append(("excluded", path))
+                continue
+
+            skip_reason = self._sniff_file(entry)
+            if skip_reason is not None:
+                skipped_paths.append((skip_reason, path))
+                continue
+            file_paths.append(path)
+        return sub_dirs, file_paths, skipped_paths
+
+    def _sniff_file(self, entry: os.DirEntry) -> Optional[str]:
+        """
+        Classify a file by its size and its leading bytes.
+        :return: the reason to skip the file, or None if the file is kept
+        """
+        try:
+            if not entry.is_file():
+                return None if os.path.exists(entry.path) else "unreadable"
+            file_size = entry.stat().st_size
+            if self.max_file_size > 0 and file_size > self.max_file_size:
+                return "oversized"
+            with open(entry.path, "rb") as file:
+                header = file.read(SNIFF_SIZE)
+        except OSError:
+            return "unreadable"
+
+        if b"\0" in header:
+            return "binary"
+        if GENERATED_FILE_PATTERN.search(header[:GENERATED_MARKER_SIZE]):
+            return "generated"
+        if (
+            len(header) >= SNIFF_SIZE // 2
+            and len(header) > (header.count(b"\n") + 1) * MINIFIED_LINE_LENGTH
+        ):
+            return "minified"
+        return None
@@ -0,0 +1,210 @@
+import hashlib
+import os
+import pickle
+import sys
+from os import path
+from typing import Dict, List, Optional, Set, Tuple
+
+from tree_sitter import Node
+
+sys.path.append(path.dirname(path.dirname(path.dirname(path.abspath(__file__)))))
+
+from memory.syntactic.function import *
+from memory.syntactic.value import *
+
+# Bump this number whenever the layout of the cached records changes
+INDEX_FORMAT_VERSION = 4
+
+
+class CallSiteRecord:
+    def __init__(
+        self,
+        start_byte: int,
+        end_byte: int,
+        node_type: str,
+        callee_name: str,
+        arguments: List[Tuple[str, int, int]],
+        start_line_number: int,
+        end_line_number: int,
+    ) -> None:
+        """
+        Record the syntactic facts of a call site that are independent of other files.
+        The callee is resolved against the whole project when the call graph is built.
+        :param start_byte: the start byte of the call site node
+        :param end_byte: the end byte of the call site node
+        :param node_type: the type of the call site node
+        :param callee_name: the name of the callee at the call site
+        :param arguments: the (name, line number, index) of the arguments at the call site in index order
+        :param start_line_number: the line number of the start of the call site in the file
+        :param end_line_number: the line number of the end of the call site in the file
+        """
+        self.start_byte = start_byte
+        self.end_byte = end_byte
+        self.node_type = node_type
+        self.callee_name = callee_name
+        self.arguments = arguments
+        self.start_line_number = start_line_number
+        self.end_line_number = end_line_number
+
+    @property
+    def argument_num(self) -> int:
+        return len(self.arguments)
+
+    def get_argument_values(self, file_path: str) -> Set[Value]:
+        """
+        Build the argument values of the call site without walking its AST.
+        :param file_path: the path of the file of the call site
+        """
+        return {
+            Value(name, line_number, ValueLabel.ARG, file_path, index)
+            for name, line_number, index in self.arguments
+        }
+
+
+class FunctionRecord:
+    def __init__(
+        self,
+        function_name: str,
+        start_line_number: int,
+        end_line_number: int,
+        start_byte: int,
+        end_byte: int,
+        node_type: str,
+    ) -> None:
+        """
+        Record the facts of a function that can be derived from its own file.
+        :param function_name: the name of the function
+        :param start_line_number: the start line of the function
+        :param end_line_number: the end line of the function
+        :param start_byte: the start byte of the function node
+        :param end_byte: the end byte of the function node
+        :param node_type: the type of the function node
+        """
+        self.function_name = function_name
+        self.start_line_number = start_line_number
+        self.end_line_number = end_line_number
+        self.start_byte = start_byte
+        self.end_byte = end_byte
+        self.node_type = node_type
+
+        self.paras: Set[Value] = set([])
+        self.retvals: Set[Value] = set([])
+        self.if_statements: Dict[LineScope, IfInfo] = {}
+        self.loop_statements: Dict[LineScope, LoopInfo] = {}
+        self.call_sites: List[CallSiteRecord] = []
+
+
+class FileIndex:
+    def __init__(self, file_path: str, content_hash: str) -> None:
+        """
+        The picklable result of indexing a single file.
+        Tree-sitter nodes are not stored. They are recovered from the byte spans.
+        :param file_path: the path of the file
+        :param content_hash: the cache key of the file
+        """
+        self.file_path = file_path
+        self.content_hash = content_hash
+        self.functions: List[FunctionRecord] = []
+        self.glb_var_map: Dict[str, str] = {}
+
+
+class TSIndexCache:
+    """
+    On-disk cache of FileIndex objects.
+    Each entry is addressed by the language, the grammar library, the file path and the file content,
+    so a changed file or a rebuilt grammar never hits a stale entry.
+    """
+
+    def __init__(self, cache_dir: str, language_name: str, language_path: str) -> None:
+        """
+        :param cache_dir: the root directory of the cache
+        :param language_name: the name of the analyzed language
+        :param language_path: the path of the tree-sitter grammar library
+        """
+        self.cache_dir = os.path.join(cache_dir, language_name)
+        self.language_name = language_name
+
+        grammar_hasher = hashlib.sha256()
+        with open(language_path, "rb") as grammar_file:
+            for chunk in iter(lambda: grammar_file.read(1 << 20), b""):
+                grammar_hasher.update(chunk)
+        self.grammar_version = grammar_hasher.hexdigest()
+
+        self.hit_num = 0
+        self.miss_num = 0
+        return
+
+    def get_key(self, file_path: str, source_code: bytes) -> str:
+        """
+        Compute the cache key of a file.
+        :param file_path: the path of the file
+        :param source_code: the content of the file
+        :return: the hex digest used as the cache key
+        """
+        hasher = hashlib.sha256()
+        hasher.update(str(INDEX_FORMAT_VERSION).encode("utf8"))
+        hasher.update(self.language_name.encode("utf8"))
+        hasher.update(self.grammar_version.encode("utf8"))
+        hasher.update(file_path.encode("utf8", errors="surrogateescape"))
+        hasher.update(b"\0")
+        hasher.update(source_code)
+        return hasher.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".pkl")
+
+    def load(self, key: str) -> Optional[FileIndex]:
+        """
+        Load the index of a file from the cache.
+        :param key: the cache key of the file
+        :return: the cached index, or None if the entry is missing or unreadable
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "rb") as entry_file:
+                file_index = pickle.load(entry_file)
+        except Exception:
+            self.miss_num += 1
+            return None
+        if not isinstance(file_index, FileIndex) or file_index.content_hash != key:
+            self.miss_num += 1
+            return None
+        self.hit_num += 1
+        return file_index
+
+    def store(self, file_index: FileIndex) -> None:
+        """
+        Store the index of a file in the cache.
+        The entry is written to a temporary file first so that concurrent readers never see partial data.
+        :param file_index: the index of the file
+        """
+        entry_path = self._entry_path(file_index.content_hash)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        tmp_path = f"{entry_path}.{os.getpid()}.{id(file_index)}.tmp"
+        try:
+            with open(tmp_path, "wb") as entry_file:
+                pickle.dump(file_index, entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            print(f"Error writing index cache entry {entry_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return
+
+
+def find_node_by_span(
+    root_node: Node, start_byte: int, end_byte: int, node_type: str
+) -> Optional[Node]:
+    """
+    Recover a node of the given type from its byte span.
+    Several nodes may share the same span (e.g., an expression statement and its call),
+    so the ancestors with the same span are checked as well.
+    """
+    node = root_node.descendant_for_byte_range(start_byte, end_byte)
+    while node is not None:
+        if node.start_byte != start_byte or node.end_byte != end_byte:
+            return None
+        if node.type == node_type:
+            return node
+        node = node.parent
+    return None
@@ -0,0 +1,84 @@
+from array import array
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+
+class IntervalIndex:
+    """
+    Index of the line spans of the functions in a single file.
+    The spans are sorted by start line, and each span records the innermost span enclosing it,
+    so the innermost function containing a line is a binary search followed by a walk
+    up the enclosing spans. At line granularity, the spans are not always nested or disjoint:
+    a function may end on the line where the next one starts, e.g., `int f() {\n  return 0; } int g() {`.
+    Such a span is not on the enclosing chain of the next one, so find_all also keeps the maximal
+    end line of the spans up to each position.
+    """
+
+    def __init__(self, spans: List[Tuple[int, int, int]]) -> None:
+        """
+        :param spans: the (start line, end line, function id) of the functions in the file
+        """
+        # Outer spans precede the inner spans starting at the same line
+        sorted_spans = sorted(spans, key=lambda span: (span[0], -span[1]))
+        self.start_lines = array("q", [span[0] for span in sorted_spans])
+        self.end_lines = array("q", [span[1] for span in sorted_spans])
+        self.function_ids = array("q", [span[2] for span in sorted_spans])
+
+        # The maximal end line of the spans up to each position
+        self.max_end_lines = array("q", self.end_lines)
+        for position in range(1, len(self.max_end_lines)):
+            self.max_end_lines[position] = max(
+                self.max_end_lines[position], self.max_end_lines[position - 1]
+            )
+
+        # The position of the innermost enclosing span, or -1 for a top-level span
+        self.parents = array("q", [-1] * len(sorted_spans))
+        enclosing_positions: List[int] = []
+        for position, (start_line, end_line, _) in enumerate(sorted_spans):
+            while (
+                enclosing_positions
+                and self.end_lines[enclosing_positions[-1]] < end_line
+            ):
+                enclosing_positions.pop()
+            if enclosing_positions:
+                self.parents[position] = enclosing_positions[-1]
+            enclosing_positions.append(position)
+        return
+
+    def find_innermost(self, line_number: int) -> Optional[int]:
+        """
+        Find the innermost function containing a line.
+        :param line_number: the line number in the file
+        :return: the id of the function, or None if no function contains the line
+        """
+        position = bisect_right(self.start_lines, line_number) - 1
+        while position >= 0 and self.end_lines[position] < line_number:
+            position = self.parents[position]
+        if position < 0:
+            return None
+        return self.function_ids[position]
+
+    def find_all(self, line_number: int) -> List[int]:
+        """
+        Find all the functions containing a line, from the latest start line to the earliest.
+        The spans starting at or before the line are scanned backward until no earlier span
+        reaches the line, so the spans ending on the start line of a later span are also found.
+
+        >>> index = IntervalIndex([(1, 2, 1), (2, 4, 2)])
+        >>> index.find_all(2)
+        [2, 1]
+        >>> index.find_all(3)
+        [2]
+        >>> IntervalIndex([(1, 10, 1), (2, 5, 2), (5, 8, 3), (6, 6, 4)]).find_all(5)
+        [3, 2, 1]
+
+        :param line_number: the line number in the file
+        :return: the ids of the functions
+        """
+        function_ids = []
+        position = bisect_right(self.start_lines, line_number) - 1
+        while position >= 0 and self.max_end_lines[position] >= line_number:
+            if self.end_lines[position] >= line_number:
+                function_ids.append(self.function_ids[position])
+            position -= 1
+        return function_ids
@@ -0,0 +1,108 @@
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+from tree_sitter import Node
+
+
+class LineIndex:
+    """
+    Line index of a single file.
+    It records the byte offsets of all the newlines in the file once,
+    so that the conversions between byte offsets and line numbers are binary searches.
+    Line numbers start from 1.
+    """
+
+    def __init__(self, source: bytes) -> None:
+        """
+        :param source: the content of the file in bytes
+        """
+        self.source_length = len(source)
+        self.newline_offsets = array("q")
+        offset = source.find(b"\n")
+        while offset != -1:
+            self.newline_offsets.append(offset)
+            offset = source.find(b"\n", offset + 1)
+        return
+
+    @property
+    def line_count(self) -> int:
+        """
+        The number of lines in the file.
+        """
+        return len(self.newline_offsets) + 1
+
+    def get_line_number(self, byte_offset: int) -> int:
+        """
+        Get the line number of a byte offset.
+        It equals the number of newlines before the offset plus one.
+        :param byte_offset: the byte offset in the file
+        :return: the line number
+        """
+        return bisect_left(self.newline_offsets, byte_offset) + 1
+
+    def get_line_range(self, start_byte: int, end_byte: int) -> Tuple[int, int]:
+        """
+        Get the lines covered by a byte span.
+        :param start_byte: the start byte of the span
+        :param end_byte: the end byte of the span
+        :return: the start line and the end line of the span
+        """
+        return self.get_line_number(start_byte), self.get_line_number(end_byte)
+
+    def get_line_start_byte(self, line_number: int) -> int:
+        """
+        Get the byte offset of the first character in a line.
+        :param line_number: the line number
+        :return: the start byte of the line
+        """
+        if line_number <= 1:
+            return 0
+        if line_number > self.line_count:
+            return self.source_length
+        return self.newline_offsets[line_number - 2] + 1
+
+    def get_line_end_byte(self, line_number: int) -> int:
+        """
+        Get the byte offset right after the last character in a line, excluding the newline.
+        :param line_number: the line number
+        :return: the end byte of the line
+        """
+        if line_number < 1:
+            return 0
+        if line_number >= self.line_count:
+            return self.source_length
+        return self.newline_offsets[line_number - 1]
+
+
+class LineNodeIndex:
+    """
+    Index from line numbers to the AST nodes of a single file that start and end on the line.
+    It is built by one traversal of the parse tree, taking the lines from the node positions.
+    Line numbers start from 1.
+    """
+
+    def __init__(self, root_node: Node) -> None:
+        """
+        :param root_node: the root node of the parse tree of the file
+        """
+        self.nodes_by_line: Dict[int, List[Node]] = {}
+        cursor = root_node.walk()
+        while True:
+            node = cursor.node
+            start_row = node.start_point[0]
+            if start_row == node.end_point[0]:
+                self.nodes_by_line.setdefault(start_row + 1, []).append(node)
+            if cursor.goto_first_child():
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return
+
+    def get_nodes(self, line_number: int) -> List[Node]:
+        """
+        Get the nodes that start and end on a line.
+        :param line_number: the line number
+        :return: a new list of the nodes in pre-order
+        """
+        return list(self.nodes_by_line.get(line_number, []))
@@ -0,0 +1,135 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional
+
+# The default memory budget of the cached file contents in bytes
+DEFAULT_SOURCE_MEMORY_BUDGET = 512 * 1024 * 1024
+
+
+def decode_text(source: bytes) -> str:
+    """
+    Decode a piece of source code, e.g., the text of a node.
+    Tree-sitter offsets are byte offsets, so the source is always sliced as bytes before decoding.
+    :param source: the bytes of the source code
+    :return: the decoded text
+    """
+    return source.decode("utf8", errors="ignore")
+
+
+class SourceStore:
+    """
+    Store of the source files in a project.
+    The files are registered by their paths and read as bytes on demand.
+    The contents are cached in LRU order and the least recently used ones are evicted
+    once the total size exceeds the memory budget. Evicted files are read again when needed.
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_SOURCE_MEMORY_BUDGET) -> None:
+        """
+        :param memory_budget: the maximal total size of the cached file contents in bytes
+        """
+        self.memory_budget = memory_budget
+        self.file_sizes: Dict[str, int] = {}
+
+        # Contents that are added directly. They cannot be read again, so they are never evicted.
+        self.pinned_contents: Dict[str, bytes] = {}
+
+        self.cached_contents: OrderedDict[str, bytes] = OrderedDict()
+        self.cached_size = 0
+        self.read_num = 0
+        self.evict_num = 0
+        self.lock = threading.Lock()
+        return
+
+    def add_file(self, file_path: str) -> None:
+        """
+        Register a file on disk. The file is not read until its content is queried.
+        :param file_path: the path of the file
+        """
+        self.file_sizes[file_path] = os.path.getsize(file_path)
+        return
+
+    def add_content(self, file_path: str, content: bytes) -> None:
+        """
+        Register a file with its content in memory.
+        :param file_path: the path of the file
+        :param content: the content of the file
+        """
+        self.file_sizes[file_path] = len(content)
+        self.pinned_contents[file_path] = content
+        return
+
+    def remove(self, file_path: str) -> None:
+        """
+        Unregister a file and drop its content.
+        :param file_path: the path of the file
+        """
+        with self.lock:
+            self.file_sizes.pop(file_path, None)
+            self.pinned_contents.pop(file_path, None)
+            content = self.cached_contents.pop(file_path, None)
+            if content is not None:
+                self.cached_size -= len(content)
+        return
+
+    def __contains__(self, file_path: object) -> bool:
+        return file_path in self.file_sizes
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.file_sizes)
+
+    def __len__(self) -> int:
+        return len(self.file_sizes)
+
+    def get_bytes(self, file_path: str) -> bytes:
+        """
+        Get the content of a file.
+        :param file_path: the path of the file
+        :return: the content of the file in bytes
+        """
+        pinned_content = self.pinned_contents.get(file_path)
+        if pinned_content is not None:
+            return pinned_content
+
+        with self.lock:
+            cached_content = self.cached_contents.get(file_path)
+            if cached_content is not None:
+                self.cached_contents.move_to_end(file_path)
+                return cached_content
+
+        if file_path not in self.file_sizes:
+            raise KeyError(file_path)
+        try:
+            with open(file_path, "rb") as source_file:
+                content = source_file.read()
+        except OSError as e:
+            print(f"Error reading file {file_path}: {e}")
+            content = b""
+
+        with self.lock:
+            self.read_num += 1
+            if file_path not in self.cached_contents:
+                self.cached_contents[file_path] = content
+                self.cached_size += len(content)
+            self.cached_contents.move_to_end(file_path)
+            # Keep the file being queried even if it alone exceeds the budget
+            while (
+                self.cached_size > self.memory_budget and len(self.cached_contents) > 1
+            ):
+                _, evicted_content = self.cached_contents.popitem(last=False)
+                self.cached_size -= len(evicted_content)
+                self.evict_num += 1
+        return content
+
+    def get_text(
+        self, file_path: str, start_byte: int = 0, end_byte: Optional[int] = None
+    ) -> str:
+        """
+        Get the text of a byte range in a file, e.g., the text of a node.
+        :param file_path: the path of the file
+        :param start_byte: the start byte of the range
+        :param end_byte: the end byte of the range. The range ends at the end of the file if it is None.
+        :return: the decoded text
+        """
+        return decode_text(self.get_bytes(file_path)[start_byte:end_byte])
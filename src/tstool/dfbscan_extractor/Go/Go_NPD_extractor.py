@@ -6,33 +6,52 @@ import argparse
 
 
 class Go_NPD_Extractor(DFBScanExtractor):
+    """
+    Extract the nil values as sources from the Go source code.
+    1. Variables declared without initial values
+    2. Literal nil values
+    The sinks are the operands of selectors, indexing, slicing, and dereferences.
+    """
+
+    query = """
+    (var_declaration (var_spec (identifier) @source.uninitialized !value))
+    (nil) @source.nil
+    (selector_expression operand: (_) @sink.selector)
+    (index_expression operand: (_) @sink.index)
+    (slice_expression operand: (_) @sink.slice)
+    (unary_expression operator: "*" operand: (_) @sink.dereference)
+    """
+
     def extract_sources(self, function: Function) -> List[Value]:
-        root_node = function.parse_tree_root_node
-        source_code = self.ts_analyzer.code_in_files[function.file_path]
+        source_code = self.ts_analyzer.source_store.get_bytes(function.file_path)
         file_path = function.file_path
         sources = []
 
         ## Case I: Nil value from uninitialized variables
-        var_declaration_nodes = find_nodes_by_type(root_node, "var_declaration")
-        for node in var_declaration_nodes:
-            if len(find_nodes_by_type(node, "=")) == 0:
-                line_number = source_code[: node.start_byte].count("\n") + 1
-                for sub_node in node.children:
-                    if sub_node.type == "var_spec":
-                        for sub_sub_node in sub_node.children:
-                            if sub_sub_node.type == "identifier":
-                                name = source_code[
-                                    sub_sub_node.start_byte : sub_sub_node.end_byte
-                                ]
-                                sources.append(
-                                    Value(name, line_number, ValueLabel.SRC, file_path)
-                                )
+        # A var declaration is skipped as a whole if any of its var specs has an initial value,
+        # e.g., neither a nor b in `var ( a *T; b = x )` is a source
+        is_initialized_declarations: Dict[int, bool] = {}
+        for node in self.get_captured_nodes(function, "source.uninitialized"):
+            # The line of the var declaration, i.e., the parent of the var spec
+            var_spec_node = node.parent
+            assert var_spec_node is not None and var_spec_node.parent is not None
+            var_declaration_node = var_spec_node.parent
+            if var_declaration_node.start_byte not in is_initialized_declarations:
+                is_initialized_declarations[var_declaration_node.start_byte] = (
+                    len(find_nodes_by_type(var_declaration_node, "=")) > 0
+                )
+            if is_initialized_declarations[var_declaration_node.start_byte]:
+                continue
+            line_number = self.ts_analyzer.get_line_number(
+                file_path, var_declaration_node.start_byte
+            )
+            name = decode_text(source_code[node.start_byte : node.end_byte])
+            sources.append(Value(name, line_number, ValueLabel.SRC, file_path))
 
         ## Case II: Nil value from literal nil nodes
-        literal_nil_nodes = find_nodes_by_type(root_node, "nil")
-        for node in literal_nil_nodes:
-            line_number = source_code[: node.start_byte].count("\n") + 1
-            name = source_code[node.start_byte : node.end_byte]
+        for node in self.get_captured_nodes(function, "source.nil"):
+            line_number = self.ts_analyzer.get_line_number(file_path, node.start_byte)
+            name = decode_text(source_code[node.start_byte : node.end_byte])
             sources.append(Value(name, line_number, ValueLabel.SRC, file_path, -1))
         return sources
 
@@ -42,31 +61,19 @@ class Go_NPD_Extractor(DFBScanExtractor):
         :param: function: Function object.
         :return: List of sink values
         """
-        root_node = function.parse_tree_root_node
-        source_code = self.ts_analyzer.code_in_files[function.file_path]
+        source_code = self.ts_analyzer.source_store.get_bytes(function.file_path)
         file_path = function.file_path
 
         sink_nodes = []
         sinks = []
 
-        for node_type in [
-            "selector_expression",
-            "index_expression",
-            "slice_expression",
-        ]:
-            for node in find_nodes_by_type(root_node, node_type):
-                first_child = node.children[0]
-                sink_nodes.append(first_child)
-                break
-
-        for node in find_nodes_by_type(root_node, "unary_expression"):
-            first_child = node.children[0]
-            second_child = node.children[1]
-            if first_child.type == "*":
-                sink_nodes.append(second_child)
+        # Only the first selector, index, and slice expression in the function is taken
+        for capture_name in ["sink.selector", "sink.index", "sink.slice"]:
+            sink_nodes.extend(self.get_captured_nodes(function, capture_name)[:1])
+        sink_nodes.extend(self.get_captured_nodes(function, "sink.dereference"))
 
         for node in sink_nodes:
-            line_number = source_code[: node.start_byte].count("\n") + 1
-            name = source_code[node.start_byte : node.end_byte]
+            line_number = self.ts_analyzer.get_line_number(file_path, node.start_byte)
+            name = decode_text(source_code[node.start_byte : node.end_byte])
             sinks.append(Value(name, line_number, ValueLabel.SINK, file_path, -1))
         return sinks
@@ -6,16 +6,25 @@ import argparse
 
 
 class Python_NPD_Extractor(DFBScanExtractor):
+    """
+    Extract the None values as sources from the Python source code.
+    The sinks are the objects of attribute accesses and subscripts.
+    """
+
+    query = """
+    (none) @source
+    (attribute object: (_) @sink)
+    (subscript value: (_) @sink)
+    """
+
     def extract_sources(self, function: Function) -> List[Value]:
-        root_node = function.parse_tree_root_node
-        source_code = self.ts_analyzer.code_in_files[function.file_path]
+        source_code = self.ts_analyzer.source_store.get_bytes(function.file_path)
         file_path = function.file_path
-        null_value_nodes = find_nodes_by_type(root_node, "none")
 
         sources = []
-        for node in null_value_nodes:
-            line_number = source_code[: node.start_byte].count("\n") + 1
-            name = source_code[node.start_byte : node.end_byte]
+        for node in self.get_captured_nodes(function, "source"):
+            line_number = self.ts_analyzer.get_line_number(file_path, node.start_byte)
+            name = decode_text(source_code[node.start_byte : node.end_byte])
             sources.append(Value(name, line_number, ValueLabel.SRC, file_path))
         return sources
 
@@ -25,17 +34,12 @@ class Python_NPD_Extractor(DFBScanExtractor):
         :param: function: Function object.
         :return: List of sink values
         """
-        root_node = function.parse_tree_root_node
-        source_code = self.ts_analyzer.code_in_files[function.file_path]
+        source_code = self.ts_analyzer.source_store.get_bytes(function.file_path)
         file_path = function.file_path
 
-        nodes = find_nodes_by_type(root_node, "attribute")
-        nodes.extend(find_nodes_by_type(root_node, "subscript"))
         sinks = []
-
-        for node in nodes:
-            first_child = node.children[0]
-            line_number = source_code[: first_child.start_byte].count("\n") + 1
-            name = source_code[first_child.start_byte : first_child.end_byte]
+        for node in self.get_captured_nodes(function, "sink"):
+            line_number = self.ts_analyzer.get_line_number(file_path, node.start_byte)
+            name = decode_text(source_code[node.start_byte : node.end_byte])
             sinks.append(Value(name, line_number, ValueLabel.SINK, file_path, -1))
         return sinks
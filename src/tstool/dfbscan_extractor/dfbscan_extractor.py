@@ -1,5 +1,8 @@
 import sys
+import threading
+from bisect import bisect_left, bisect_right
 from os import path
+from tree_sitter import Query
 from tstool.analyzer.TS_analyzer import *
 from memory.syntactic.function import *
 from memory.syntactic.value import *
@@ -8,34 +11,129 @@ from abc import ABC, abstractmethod
 
 sys.path.append(path.dirname(path.dirname(path.dirname(path.abspath(__file__)))))
 
+# (extractor class name, language name) -> compiled query
+compiled_queries: Dict[Tuple[str, str], Query] = {}
+compiled_queries_lock = threading.Lock()
+
 
 class DFBScanExtractor(ABC):
     """
     Extractor class providing a common interface for source/sink extraction using tree-sitter.
+    The candidate source/sink nodes are specified by a tree-sitter query, which is compiled once per language
+    and matched once per file. Each capture name, e.g., "source" or "sink", denotes a kind of nodes.
+    As the trees are parsed without text, a capture "<name>.callee" restricts the "<name>" capture
+    in the same match to the calls of the functions in callee_names["<name>"].
     """
 
+    # The tree-sitter query of the source/sink nodes
+    query: str = ""
+
+    # capture name -> the names of the callees that the capture is restricted to
+    callee_names: Dict[str, Set[str]] = {}
+
     def __init__(self, ts_analyzer: TSAnalyzer):
         self.ts_analyzer = ts_analyzer
         self.sources: List[Value] = []
         self.sinks: List[Value] = []
+
+        self.compiled_query = self.__compile_query()
+
+        # file path -> capture name -> (the captured nodes in document order, their start bytes)
+        self.file_captures: Dict[str, Dict[str, Tuple[List[Node], List[int]]]] = {}
+        self.lock = threading.Lock()
         return
 
+    def __compile_query(self) -> Query:
+        key = (type(self).__name__, self.ts_analyzer.language_name)
+        with compiled_queries_lock:
+            if key not in compiled_queries:
+                compiled_queries[key] = self.ts_analyzer.language.query(self.query)
+            return compiled_queries[key]
+
     def extract_all(self) -> Tuple[List[Value], List[Value]]:
         """
         Start the source/sink extraction process.
         """
         pbar = tqdm(total=len(self.ts_analyzer.function_env), desc="Parsing files")
-        for function_id in self.ts_analyzer.function_env:
-            pbar.update(1)
-            function: Function = self.ts_analyzer.function_env[function_id]
-            if "test" in function.file_path or "example" in function.file_path:
-                continue
-            file_content = self.ts_analyzer.code_in_files[function.file_path]
-            function_root_node = function.parse_tree_root_node
-            self.sources.extend(self.extract_sources(function))
-            self.sinks.extend(self.extract_sinks(function))
+        with self.ts_analyzer.profiler.stage(
+            "extract_sources_and_sinks", len(self.ts_analyzer.function_env)
+        ):
+            for function_id in self.ts_analyzer.function_env:
+                pbar.update(1)
+                function: Function = self.ts_analyzer.function_env[function_id]
+                if "test" in function.file_path or "example" in function.file_path:
+                    continue
+                self.sources.extend(self.extract_sources(function))
+                self.sinks.extend(self.extract_sinks(function))
         return self.sources, self.sinks
 
+    def get_captured_nodes(self, function: Function, capture_name: str) -> List[Node]:
+        """
+        Get the nodes of a capture in a function.
+        :param function: Function object.
+        :param capture_name: the name of the capture in the query
+        :return: the captured nodes in the function in document order
+        """
+        file_captures = self.__get_file_captures(function)
+        if capture_name not in file_captures:
+            return []
+        nodes, start_bytes = file_captures[capture_name]
+        function_node = function.parse_tree_root_node
+        lower = bisect_left(start_bytes, function_node.start_byte)
+        upper = bisect_right(start_bytes, function_node.end_byte)
+        return [
+            node
+            for node in nodes[lower:upper]
+            if node.end_byte <= function_node.end_byte
+        ]
+
+    def __get_file_captures(
+        self, function: Function
+    ) -> Dict[str, Tuple[List[Node], List[int]]]:
+        """
+        Match the query against the file of a function. The result is cached per file.
+        """
+        file_path = function.file_path
+        with self.lock:
+            if file_path in self.file_captures:
+                return self.file_captures[file_path]
+
+        root_node = function.parse_tree_root_node
+        while root_node.parent is not None:
+            root_node = root_node.parent
+        source_code = self.ts_analyzer.source_store.get_bytes(file_path)
+
+        captured_nodes: Dict[str, Dict[Tuple[int, int, str], Node]] = {}
+        for _, captures in self.compiled_query.matches(root_node):
+            for capture_name, node in captures.items():
+                if capture_name.endswith(".callee") or not isinstance(node, Node):
+                    continue
+                callee_node = captures.get(capture_name + ".callee")
+                if isinstance(callee_node, Node):
+                    callee_name = decode_text(
+                        source_code[callee_node.start_byte : callee_node.end_byte]
+                    )
+                    if callee_name not in self.callee_names.get(capture_name, set()):
+                        continue
+                if capture_name not in captured_nodes:
+                    captured_nodes[capture_name] = {}
+                captured_nodes[capture_name][
+                    (node.start_byte, node.end_byte, node.type)
+                ] = node
+
+        file_captures: Dict[str, Tuple[List[Node], List[int]]] = {}
+        for capture_name, nodes_by_span in captured_nodes.items():
+            # Outer nodes precede the inner nodes starting at the same byte, as in a pre-order traversal
+            nodes = sorted(
+                nodes_by_span.values(),
+                key=lambda node: (node.start_byte, -node.end_byte),
+            )
+            file_captures[capture_name] = (nodes, [node.start_byte for node in nodes])
+
+        with self.lock:
+            self.file_captures[file_path] = file_captures
+        return file_captures
+
     @abstractmethod
     def extract_sources(self, function: Function) -> List[Value]:
         """
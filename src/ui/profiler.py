@@ -0,0 +1,204 @@
+import cProfile
+import contextlib
+import json
+import os
+import pstats
+import threading
+import time
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+
+class StageTiming:
+    """
+    The accumulated timing of a stage, e.g., parsing files or validating paths.
+    """
+
+    def __init__(self, name: str, is_concurrent: bool = False) -> None:
+        """
+        :param name: the name of the stage
+        :param is_concurrent: whether the stage runs in several workers at the same time.
+            If so, the wall time and CPU time are summed over the workers.
+        """
+        self.name = name
+        self.is_concurrent = is_concurrent
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.item_num = 0
+        self.call_num = 0
+        return
+
+    def merge(self, other: "StageTiming") -> None:
+        self.wall_time += other.wall_time
+        self.cpu_time += other.cpu_time
+        self.item_num += other.item_num
+        self.call_num += other.call_num
+        return
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "is_concurrent": self.is_concurrent,
+            "wall_time": round(self.wall_time, 6),
+            "cpu_time": round(self.cpu_time, 6),
+            "item_num": self.item_num,
+            "call_num": self.call_num,
+            "items_per_second": (
+                round(self.item_num / self.wall_time, 3) if self.wall_time > 0 else None
+            ),
+        }
+
+
+def get_process_cpu_time() -> float:
+    """
+    CPU time of the current process, including the child processes that have terminated, e.g., the indexing workers.
+    """
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class Profiler:
+    """
+    Record the wall time, CPU time, and item counts of the stages of a scan.
+    A disabled profiler records nothing, so the stages can be marked unconditionally.
+    """
+
+    def __init__(self, is_enabled: bool = False, is_cprofile_enabled: bool = False):
+        """
+        :param is_enabled: whether the stages are timed
+        :param is_cprofile_enabled: whether the non-concurrent stages are also profiled with cProfile
+        """
+        self.is_enabled = is_enabled or is_cprofile_enabled
+        self.is_cprofile_enabled = is_cprofile_enabled
+        self.start_time = time.perf_counter()
+
+        # Stages in the order they are first entered
+        self.stage_timings: Dict[str, StageTiming] = {}
+        self.stage_profiles: Dict[str, cProfile.Profile] = {}
+        # cProfile only profiles the thread enabling it, so the worker threads of a stage
+        # profile themselves and their statistics are merged here
+        self.thread_stats: Dict[str, pstats.Stats] = {}
+        # Only one cProfile profile can be active at a time, so nested stages are not profiled
+        self.is_profiling = False
+        self.lock = threading.Lock()
+        return
+
+    def stage(
+        self, name: str, item_num: int = 0, is_concurrent: bool = False
+    ) -> ContextManager[None]:
+        """
+        Time a stage in a with-statement.
+        :param name: the name of the stage
+        :param item_num: the number of items, e.g., files or functions, processed in the stage
+        :param is_concurrent: whether the stage runs in several threads or processes at the same time.
+            The CPU time of a concurrent stage is the CPU time of its own thread, and it is never profiled with cProfile.
+        """
+        if not self.is_enabled:
+            return contextlib.nullcontext()
+        return self.__time_stage(name, item_num, is_concurrent)
+
+    @contextlib.contextmanager
+    def __time_stage(
+        self, name: str, item_num: int, is_concurrent: bool
+    ) -> Iterator[None]:
+        profile: Optional[cProfile.Profile] = None
+        if self.is_cprofile_enabled and not is_concurrent:
+            with self.lock:
+                if not self.is_profiling:
+                    self.is_profiling = True
+                    if name not in self.stage_profiles:
+                        self.stage_profiles[name] = cProfile.Profile()
+                    profile = self.stage_profiles[name]
+
+        get_cpu_time = time.thread_time if is_concurrent else get_process_cpu_time
+        start_wall_time = time.perf_counter()
+        start_cpu_time = get_cpu_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            stage_timing = StageTiming(name, is_concurrent)
+            stage_timing.wall_time = time.perf_counter() - start_wall_time
+            stage_timing.cpu_time = get_cpu_time() - start_cpu_time
+            stage_timing.item_num = item_num
+            stage_timing.call_num = 1
+            self.add_stage_timings([stage_timing])
+            if profile is not None:
+                with self.lock:
+                    self.is_profiling = False
+        return
+
+    def profile_thread(self, name: str) -> ContextManager[None]:
+        """
+        Profile the work of a worker thread of a stage with cProfile in a with-statement,
+        e.g., a source value scanned in a thread pool. The statistics are merged into <stage>.prof.
+        :param name: the name of the stage
+        """
+        if not self.is_cprofile_enabled:
+            return contextlib.nullcontext()
+        return self.__profile_thread(name)
+
+    @contextlib.contextmanager
+    def __profile_thread(self, name: str) -> Iterator[None]:
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self.lock:
+                if name not in self.thread_stats:
+                    self.thread_stats[name] = pstats.Stats(profile)
+                else:
+                    self.thread_stats[name].add(profile)
+        return
+
+    def add_stage_timings(self, stage_timings: List[StageTiming]) -> None:
+        """
+        Add the timings recorded elsewhere, e.g., in a worker process.
+        """
+        with self.lock:
+            for stage_timing in stage_timings:
+                if stage_timing.name not in self.stage_timings:
+                    self.stage_timings[stage_timing.name] = StageTiming(
+                        stage_timing.name, stage_timing.is_concurrent
+                    )
+                self.stage_timings[stage_timing.name].merge(stage_timing)
+        return
+
+    def pop_stage_timings(self) -> List[StageTiming]:
+        """
+        Remove and return the timings recorded so far, e.g., to send them from a worker process.
+        """
+        with self.lock:
+            stage_timings = list(self.stage_timings.values())
+            self.stage_timings = {}
+        return stage_timings
+
+    def dump(self, dir_path: str) -> None:
+        """
+        Dump the timings to timings.json and the cProfile statistics to <stage>.prof in a directory.
+        :param dir_path: the directory of the results
+        """
+        if not self.is_enabled:
+            return
+        with self.lock:
+            timings = {
+                "total_wall_time": round(time.perf_counter() - self.start_time, 6),
+                "stages": {
+                    name: stage_timing.to_dict()
+                    for name, stage_timing in self.stage_timings.items()
+                },
+            }
+            with open(os.path.join(dir_path, "timings.json"), "w") as timings_file:
+                json.dump(timings, timings_file, indent=4)
+            for name in dict.fromkeys([*self.stage_profiles, *self.thread_stats]):
+                if name not in self.stage_profiles:
+                    stats = self.thread_stats[name]
+                else:
+                    stats = pstats.Stats(self.stage_profiles[name])
+                    if name in self.thread_stats:
+                        stats.add(self.thread_stats[name])
+                stats.dump_stats(os.path.join(dir_path, f"{name}.prof"))
+        return
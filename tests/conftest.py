@@ -0,0 +1,155 @@
+import hashlib
+import os
+import re
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterator, List, Tuple
+
+import pytest
+
+REPO_PATH = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_PATH / "src"))
+
+import agent.dfbscan as dfbscan_module
+from agent.dfbscan import *
+from llmtool.LLM_utils import LLM
+from tstool.analyzer.TS_source_store import SourceStore
+
+BENCHMARK_PATH = REPO_PATH / "benchmark"
+FIXTURE_PATH = Path(__file__).resolve().parent / "fixtures"
+
+ANALYZERS = {
+    "Cpp": (Cpp_TSAnalyzer, ["cpp", "cc", "hpp", "c", "h"]),
+    "Go": (Go_TSAnalyzer, ["go"]),
+    "Java": (Java_TSAnalyzer, ["java"]),
+    "Python": (Python_TSAnalyzer, ["py"]),
+}
+
+
+class WhitespaceEncoding:
+    """
+    Stand-in for the tiktoken encoding, which is only used to measure the token cost.
+    """
+
+    def encode(self, text: str) -> List[str]:
+        return text.split()
+
+
+def get_section(message: str, header: str, footer: str) -> List[Tuple[str, str]]:
+    """
+    Get the "- <name> at line <number>" items between two headers of a prompt.
+    """
+    section = message.split(header)[-1].split(footer)[0]
+    return re.findall(r"- (.*) at line (\d+)", section)
+
+
+def fake_infer(
+    self, message: str, is_measure_cost: bool = False
+) -> Tuple[str, int, int]:
+    """
+    A deterministic LLM. The intra-procedural data-flow analysis propagates the source
+    to all the sinks and call arguments along one path and to all the return values along another,
+    and the path validation confirms a path unless the hash of its prompt is divisible by 3.
+    """
+    if "Sink values in this function:" not in message:
+        digest = int(hashlib.md5(message.encode()).hexdigest(), 16)
+        return ("Answer: Yes" if digest % 3 else "Answer: No"), 0, 0
+
+    target = message.split("Now I will give you a target function")[-1]
+    code_lines = target.split("```")[1].splitlines()
+    sinks = get_section(
+        target, "Sink values in this function:", "Call statements in this function:"
+    )
+    calls = get_section(
+        target, "Call statements in this function:", "Return values in this function:"
+    )
+    rets = get_section(target, "Return values in this function:", "Now, please")
+
+    lines = ["Answer:", "Path 1: Lines 1 -> 2;"]
+    for name, line_number in sinks:
+        lines.append(
+            f"- Type: Sink; Name: {name}; Function: None; Index: 0; Line: {line_number}; Dependency: x"
+        )
+    for name, _ in calls:
+        # The call statements are listed with the line numbers in the file
+        relative_line_numbers = [
+            code_line.split(".")[0].strip()
+            for code_line in code_lines
+            if name in code_line
+        ]
+        lines.append(
+            f"- Type: Argument; Name: {name}; Function: f; Index: 0; Line: {relative_line_numbers[0]}; Dependency: x"
+        )
+    lines.append("Path 2: Lines 1 -> 3;")
+    for name, line_number in rets:
+        lines.append(
+            f"- Type: Return; Name: {name}; Function: None; Index: 0; Line: {line_number}; Dependency: x"
+        )
+    return "\n".join(lines) + "\n", 0, 0
+
+
+@pytest.fixture
+def fake_llm(monkeypatch: pytest.MonkeyPatch) -> None:
+    import tiktoken
+
+    monkeypatch.setattr(
+        tiktoken, "encoding_for_model", lambda model_name: WhitespaceEncoding()
+    )
+    monkeypatch.setattr(LLM, "infer", fake_infer)
+    return
+
+
+@pytest.fixture
+def fixture_project() -> Iterator[Callable[[str], Path]]:
+    """
+    Copy a project under tests/fixtures to a temporary directory.
+    The extractors skip the files whose paths contain "test", so the projects cannot be scanned in place.
+    """
+    copy_dir_paths = []
+
+    def copy(name: str) -> Path:
+        copy_dir_path = Path(tempfile.mkdtemp(prefix="repoaudit-"))
+        copy_dir_paths.append(copy_dir_path)
+        shutil.copytree(FIXTURE_PATH / name, copy_dir_path / name)
+        return copy_dir_path / name
+
+    yield copy
+    for copy_dir_path in copy_dir_paths:
+        shutil.rmtree(copy_dir_path)
+
+
+@pytest.fixture
+def make_agent(
+    fake_llm: None, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Callable[..., DFBScanAgent]:
+    """
+    Build a DFBScanAgent on a project with the fake LLM. The logs and results are written under tmp_path.
+    """
+    monkeypatch.setattr(dfbscan_module, "BASE_PATH", tmp_path)
+
+    def make(
+        project_path: Path, language: str, bug_type: str, **kwargs
+    ) -> DFBScanAgent:
+        analyzer_class, suffixes = ANALYZERS[language]
+        source_store = SourceStore()
+        for root, _, file_names in os.walk(project_path):
+            for file_name in sorted(file_names):
+                if file_name.split(".")[-1] in suffixes:
+                    source_store.add_file(os.path.join(root, file_name))
+        ts_analyzer = analyzer_class(source_store, language, 1, None, "thread")
+        kwargs.setdefault("call_depth", 3)
+        kwargs.setdefault("max_neural_workers", 1)
+        return DFBScanAgent(
+            bug_type,
+            True,
+            str(project_path),
+            language,
+            ts_analyzer,
+            "claude-3.7",
+            0.0,
+            **kwargs,
+        )
+
+    return make
@@ -0,0 +1,35 @@
+def use_both(a, b):
+    print(a.name)
+    return b.value
+
+
+def countdown(a, n):
+    if n == 0:
+        return a
+    r = countdown(a, n - 1)
+    use_both(a, r)
+    return r
+
+
+def ping(a, n):
+    if n == 0:
+        return a
+    return pong(a, n - 1)
+
+
+def pong(b, n):
+    use_both(b, b)
+    return ping(b, n)
+
+
+def main():
+    x = None
+    y = countdown(x, 3)
+    z = ping(y, 2)
+    use_both(z, y)
+
+
+def other():
+    w = None
+    v = ping(w, 1)
+    countdown(v, 2)
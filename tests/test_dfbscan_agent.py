@@ -0,0 +1,27 @@
+import json
+import os
+
+import pytest
+
+from conftest import *
+
+
+@pytest.mark.parametrize("scan", ["start_scan", "start_scan_sequential"])
+def test_aborted_scan_leaves_detect_info(make_agent, monkeypatch, scan):
+    agent = make_agent(BENCHMARK_PATH / "Cpp" / "toy", "Cpp", "MLK")
+    validated_paths = []
+
+    def invoke(pv_input, cls):
+        validated_paths.append(pv_input)
+        if len(validated_paths) > 1:
+            raise KeyboardInterrupt
+        return PathValidatorOutput(True, "The path is reachable.")
+
+    monkeypatch.setattr(agent.path_validator, "invoke", invoke)
+    with pytest.raises(KeyboardInterrupt):
+        getattr(agent, scan)()
+
+    with open(os.path.join(agent.res_dir_path, "detect_info.json")) as bug_info_file:
+        bug_reports = json.load(bug_info_file)
+    assert len(bug_reports) == 1
+    assert not agent.bug_report_writer.thread.is_alive()
@@ -0,0 +1,81 @@
+import pytest
+
+from conftest import *
+
+
+def explore(agent: DFBScanAgent, max_depth: int) -> Dict[Value, Tuple]:
+    """
+    Explore all the sources of an agent from a fresh state, and get the explored facts and paths per source.
+    The facts are compared as sets, since the order they are recorded in depends on the summaries.
+    """
+    agent.state = DFBScanState(agent.src_values, agent.sink_values)
+    explored = {}
+    for src_value in agent.src_values:
+        agent._DFBScanAgent__explore_src_value(src_value, max_depth)
+        agent._DFBScanAgent__collect_potential_buggy_paths(src_value)
+        source_data_flow = agent.state.get_source_data_flow(src_value)
+        explored[src_value] = (
+            {
+                start: {frozenset(ends) for ends in ends_per_path}
+                for start, ends_per_path in source_data_flow.reachable_values_per_path.items()
+            },
+            {
+                start: set(ends)
+                for start, ends in source_data_flow.external_value_match.items()
+            },
+            set(source_data_flow.potential_buggy_paths),
+        )
+    return explored
+
+
+@pytest.mark.parametrize("max_depth", [3, 5])
+def test_summaries_keep_recursion_bound(make_agent, fixture_project, max_depth):
+    project_path = fixture_project("recursion")
+    agent = make_agent(project_path, "Python", "NPD", max_paths_per_source=1000)
+    plain_agent = make_agent(
+        project_path,
+        "Python",
+        "NPD",
+        max_paths_per_source=1000,
+        use_function_summaries=False,
+    )
+
+    explored = explore(agent, max_depth)
+    assert explored == explore(plain_agent, max_depth)
+    assert any(len(paths) > 0 for _, _, paths in explored.values())
+    assert agent.function_summaries.reused_num > 0
+
+
+@pytest.mark.parametrize(
+    "language, bug_type", [("Cpp", "MLK"), ("Cpp", "NPD"), ("Go", "NPD")]
+)
+def test_summaries_keep_benchmark_paths(make_agent, language, bug_type):
+    project_path = BENCHMARK_PATH / language / "toy"
+    agent = make_agent(project_path, language, bug_type)
+    plain_agent = make_agent(
+        project_path, language, bug_type, use_function_summaries=False
+    )
+
+    assert explore(agent, 3) == explore(plain_agent, 3)
+
+
+def test_deeper_summary_is_reused(make_agent, fixture_project):
+    project_path = fixture_project("recursion")
+    agent = make_agent(project_path, "Python", "NPD", max_paths_per_source=1000)
+    plain_agent = make_agent(
+        project_path,
+        "Python",
+        "NPD",
+        max_paths_per_source=1000,
+        use_function_summaries=False,
+    )
+
+    explore(agent, 5)
+    computed_num = agent.function_summaries.computed_num
+    reused_num = agent.function_summaries.reused_num
+    explored = explore(agent, 2)
+
+    # All the summaries of the second exploration are computed up to a larger depth
+    assert agent.function_summaries.computed_num == computed_num
+    assert agent.function_summaries.reused_num > reused_num
+    assert explored == explore(plain_agent, 2)